@@ -3,6 +3,7 @@
 from app.models.news.news_article import NewsArticle
 from app.models.news.embedding import Embedding
 from app.models.news.ai_analysis import AiAnalysis  # if you have this
+from app.models.pipeline.pipeline_job import PipelineJob
 
 # Export models for Base.metadata
-__all__ = ["NewsArticle", "Embedding", "AiAnalysis"]
+__all__ = ["NewsArticle", "Embedding", "AiAnalysis", "PipelineJob"]
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
@@ -7,12 +9,52 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection pool sizing (per engine, per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+
+POOL_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_timeout": DB_POOL_TIMEOUT,
+}
+
 # SQLAlchemy engine (Neon requires sslmode=require)
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def to_async_url(url: str) -> str:
+    """
+    Turn a psycopg2 DATABASE_URL into an asyncpg one.
+    asyncpg takes `ssl` instead of libpq's `sslmode` and rejects `channel_binding`.
+    """
+    parsed = make_url(url)
+    query = dict(parsed.query)
+
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+
+    return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(
+        hide_password=False
+    )
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
 # DB dependency for FastAPI routes
 def get_db():
     db = SessionLocal()
@@ -20,3 +62,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async DB dependency for FastAPI routes (no threadpool worker per request)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
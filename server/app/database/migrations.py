@@ -0,0 +1,229 @@
+"""
+Idempotent schema upkeep for an existing database.
+
+The tables were created by hand on Neon, so there is no migration history
+to replay. Instead every step here is safe to re-run: the pgvector extension
+and missing tables are created, SCHEMA_STEPS are applied in order to the
+existing tables, then every index declared on the models that the database
+lacks is built (CONCURRENTLY where the model asks for it, so live traffic is
+not blocked). With PARTITION_INTERVAL set, freshly created tables are
+partitioned right away; existing ones need the explicit conversion in
+app/database/partitioning.py. From server/:
+
+    python -m app.database.migrations
+"""
+
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.database.base import Base
+from app.database.database import engine
+from app.database.partitioning import (
+    PARTITION_KEYS,
+    convert_to_partitioned,
+    ensure_partitions,
+    is_partitioned,
+    partitioning_enabled,
+)
+import app.database  # noqa: F401  (registers every model on Base.metadata)
+
+logger = logging.getLogger(__name__)
+
+# (name, SQL) pairs run in order, each in its own transaction.
+# Every statement must be a no-op when it has already been applied.
+SCHEMA_STEPS: list[tuple[str, str]] = [
+    (
+        "embeddings: search filter columns",
+        """
+        ALTER TABLE embeddings
+            ADD COLUMN IF NOT EXISTS published_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS category TEXT
+    """,
+    ),
+    (
+        "embeddings / ai_analysis: article_created_at partition key",
+        """
+        ALTER TABLE embeddings ADD COLUMN IF NOT EXISTS article_created_at TIMESTAMP;
+        ALTER TABLE ai_analysis ADD COLUMN IF NOT EXISTS article_created_at TIMESTAMP
+    """,
+    ),
+    (
+        "news_articles: is_embedded flag for the embedding queue",
+        """
+        ALTER TABLE news_articles
+            ADD COLUMN IF NOT EXISTS is_embedded BOOLEAN NOT NULL DEFAULT false;
+        UPDATE news_articles na
+        SET is_embedded = true
+        WHERE na.is_embedded = false
+          AND EXISTS (SELECT 1 FROM embeddings e WHERE e.article_id = na.id)
+    """,
+    ),
+    (
+        # Search reads the newest vector per article; older ones are dead weight
+        "embeddings: keep one row per article",
+        """
+        DELETE FROM embeddings e
+        USING embeddings newer
+        WHERE newer.article_id = e.article_id
+          AND newer.id > e.id
+    """,
+    ),
+    (
+        "embeddings: copy published_at / category / created_at from articles",
+        """
+        UPDATE embeddings e
+        SET published_at = na.published_at,
+            category = na.category,
+            article_created_at = na.created_at
+        FROM news_articles na
+        WHERE na.id = e.article_id
+          AND (e.published_at IS DISTINCT FROM na.published_at
+               OR e.category IS DISTINCT FROM na.category
+               OR e.article_created_at IS DISTINCT FROM na.created_at)
+    """,
+    ),
+    (
+        "feed cache: generation sequence",
+        "CREATE SEQUENCE IF NOT EXISTS feed_generation_seq",
+    ),
+    (
+        "ai_analysis: copy created_at from articles",
+        """
+        UPDATE ai_analysis a
+        SET article_created_at = na.created_at
+        FROM news_articles na
+        WHERE na.id = a.article_id
+          AND a.article_created_at IS DISTINCT FROM na.created_at
+    """,
+    ),
+]
+
+
+def _drop_invalid_index(conn, name: str):
+    """A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind."""
+    invalid = conn.execute(
+        text(
+            """
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """
+        ),
+        {"name": name},
+    ).first()
+
+    if invalid:
+        logger.warning(f"🧹 Dropping invalid index {name}")
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def ensure_indexes(bind=engine) -> list[str]:
+    """Create every model-declared index that is missing. Returns their names."""
+    created = []
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        postgres = conn.dialect.name == "postgresql"
+
+        for table in Base.metadata.sorted_tables:
+            # Partitioned tables build their indexes partition by partition,
+            # which Postgres only does without CONCURRENTLY
+            partitioned = postgres and is_partitioned(conn, table.name)
+
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                if postgres and not partitioned:
+                    _drop_invalid_index(conn, index.name)
+
+                existing = {i["name"] for i in inspect(conn).get_indexes(table.name)}
+                if index.name in existing:
+                    continue
+
+                logger.info(f"🏗 Creating index {index.name} on {table.name}")
+                ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+                if partitioned:
+                    ddl = ddl.replace("INDEX CONCURRENTLY", "INDEX", 1)
+                conn.execute(text(ddl))
+                created.append(index.name)
+
+    return created
+
+
+def create_missing_tables(bind=engine) -> list[str]:
+    """
+    Bare CREATE TABLE for tables the database lacks. Unlike create_all this
+    leaves the indexes to ensure_indexes(): the CONCURRENTLY ones cannot be
+    built inside create_all's transaction.
+    """
+    created = []
+    with bind.begin() as conn:
+        existing = set(inspect(conn).get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                logger.info(f"🏗 Creating table {table.name}")
+                conn.execute(CreateTable(table))
+                created.append(table.name)
+    return created
+
+
+def run_schema_steps(bind=engine):
+    for name, statement in SCHEMA_STEPS:
+        logger.info(f"🔧 Schema step: {name}")
+        with bind.begin() as conn:
+            conn.execute(text(statement))
+
+
+def _ensure_partitioning(bind, fresh: bool) -> list[str]:
+    with bind.connect() as conn:
+        partitioned = all(is_partitioned(conn, t) for t in PARTITION_KEYS)
+
+    if not partitioned:
+        if not fresh:
+            # Rewrites and locks every table: only done on request
+            logger.warning(
+                "⚠️ PARTITION_INTERVAL is set but the tables are not partitioned; "
+                "run python -m app.database.partitioning --convert"
+            )
+            return []
+        # Just created, so converting them is instant
+        return convert_to_partitioned(bind)["partitions"]
+
+    return ensure_partitions(bind)
+
+
+def run_migrations(bind=engine) -> dict:
+    postgres = bind.dialect.name == "postgresql"
+
+    if postgres:
+        with bind.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+
+    tables = create_missing_tables(bind)
+
+    partitions = []
+    if postgres:
+        run_schema_steps(bind)
+
+        if partitioning_enabled():
+            partitions = _ensure_partitioning(
+                bind, fresh=set(PARTITION_KEYS) <= set(tables)
+            )
+
+    created = ensure_indexes(bind)
+
+    # Imported here: the ANN index module needs the engine defined above
+    from app.services.search.vector_index import ensure_vector_index
+
+    vector_index = ensure_vector_index(bind) if postgres else None
+
+    return {
+        "tables_created": tables,
+        "indexes_created": created,
+        "vector_index": vector_index,
+        "partitions_created": partitions,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    result = run_migrations()
+    logger.info(f"✅ Migrations done: {result}")
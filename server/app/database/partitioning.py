@@ -0,0 +1,362 @@
+"""
+Optional range partitioning of news_articles, embeddings and ai_analysis.
+
+With PARTITION_INTERVAL=day|week the three tables are partitioned by the
+article's creation time: news_articles by created_at, embeddings and
+ai_analysis by their copy of it, article_created_at. All three get
+partitions with the same bounds, so expiring an interval is a DETACH + DROP
+of three partitions: no row-by-row DELETE, nothing left for vacuum.
+Similarity search also filters on article_created_at, so the planner skips
+partitions outside the recency window.
+
+Postgres only enforces uniqueness on a partitioned table together with the
+partition key, so url / hash are unique per created_at. The importer's
+duplicate check, made under advisory locks on the url and hash
+(article_service.lock_article_keys), is what keeps articles unique.
+
+There is no DEFAULT partition: rows in it would keep the matching range
+from ever being created. Partitions are made PARTITION_PREMAKE intervals
+ahead instead, and an insert past the last one fails loudly.
+
+Converting an existing database rewrites the three tables under an ACCESS
+EXCLUSIVE lock, so run it in a maintenance window. From server/:
+
+    python -m app.database.partitioning --convert   # one-off migration
+    python -m app.database.partitioning             # create / drop partitions
+"""
+
+import os
+import re
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.database.database import engine
+from app.services.news.feed_cache import bump_feed_version
+
+logger = logging.getLogger(__name__)
+
+# "" (off) | day | week
+PARTITION_INTERVAL = os.getenv("PARTITION_INTERVAL", "").lower()
+# Intervals created ahead of time; maintenance runs hourly, so this is the
+# outage it can miss before inserts fail
+PARTITION_PREMAKE = int(os.getenv("PARTITION_PREMAKE", "14"))
+
+# Partition key per table, parents first
+PARTITION_KEYS = {
+    "news_articles": "created_at",
+    "embeddings": "article_created_at",
+    "ai_analysis": "article_created_at",
+}
+
+INTERVALS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+BOUNDS_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def partitioning_enabled() -> bool:
+    return bool(PARTITION_INTERVAL)
+
+
+def interval_start(ts: datetime, interval: str = PARTITION_INTERVAL) -> datetime:
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown partition interval: {interval}")
+
+    start = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        start -= timedelta(days=start.weekday())  # ISO weeks start on Monday
+    return start
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m%d}"
+
+
+# ---------------------------------------------------------
+# Catalog
+# ---------------------------------------------------------
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return (
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"
+            ),
+            {"t": table},
+        ).first()
+        is not None
+    )
+
+
+def list_partitions(conn, table: str) -> list[tuple[str, datetime, datetime]]:
+    """(name, start, end) of the range partitions of `table`, oldest first."""
+    rows = conn.execute(
+        text(
+            """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:t)
+    """
+        ),
+        {"t": table},
+    ).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = BOUNDS_RE.search(bound)
+        if match:  # the DEFAULT partition has no bounds
+            start, end = (datetime.fromisoformat(v) for v in match.groups())
+            partitions.append((name, start, end))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+# ---------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------
+
+
+def _create_partitions(conn, table: str, interval: str, since, until) -> list[str]:
+    """Partitions covering [since, until) that do not overlap existing ones."""
+    existing = list_partitions(conn, table)
+    step = INTERVALS[interval]
+    created = []
+
+    start = interval_start(since, interval)
+    while start < until:
+        end = start + step
+        overlaps = any(s < end and start < e for _, s, e in existing)
+
+        if not overlaps:
+            name = partition_name(table, start)
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+            created.append(name)
+
+        start = end
+
+    return created
+
+
+def _drop_default_partition(conn, table: str):
+    """Remove the DEFAULT partition earlier versions created, if it is empty."""
+    default = f"{table}_default"
+    if conn.execute(text("SELECT to_regclass(:t)"), {"t": default}).scalar() is None:
+        return
+
+    if conn.execute(text(f"SELECT 1 FROM {default} LIMIT 1")).first():
+        logger.error(
+            f"❌ {default} holds rows: move them out and drop it, ranges "
+            f"overlapping them cannot be created"
+        )
+        return
+
+    conn.execute(text(f"DROP TABLE {default}"))
+    logger.info(f"🗑 Dropped default partition {default}")
+
+
+def ensure_partitions(
+    bind=engine,
+    interval: str = PARTITION_INTERVAL,
+    ahead: int = PARTITION_PREMAKE,
+) -> list[str]:
+    """Create this interval's and the next `ahead` intervals' partitions."""
+    now = datetime.utcnow()
+    until = interval_start(now, interval) + INTERVALS[interval] * (ahead + 1)
+    created = []
+
+    for table in PARTITION_KEYS:
+        with bind.begin() as conn:
+            if not is_partitioned(conn, table):
+                logger.warning(f"⚠️ {table} is not partitioned, run --convert first")
+                continue
+            _drop_default_partition(conn, table)
+            created += _create_partitions(conn, table, interval, now, until)
+
+    for name in created:
+        logger.info(f"🏗 Created partition {name}")
+    return created
+
+
+def drop_expired_partitions(bind=engine, keep_days: int = 30) -> list[str]:
+    """
+    Detach and drop partitions that end before now - keep_days.
+    Child tables go first: detaching a news_articles partition checks that
+    no embeddings / analyses still reference it.
+    """
+    horizon = datetime.utcnow() - timedelta(days=keep_days)
+    dropped = []
+
+    for table in reversed(list(PARTITION_KEYS)):
+        with bind.connect() as conn:
+            if not is_partitioned(conn, table):
+                continue
+            expired = [
+                name for name, _, end in list_partitions(conn, table) if end <= horizon
+            ]
+
+        for name in expired:
+            with bind.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                conn.execute(text(f"DROP TABLE {name}"))
+            with bind.connect() as conn:
+                bump_feed_version(conn)
+            logger.info(f"🗑 Dropped partition {name}")
+            dropped.append(name)
+
+    return dropped
+
+
+def maintain_partitions(bind=engine, keep_days: int = None) -> dict:
+    created = ensure_partitions(bind)
+    dropped = drop_expired_partitions(bind, keep_days) if keep_days else []
+    return {"created": created, "dropped": dropped}
+
+
+# ---------------------------------------------------------
+# Migration from the unpartitioned schema
+# ---------------------------------------------------------
+
+# Constraints of the partitioned tables; every key includes the partition key.
+# The remaining model indexes are built afterwards by ensure_indexes().
+PARTITIONED_CONSTRAINTS = {
+    "news_articles": [
+        "ALTER TABLE news_articles ADD CONSTRAINT news_articles_pkey "
+        "PRIMARY KEY (id, created_at)",
+        "ALTER TABLE news_articles ADD CONSTRAINT news_articles_url_key "
+        "UNIQUE (url, created_at)",
+        "ALTER TABLE news_articles ADD CONSTRAINT news_articles_hash_key "
+        "UNIQUE (hash, created_at)",
+    ],
+    "embeddings": [
+        "ALTER TABLE embeddings ADD CONSTRAINT embeddings_pkey "
+        "PRIMARY KEY (id, article_created_at)",
+        "ALTER TABLE embeddings ADD CONSTRAINT embeddings_article_id_fkey "
+        "FOREIGN KEY (article_id, article_created_at) "
+        "REFERENCES news_articles (id, created_at) ON DELETE CASCADE",
+        "CREATE UNIQUE INDEX ux_embeddings_article_id "
+        "ON embeddings (article_id, article_created_at)",
+    ],
+    "ai_analysis": [
+        "ALTER TABLE ai_analysis ADD CONSTRAINT ai_analysis_pkey "
+        "PRIMARY KEY (id, article_created_at)",
+        "ALTER TABLE ai_analysis ADD CONSTRAINT ai_analysis_article_id_fkey "
+        "FOREIGN KEY (article_id, article_created_at) "
+        "REFERENCES news_articles (id, created_at) ON DELETE CASCADE",
+    ],
+}
+
+
+def convert_to_partitioned(
+    bind=engine, interval: str = PARTITION_INTERVAL, ahead: int = PARTITION_PREMAKE
+) -> dict:
+    """
+    Rebuild the three tables as partitioned tables, in one transaction.
+    Rows are copied, id sequences carry over, and partitions are created
+    from the oldest article up to `ahead` intervals from now. Embeddings /
+    analyses without an article cannot be placed and are dropped.
+    """
+    interval_start(datetime.utcnow(), interval)  # validates the interval
+
+    with bind.begin() as conn:
+        partitioned = [t for t in PARTITION_KEYS if is_partitioned(conn, t)]
+        if len(partitioned) == len(PARTITION_KEYS):
+            return {"converted": [], "partitions": []}
+        if partitioned:
+            raise RuntimeError(f"Partly partitioned schema: {partitioned}")
+
+        conn.execute(
+            text(
+                "LOCK TABLE news_articles, embeddings, ai_analysis "
+                "IN ACCESS EXCLUSIVE MODE"
+            )
+        )
+
+        # Partition keys must be set on every row
+        conn.execute(
+            text(
+                """
+            UPDATE news_articles
+            SET created_at = COALESCE(published_at, timezone('utc', now()))
+            WHERE created_at IS NULL
+        """
+            )
+        )
+        for table in ("embeddings", "ai_analysis"):
+            conn.execute(
+                text(
+                    f"""
+                UPDATE {table} t
+                SET article_created_at = na.created_at
+                FROM news_articles na
+                WHERE na.id = t.article_id
+                  AND t.article_created_at IS DISTINCT FROM na.created_at
+            """
+                )
+            )
+
+        oldest = conn.execute(text("SELECT MIN(created_at) FROM news_articles"))
+        since = oldest.scalar() or datetime.utcnow()
+        until = interval_start(datetime.utcnow(), interval) + INTERVALS[interval] * (
+            ahead + 1
+        )
+
+        # The old tables' sequences keep numbering the new ones
+        sequences = {}
+        for table in PARTITION_KEYS:
+            sequences[table] = conn.execute(
+                text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}
+            ).scalar()
+            conn.execute(text(f"ALTER SEQUENCE {sequences[table]} OWNED BY NONE"))
+            conn.execute(text(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned"))
+
+        partitions = []
+        copied = {}
+        for table, key in PARTITION_KEYS.items():
+            conn.execute(
+                text(
+                    f"CREATE TABLE {table} (LIKE {table}_unpartitioned "
+                    f"INCLUDING DEFAULTS) PARTITION BY RANGE ({key})"
+                )
+            )
+            partitions += _create_partitions(conn, table, interval, since, until)
+
+            copied[table] = conn.execute(
+                text(
+                    f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned "
+                    f"WHERE {key} IS NOT NULL"
+                )
+            ).rowcount
+
+        for table in reversed(list(PARTITION_KEYS)):
+            conn.execute(text(f"DROP TABLE {table}_unpartitioned CASCADE"))
+
+        for table in PARTITION_KEYS:
+            conn.execute(text(f"ALTER SEQUENCE {sequences[table]} OWNED BY {table}.id"))
+            for statement in PARTITIONED_CONSTRAINTS[table]:
+                conn.execute(text(statement))
+
+    logger.info(f"✅ Partitioned by {interval}: {copied} rows copied")
+    return {"converted": list(PARTITION_KEYS), "rows": copied, "partitions": partitions}
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Imported here: retention imports this module
+    from app.services.news.retention import retention_horizon_days
+
+    if "--convert" in sys.argv:
+        from app.database.migrations import run_migrations
+
+        logger.info(f"✅ Converted: {convert_to_partitioned()}")
+        logger.info(f"✅ Migrations done: {run_migrations()}")
+    else:
+        result = maintain_partitions(keep_days=retention_horizon_days())
+        logger.info(f"✅ Partition maintenance done: {result}")
@@ -9,9 +9,13 @@ class AiAnalysis(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    article_id = Column(Integer, ForeignKey("news_articles.id", ondelete="CASCADE"))
+    article_id = Column(
+        Integer, ForeignKey("news_articles.id", ondelete="CASCADE"), index=True
+    )
     prediction = Column(Text, nullable=False)
 
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    # The article's created_at: partition key when PARTITION_INTERVAL is set
+    article_created_at = Column(TIMESTAMP, nullable=True)
 
     article = relationship("NewsArticle", back_populates="analysis")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Index, Integer, ForeignKey, Text, TIMESTAMP
 from sqlalchemy.orm import relationship
 from pgvector.sqlalchemy import Vector
 from app.database.base import Base
@@ -13,4 +13,25 @@ class Embedding(Base):
     embedding = Column(Vector(768), nullable=False)
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
 
+    # Copied from the article so similarity search filters without a join
+    published_at = Column(TIMESTAMP, nullable=True)
+    category = Column(Text, nullable=True)
+    # The article's created_at: partition key when PARTITION_INTERVAL is set
+    article_created_at = Column(TIMESTAMP, nullable=True)
+
+    # One vector per article; recency window for search
+    __table_args__ = (
+        Index(
+            "ux_embeddings_article_id",
+            article_id,
+            unique=True,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_embeddings_published_at",
+            published_at,
+            postgresql_concurrently=True,
+        ),
+    )
+
     article = relationship("NewsArticle", back_populates="embeddings")
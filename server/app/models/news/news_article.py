@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, Text, TIMESTAMP
+from sqlalchemy import Boolean, Column, Index, Integer, Text, TIMESTAMP, false
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 from datetime import datetime
@@ -19,6 +19,50 @@ class NewsArticle(Base):
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
     is_relevant = Column(Integer, default=1)
     is_analyzed = Column(Boolean, default=False)
+    # Set by the embedding backfill; "has no embedding" as an indexable column
+    is_embedded = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    # Keyset pagination of the feed: (created_at, id) over analyzed articles
+    __table_args__ = (
+        Index(
+            "ix_news_articles_feed",
+            created_at,
+            id,
+            postgresql_where=is_analyzed == True,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_news_articles_feed_category",
+            category,
+            created_at,
+            id,
+            postgresql_where=is_analyzed == True,
+            postgresql_concurrently=True,
+        ),
+        # Pipeline backlogs: only pending rows, so they stay small. The queues
+        # walk them by id; /stats counts them and reads MIN(created_at).
+        Index(
+            "ix_news_articles_pending_summary",
+            id,
+            postgresql_include=["created_at"],
+            postgresql_where=summary.is_(None),
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_news_articles_pending_embedding",
+            id,
+            postgresql_include=["created_at"],
+            postgresql_where=is_embedded == False,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_news_articles_pending_analysis",
+            id,
+            postgresql_include=["created_at"],
+            postgresql_where=(is_analyzed == False) & summary.isnot(None),
+            postgresql_concurrently=True,
+        ),
+    )
 
     embeddings = relationship(
         "Embedding",
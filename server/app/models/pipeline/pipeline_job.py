@@ -0,0 +1,45 @@
+from sqlalchemy import BigInteger, Column, Index, Integer, Text, TIMESTAMP, text
+from app.database.base import Base
+
+# Naive UTC from the database clock, so workers on other hosts agree on it
+UTC_NOW = text("timezone('utc', now())")
+
+
+class PipelineJob(Base):
+    """One pipeline stage (embedding / analysis) still to be run for an article."""
+
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(BigInteger, primary_key=True)
+    stage = Column(Text, nullable=False)
+    # No foreign key: news_articles' key is (id, created_at) when partitioned
+    article_id = Column(Integer, nullable=False)
+
+    # queued | running | dead (finished jobs are deleted)
+    status = Column(Text, nullable=False, server_default="queued")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    # Claimable from then on: enqueue time, retry backoff or lease expiry
+    available_at = Column(TIMESTAMP, nullable=False, server_default=UTC_NOW)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(TIMESTAMP, nullable=False, server_default=UTC_NOW)
+    updated_at = Column(TIMESTAMP, nullable=False, server_default=UTC_NOW)
+
+    # One job per article and stage; claims walk live jobs by availability
+    __table_args__ = (
+        Index(
+            "ux_pipeline_jobs_stage_article",
+            stage,
+            article_id,
+            unique=True,
+            postgresql_concurrently=True,
+        ),
+        Index(
+            "ix_pipeline_jobs_claim",
+            stage,
+            available_at,
+            id,
+            postgresql_where=status != "dead",
+            postgresql_concurrently=True,
+        ),
+    )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.database.database import SessionLocal
 from app.services.news.importer import import_scraped_articles_core
+from app.services.news.summary_service import summarize_pending_articles
 
 router = APIRouter()
 
@@ -19,3 +20,8 @@ def get_db():
 def import_scraped_articles():
     response = import_scraped_articles_core()
     return {"total_processed": len(response), "details": response}
+
+
+@router.post("/summarize-pending")
+async def summarize_pending(limit: int = 100):
+    return await summarize_pending_articles(limit=limit)
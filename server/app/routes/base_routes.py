@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy import text
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
 
 router = APIRouter()
 
@@ -12,6 +12,6 @@ def ping():
 
 
 @router.get("/test-db")
-def test_db(db: Session = Depends(get_db)):
-    result = db.execute(text("SELECT NOW();")).fetchone()
+async def test_db(db: AsyncSession = Depends(get_async_db)):
+    result = (await db.execute(text("SELECT NOW();"))).fetchone()
     return {"db_time": str(result[0])}
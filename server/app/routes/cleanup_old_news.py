@@ -1,34 +1,32 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from fastapi import APIRouter, HTTPException
+from app.services.news.retention import (
+    RetentionAlreadyRunning,
+    retention_progress,
+    run_retention,
+)
 
 router = APIRouter()
 
 
+# Sync on purpose: the batched job sleeps between batches in the threadpool
 @router.post("/cleanup-old-news")
-def cleanup_old_news(db: Session = Depends(get_db)):
-    # delete embeddings of articles older than 30 days
-    db.execute(
-        text(
-            """
-        DELETE FROM embeddings
-        USING news_articles
-        WHERE embeddings.article_id = news_articles.id
-        AND news_articles.created_at < NOW() - INTERVAL '30 days';
-    """
-        )
-    )
+def cleanup_old_news():
+    """Run the batched retention job now and report what it deleted."""
+    try:
+        stats = run_retention()
+    except RetentionAlreadyRunning:
+        raise HTTPException(status_code=409, detail="Cleanup already running")
 
-    # delete articles older than 30 days
-    db.execute(
-        text(
-            """
-        DELETE FROM news_articles
-        WHERE created_at < NOW() - INTERVAL '30 days';
-    """
-        )
-    )
+    return {
+        "status": "success",
+        "message": (
+            f"Deleted {stats['deleted']} expired articles in {stats['batches']} "
+            f"batches, {stats['partitions_dropped']} partitions dropped"
+        ),
+        **stats,
+    }
 
-    db.commit()
-    return {"status": "success", "message": "Old news and embeddings deleted"}
+
+@router.get("/cleanup-old-news/status")
+def cleanup_old_news_status():
+    return retention_progress()
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
+from app.services.news.stats_service import (
+    STATS_COUNT_MODE,
+    compute_stats,
+    stats_cache,
+)
 
 router = APIRouter()
 
 
 @router.get("/stats")
-def stats(db: Session = Depends(get_db)):
-    articles_count = db.execute(text("SELECT COUNT(*) FROM news_articles;")).scalar()
-    embeddings_count = db.execute(text("SELECT COUNT(*) FROM embeddings;")).scalar()
-    return {"articles": articles_count, "embeddings": embeddings_count}
+async def stats(
+    mode: str = Query(STATS_COUNT_MODE, pattern="^(exact|estimate)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Scraped often: at most one computation per mode every STATS_CACHE_TTL
+    return await stats_cache.get(mode, lambda: compute_stats(db, mode))
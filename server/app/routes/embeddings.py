@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.services.ai.embedding_pipeline import backfill_article_embeddings
+from app.services.ai.embedding_pipeline import backfill_article_embeddings_batched
+from app.services.ai.embeddings import EMBED_BATCH_SIZE, get_cache
 from app.database.database import get_db
 
 router = APIRouter(prefix="/embeddings", tags=["embeddings"])
 
 
 @router.post("/backfill")
-def backfill_embeddings(limit: int = 100, db: Session = Depends(get_db)):
-    created = backfill_article_embeddings(db, limit=limit)
-    return {"created": created}
+def backfill_embeddings(
+    limit: int = Query(100, ge=1),
+    batch_size: int = Query(EMBED_BATCH_SIZE, ge=1),
+    db: Session = Depends(get_db),
+):
+    return backfill_article_embeddings_batched(db, limit=limit, batch_size=batch_size)
+
+
+@router.get("/cache-stats")
+def embedding_cache_stats():
+    return get_cache().stats()
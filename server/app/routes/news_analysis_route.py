@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 
-from app.services.deepseek_client.deepseek_client import analyze_article_with_deepseek
+from app.services.deepseek_client.deepseek_client import (
+    analyze_article_with_deepseek_async,
+)
 
 
 router = APIRouter()
@@ -54,10 +56,15 @@ async def analyze_news(article_id: int):
     similar = await get_similar_articles(article_id)
 
     # 3. Run full analysis (DeepSeek Reasoner)
-    ai_response = await analyze_article_with_deepseek(article, similar)
+    ai_response = await analyze_article_with_deepseek_async(article, similar)
+    if ai_response["status"] == "ERROR":
+        raise HTTPException(
+            status_code=502, detail=f"Analysis failed: {ai_response['prediction']}"
+        )
+    prediction = ai_response["prediction"]
 
     # 4. Check NO_IMPACT logic
-    if ai_response.strip() == "NO_IMPACT":
+    if prediction.strip() == "NO_IMPACT":
         return {
             "article_id": article_id,
             "status": "NO_IMPACT",
@@ -70,5 +77,5 @@ async def analyze_news(article_id: int):
         "article_id": article_id,
         "status": "IMPACT",
         "save_to_db": True,
-        "analysis": ai_response,
+        "analysis": prediction,
     }
@@ -1,36 +1,47 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.routes.articles import get_db
-from app.models.news.news_article import NewsArticle
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
+from app.services.news.feed_cache import etag_matches, feed_cache
+from app.services.news.feed_service import decode_cursor, feed_payload, feed_query
 
 router = APIRouter()
 
 
+async def build_news_feed(
+    db: AsyncSession, limit: int, category: str = None, cursor: str = None
+) -> dict:
+    # One extra row tells whether a next page exists
+    rows = (await db.execute(feed_query(limit + 1, category, cursor))).all()
+    return feed_payload(rows, limit)
+
+
 @router.get("/news")
-def get_news_feed(limit: int = 45, db: Session = Depends(get_db)):
-    articles = (
-        db.query(NewsArticle)
-        .filter(NewsArticle.is_analyzed == True)
-        .order_by(NewsArticle.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-
-    return {
-        "last_updated": articles[0].created_at if articles else None,
-        "data": [
-            {
-                "id": article.id,
-                "title": article.title,
-                "summary": article.summary,
-                "category": article.category,
-                "published_at": article.published_at,
-                "analysis": {
-                    "prediction": (
-                        article.analysis[0].prediction if article.analysis else None
-                    ),
-                },
-            }
-            for article in articles
-        ],
-    }
+async def get_news_feed(
+    request: Request,
+    limit: int = Query(45, ge=1, le=200),
+    category: str = None,
+    cursor: str = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    key = (limit, category, cursor)
+    version = await feed_cache.version(db)
+
+    entry = feed_cache.get(key, version)
+    if entry is None:
+        payload = await build_news_feed(db, limit, category, cursor)
+        entry = feed_cache.put(key, version, payload)
+
+    # Clients revalidate every poll; unchanged feeds cost no body and no feed
+    # query, only the version check (at most once per FEED_CACHE_VERSION_TTL)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -1,19 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.database.database import get_db
-from app.services.search.search_service import search_similar_articles
+from app.services.search.search_service import search_articles
 
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
 class SearchRequest(BaseModel):
-    query: str
+    query: str = Field(..., min_length=1, max_length=1000)
+    top_k: int = Field(10, ge=1, le=50)
+    category: Optional[str] = None
+    published_after: Optional[datetime] = None
+    published_before: Optional[datetime] = None
+    min_similarity: float = Field(0.0, ge=0.0, le=1.0)
 
 
+# Sync on purpose: encoding the query is CPU work, so it runs in the threadpool
 @router.post("/")
 def semantic_search(body: SearchRequest, db: Session = Depends(get_db)):
-    results = search_similar_articles(db, body.query)
+    results = search_articles(
+        db,
+        body.query,
+        top_k=body.top_k,
+        category=body.category,
+        published_after=body.published_after,
+        published_before=body.published_before,
+        min_similarity=body.min_similarity,
+    )
     return {"query": body.query, "results": results}
@@ -1,3 +1,4 @@
+import os
 import asyncio
 import logging
 
@@ -5,9 +6,18 @@ from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.services.pipeline.daily_pipeline import process_daily_news
+from app.database.partitioning import maintain_partitions, partitioning_enabled
+from app.services.news.retention import (
+    RetentionAlreadyRunning,
+    retention_horizon_days,
+    run_retention,
+)
 
 logger = logging.getLogger(__name__)
 
+# UTC hour of the daily retention cleanup
+RETENTION_CRON_HOUR = int(os.getenv("RETENTION_CRON_HOUR", "3"))
+
 # ✅ Blocking scheduler (systemd-safe, UTC-based)
 scheduler = BlockingScheduler(timezone="UTC")
 
@@ -21,6 +31,27 @@ def _run_daily_news_pipeline():
     logger.info("✅ Daily news pipeline completed")
 
 
+def _run_retention_cleanup():
+    """
+    Batched deletion of expired articles (see services/news/retention.py).
+    """
+    logger.info("🗑 Starting retention cleanup")
+    try:
+        stats = run_retention()
+        logger.info(f"✅ Retention cleanup completed: {stats}")
+    except RetentionAlreadyRunning:
+        logger.warning("⏭ Retention cleanup already running, skipped")
+
+
+def _run_partition_maintenance():
+    """
+    Create upcoming partitions and drop expired ones (app/database/partitioning.py).
+    """
+    result = maintain_partitions(keep_days=retention_horizon_days())
+    if result["created"] or result["dropped"]:
+        logger.info(f"✅ Partition maintenance: {result}")
+
+
 def start_scheduler():
     """
     Start APScheduler with DAILY cron job.
@@ -45,6 +76,32 @@ def start_scheduler():
         coalesce=True,
     )
 
+    # =====================================================
+    # ✅ DAILY RETENTION — RETENTION_CRON_HOUR UTC, away from the pipeline
+    # =====================================================
+    scheduler.add_job(
+        _run_retention_cleanup,
+        trigger=CronTrigger(hour=RETENTION_CRON_HOUR, minute=0),
+        id="retention_cleanup",
+        replace_existing=True,
+        max_instances=1,
+        misfire_grace_time=3600,
+        coalesce=True,
+    )
+
+    # =====================================================
+    # ✅ HOURLY PARTITION MAINTENANCE — only with PARTITION_INTERVAL set
+    # =====================================================
+    if partitioning_enabled():
+        scheduler.add_job(
+            _run_partition_maintenance,
+            trigger=CronTrigger(minute=15),
+            id="partition_maintenance",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
     scheduler.start()
     logger.info("🕒 APScheduler started — daily job scheduled at 01:20 AM PKT")
 
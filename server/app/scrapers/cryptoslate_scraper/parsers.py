@@ -0,0 +1,238 @@
+import os
+from datetime import datetime, timezone
+from bs4 import BeautifulSoup, SoupStrainer
+from dateutil import parser as dateparser
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as FastHTMLParser
+    except ImportError:
+        FastHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+# "auto" | "selectolax" | "lxml" | "html.parser"
+SCRAPER_PARSER = os.getenv("SCRAPER_PARSER", "auto")
+
+ARTICLE_SELECTORS = [
+    "div.single__content-wrap p",
+    "div.single__content p",
+    "article.page-article p",
+    "article p",
+]
+
+# Body containers; they may sit outside <article>, so the restricted tree
+# (which may hold only teaser <article>s) is trusted only when one matched
+CONTENT_DIV_SELECTORS = ARTICLE_SELECTORS[:2]
+
+TOP_NEWS_PANEL_ID = "top-news-panel-24h"
+
+# Restricted parses only build the tags the extractors read
+ARTICLE_STRAINER = SoupStrainer(["article", "time", "meta"])
+TOP_NEWS_STRAINER = SoupStrainer("section", id=TOP_NEWS_PANEL_ID)
+
+
+# -----------------------------
+# Backend selection
+# -----------------------------
+def available_backends() -> list[str]:
+    backends = ["html.parser"]
+    if HAS_LXML:
+        backends.append("lxml")
+    if FastHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+def resolve_backend(backend: str = None) -> str:
+    """Pick the requested backend, falling back to html.parser if it is missing."""
+    backend = backend or SCRAPER_PARSER
+
+    if backend == "auto":
+        return available_backends()[-1]
+    if backend in available_backends():
+        return backend
+    return "html.parser"
+
+
+# -----------------------------
+# Published date extractor
+# -----------------------------
+def _parse_post_date(raw_text: str) -> str:
+    try:
+        dt = dateparser.parse(raw_text, fuzzy=True)
+        return dt.isoformat()
+    except Exception:
+        return ""
+
+
+def fetch_published_date(soup: BeautifulSoup) -> str:
+    time_tag = soup.find("time", attrs={"datetime": True})
+    if time_tag and time_tag.get("datetime"):
+        return time_tag["datetime"].strip()
+
+    meta_time = soup.find("meta", {"property": "article:published_time"})
+    if meta_time and meta_time.get("content"):
+        return meta_time["content"].strip()
+
+    post_date_div = soup.find("div", class_="post-date")
+    if post_date_div:
+        return _parse_post_date(post_date_div.get_text(" ", strip=True))
+
+    return ""
+
+
+def _published_date_fast(tree) -> str:
+    time_tag = tree.css_first("time[datetime]")
+    if time_tag and (time_tag.attributes.get("datetime") or "").strip():
+        return time_tag.attributes["datetime"].strip()
+
+    meta_time = tree.css_first('meta[property="article:published_time"]')
+    if meta_time and (meta_time.attributes.get("content") or "").strip():
+        return meta_time.attributes["content"].strip()
+
+    post_date_div = tree.css_first("div.post-date")
+    if post_date_div:
+        return _parse_post_date(post_date_div.text(separator=" ", strip=True))
+
+    return ""
+
+
+# -----------------------------
+# Article page
+# -----------------------------
+def _article_content(soup: BeautifulSoup, selectors=ARTICLE_SELECTORS) -> str:
+    for sel in selectors:
+        paragraphs = soup.select(sel)
+        if paragraphs:
+            return "\n".join(p.get_text(strip=True) for p in paragraphs)
+    return "NO_CONTENT_FOUND"
+
+
+def _parse_article_soup(html: str, features: str) -> tuple[str, str]:
+    # Restricted tree first; anything it misses is retried on the full page
+    soup = BeautifulSoup(html, features, parse_only=ARTICLE_STRAINER)
+    content = _article_content(soup, CONTENT_DIV_SELECTORS)
+    published_at = fetch_published_date(soup)
+
+    if content == "NO_CONTENT_FOUND" or not published_at:
+        soup = BeautifulSoup(html, features)
+        content = _article_content(soup)
+        published_at = fetch_published_date(soup)
+
+    return content, published_at
+
+
+def _parse_article_fast(html: str) -> tuple[str, str]:
+    tree = FastHTMLParser(html)
+
+    content = "NO_CONTENT_FOUND"
+    for sel in ARTICLE_SELECTORS:
+        paragraphs = tree.css(sel)
+        if paragraphs:
+            content = "\n".join(p.text(strip=True) for p in paragraphs)
+            break
+
+    return content, _published_date_fast(tree)
+
+
+def parse_article_html(html: str, backend: str = None) -> tuple[str, str]:
+    """Return (content, published_at) for an article page."""
+    backend = resolve_backend(backend)
+
+    if backend == "selectolax":
+        return _parse_article_fast(html)
+    return _parse_article_soup(html, backend)
+
+
+# -----------------------------
+# Top-news listing page
+# -----------------------------
+def _listing_entry(href: str, title: str) -> dict:
+    return {
+        "category": "top-news",
+        "title": title.strip(),
+        "url": href,
+        "published_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _parse_top_news_soup(html: str, features: str, limit: int) -> list[dict]:
+    soup = BeautifulSoup(html, features, parse_only=TOP_NEWS_STRAINER)
+
+    # Target 24h panel
+    panel = soup.find("section", id=TOP_NEWS_PANEL_ID)
+    if not panel:
+        return []
+
+    articles = []
+    seen = set()
+
+    for article in panel.select("article.top-news-article"):
+        link = article.find("a", class_="top-news-link", href=True)
+        if not link:
+            continue
+
+        href = link["href"]
+        if href in seen:
+            continue
+        seen.add(href)
+
+        title = link.get("title") or link.get_text(strip=True)
+        if not title:
+            continue
+
+        articles.append(_listing_entry(href, title))
+
+        if len(articles) >= limit:
+            break
+
+    return articles
+
+
+def _parse_top_news_fast(html: str, limit: int) -> list[dict]:
+    tree = FastHTMLParser(html)
+
+    panel = tree.css_first(f"section#{TOP_NEWS_PANEL_ID}")
+    if not panel:
+        return []
+
+    articles = []
+    seen = set()
+
+    for article in panel.css("article.top-news-article"):
+        link = article.css_first("a.top-news-link[href]")
+        if not link:
+            continue
+
+        href = link.attributes.get("href")
+        if not href or href in seen:
+            continue
+        seen.add(href)
+
+        title = link.attributes.get("title") or link.text(strip=True)
+        if not title:
+            continue
+
+        articles.append(_listing_entry(href, title))
+
+        if len(articles) >= limit:
+            break
+
+    return articles
+
+
+def parse_top_news_html(html: str, limit: int = 15, backend: str = None) -> list[dict]:
+    backend = resolve_backend(backend)
+
+    if backend == "selectolax":
+        return _parse_top_news_fast(html, limit)
+    return _parse_top_news_soup(html, backend, limit)
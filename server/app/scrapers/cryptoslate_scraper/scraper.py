@@ -1,18 +1,30 @@
 import os
 import re
+import json
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from dateutil import parser as dateparser
 from datetime import datetime, timezone, timedelta
-from app.services.news.paths import UNPROCESSED_DIR
+from app.services.news.paths import BASE_SCRAPER_DIR, UNPROCESSED_DIR
+from app.scrapers.cryptoslate_scraper.parsers import (
+    parse_article_html,
+    parse_top_news_html,
+)
 
 
 MAX_ARTICLE_AGE_DAYS = 14
 
 BASE_URL = "https://cryptoslate.com/"
+TOP_NEWS_URL = BASE_URL + "top-news/"
+
+# Concurrent fetch politeness: N requests in flight, min gap between request starts
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "4"))
+SCRAPER_MIN_INTERVAL = float(os.getenv("SCRAPER_MIN_INTERVAL", "0.75"))
 
 HEADERS = {
     "User-Agent": (
@@ -25,10 +37,31 @@ HEADERS = {
 }
 
 OUTPUT_FOLDER = UNPROCESSED_DIR
+SPOOL_CATEGORY = "Top News"
+# Markers fetch_full_article / the parsers return instead of a body: a
+# failed download is retried next run, a page without text (video, podcast,
+# live blog) is not
+FETCH_FAILED = "CONTENT_FETCH_FAILED"
+NO_CONTENT = "NO_CONTENT_FOUND"
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
+# ETag / Last-Modified of the listing page from the last completed run
+LISTING_STATE_PATH = os.path.join(BASE_SCRAPER_DIR, "listing_state.json")
+# URLs the importer stored (saves the DB lookup for recent ones)
+SEEN_URLS_PATH = os.path.join(BASE_SCRAPER_DIR, "seen_urls.txt")
+SEEN_URLS_MAX = 5000
+
 session = requests.Session()
 session.headers.update(HEADERS)
+# Keep-alive pool large enough for every concurrent fetch to the same host
+session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=max(10, SCRAPER_CONCURRENCY)),
+)
+session.mount(
+    "http://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=max(10, SCRAPER_CONCURRENCY)),
+)
 
 # -----------------------------
 # Helpers
@@ -78,17 +111,58 @@ def looks_like_title(text: str) -> bool:
     return True
 
 
-def safe_get(url: str, max_retries: int = 3, timeout: int = 15):
+class PolitenessPolicy:
+    """
+    Spaces request starts at least `min_interval` seconds apart across all
+    threads (plus a little jitter). Concurrency itself is bounded by the
+    worker pool size.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPER_CONCURRENCY,
+        min_interval: float = SCRAPER_MIN_INTERVAL,
+        jitter: float = 0.25,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = (
+                slot
+                + self.min_interval
+                + random.uniform(0.0, self.jitter * self.min_interval)
+            )
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def safe_get(
+    url: str,
+    max_retries: int = 3,
+    timeout: int = 15,
+    policy: PolitenessPolicy = None,
+    headers: dict = None,
+):
     for attempt in range(max_retries):
+        if policy:
+            policy.wait()
         try:
-            resp = session.get(url, timeout=timeout)
+            resp = session.get(url, timeout=timeout, headers=headers)
         except requests.RequestException:
             if attempt == max_retries - 1:
                 return None
         else:
             if resp.status_code in (403, 429):
                 return None
-            if resp.status_code == 200:
+            # 304 only comes back for conditional requests
+            if resp.status_code in (200, 304):
                 return resp
 
         time.sleep((2**attempt) + random.uniform(0.0, 1.0))
@@ -97,132 +171,232 @@ def safe_get(url: str, max_retries: int = 3, timeout: int = 15):
 
 
 # -----------------------------
-# Published date extractor
+# Conditional GET state
 # -----------------------------
-def fetch_published_date(soup: BeautifulSoup) -> str:
-    time_tag = soup.find("time", attrs={"datetime": True})
-    if time_tag and time_tag.get("datetime"):
-        return time_tag["datetime"].strip()
+def load_listing_state() -> dict:
+    try:
+        with open(LISTING_STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    meta_time = soup.find("meta", {"property": "article:published_time"})
-    if meta_time and meta_time.get("content"):
-        return meta_time["content"].strip()
 
-    post_date_div = soup.find("div", class_="post-date")
-    if post_date_div:
-        try:
-            raw_text = post_date_div.get_text(" ", strip=True)
-            dt = dateparser.parse(raw_text, fuzzy=True)
-            return dt.isoformat()
-        except Exception:
-            pass
+def forget_listing_state():
+    """Make the next listing request unconditional."""
+    save_listing_state({})
+
 
-    return ""
+def save_listing_state(state: dict):
+    try:
+        with open(LISTING_STATE_PATH, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+    except OSError as e:
+        print("Failed to save listing state:", e)
+
+
+def conditional_headers(state: dict) -> dict:
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
 
 
 # -----------------------------
-# Full article fetch
+# URL-level dedup
 # -----------------------------
-def fetch_full_article(url: str) -> tuple[str, str]:
-    time.sleep(random.uniform(1.5, 3.5))
+def load_seen_urls() -> list[str]:
+    try:
+        with open(SEEN_URLS_PATH, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    except OSError:
+        return []
 
-    resp = safe_get(url)
-    if resp is None:
-        return "CONTENT_FETCH_FAILED", ""
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+def remember_seen_urls(urls: list[str]):
+    seen = load_seen_urls() + list(urls)
+    try:
+        with open(SEEN_URLS_PATH, "w", encoding="utf-8") as f:
+            f.write("\n".join(seen[-SEEN_URLS_MAX:]) + "\n")
+    except OSError as e:
+        print("Failed to update seen-URL index:", e)
+
 
-    selectors = [
-        "div.single__content-wrap p",
-        "div.single__content p",
-        "article.page-article p",
-        "article p",
-    ]
+def existing_article_urls(urls: list[str]) -> set[str]:
+    """URLs already in news_articles; empty if the DB is unreachable."""
+    try:
+        from app.database.database import SessionLocal
+        from app.services.news.article_service import find_existing_urls
+
+        with SessionLocal() as db:
+            return find_existing_urls(db, urls)
+    except Exception as e:
+        print("URL dedup against DB skipped:", e)
+        return set()
 
-    content = "NO_CONTENT_FOUND"
-    for sel in selectors:
-        paragraphs = soup.select(sel)
-        if paragraphs:
-            content = "\n".join(p.get_text(strip=True) for p in paragraphs)
-            break
 
-    published_at = fetch_published_date(soup)
-    return content, published_at
+def filter_new_articles(articles: list[dict]) -> list[dict]:
+    """Drop listing entries whose URL was stored by an earlier run."""
+    urls = [art["url"] for art in articles]
+    known = set(load_seen_urls()) | existing_article_urls(urls)
+    return [art for art in articles if art["url"] not in known]
 
 
 # -----------------------------
-# Category listing scraper
+# Full article fetch
 # -----------------------------
-def scrape_top_news(limit: int = 15):
-    url = "https://cryptoslate.com/top-news/"
-    resp = safe_get(url)
+def fetch_full_article(url: str, policy: PolitenessPolicy = None) -> tuple[str, str]:
+    # Serial mode keeps the fixed random pause; concurrent mode uses the policy
+    if policy is None:
+        time.sleep(random.uniform(1.5, 3.5))
+
+    resp = safe_get(url, policy=policy)
     if resp is None:
-        return []
+        return "CONTENT_FETCH_FAILED", ""
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return parse_article_html(resp.text)
 
-    articles = []
-    seen = set()
 
-    # Target 24h panel
-    panel = soup.find("section", id="top-news-panel-24h")
-    if not panel:
+# -----------------------------
+# Category listing scraper
+# -----------------------------
+def scrape_top_news(limit: int = 15, listing_state: dict = None):
+    """
+    With `listing_state`, the listing is requested conditionally and the
+    state is updated in place with the new ETag / Last-Modified.
+    """
+    headers = conditional_headers(listing_state) if listing_state is not None else None
+
+    resp = safe_get(TOP_NEWS_URL, headers=headers)
+    if resp is None or resp.status_code == 304:
         return []
 
-    for article in panel.select("article.top-news-article"):
-        link = article.find("a", class_="top-news-link", href=True)
-        if not link:
-            continue
+    if listing_state is not None:
+        listing_state["etag"] = resp.headers.get("ETag")
+        listing_state["last_modified"] = resp.headers.get("Last-Modified")
 
-        href = link["href"]
-        if href in seen:
-            continue
-        seen.add(href)
+    return parse_top_news_html(resp.text, limit=limit)
 
-        title = link.get("title") or link.get_text(strip=True)
-        if not title:
-            continue
-
-        articles.append(
-            {
-                "category": "top-news",
-                "title": title.strip(),
-                "url": href,
-                "published_at": datetime.now(timezone.utc).isoformat(),
-            }
-        )
 
-        if len(articles) >= limit:
-            break
+# -----------------------------
+# Concurrent article fetch
+# -----------------------------
+def iter_fetched_articles(articles: list[dict], policy: PolitenessPolicy = None):
+    """
+    Fetch article bodies with a bounded worker pool and yield
+    (art, content, published_at) as soon as each download finishes.
+    """
+    policy = policy or PolitenessPolicy()
+
+    with ThreadPoolExecutor(
+        max_workers=policy.concurrency, thread_name_prefix="scraper"
+    ) as pool:
+        futures = {
+            pool.submit(fetch_full_article, art["url"], policy): art for art in articles
+        }
+        for future in as_completed(futures):
+            content, published_at = future.result()
+            yield futures[future], content, published_at
+
+
+def write_article_file(art: dict, content: str, published_at: str) -> str:
+    ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")
+    filename = f"topnews__{sanitize_filename(art['title'])}__{ts}.txt"
+    path = os.path.join(OUTPUT_FOLDER, filename)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Category: {SPOOL_CATEGORY}\n")
+        f.write(f"Title: {art['title']}\n")
+        f.write(f"URL: {art['url']}\n")
+        f.write(f"PublishedAt: {published_at}\n")
+        f.write("\n" + "=" * 80 + "\n\n")
+        f.write(content)
+
+    return path
+
+
+def build_article_record(
+    art: dict, content: str, published_at: str, spool: bool
+) -> dict:
+    """
+    Same shape as `load_all_scraped_articles` entries. With `spool`, the
+    article is also written to UNPROCESSED_DIR as a crash-recovery copy.
+    """
+    filepath = write_article_file(art, content, published_at) if spool else None
 
-    return articles
+    return {
+        "category": SPOOL_CATEGORY,
+        "title": art["title"],
+        "url": art["url"],
+        "published_at": published_at,
+        "content": content,
+        "filename": os.path.basename(filepath) if filepath else None,
+        "filepath": filepath,
+    }
 
 
 # -----------------------------
-# MAIN SCRAPER FUNCTION
+# MAIN SCRAPER FUNCTIONS
 # -----------------------------
-def scrape_latest_news() -> int:
-    total_saved = 0
+def iter_latest_news(concurrency: int = SCRAPER_CONCURRENCY, spool: bool = True):
+    """
+    Yield scraped article records as they are downloaded, so the importer
+    can start inserting while later pages are still being fetched.
+    """
+    # Unchanged listing (304) or only known URLs -> nothing else is requested
+    listing_state = load_listing_state()
+    articles = filter_new_articles(
+        scrape_top_news(limit=15, listing_state=listing_state)
+    )
+
+    if concurrency > 1:
+        fetched = iter_fetched_articles(
+            articles,
+            PolitenessPolicy(
+                concurrency=concurrency, min_interval=SCRAPER_MIN_INTERVAL
+            ),
+        )
+    else:
+        fetched = _iter_fetched_serially(articles)
+
+    complete = True
+    empty_urls = []
+    for art, content, published_at in fetched:
+        if content == FETCH_FAILED:
+            # Not stored and not remembered, so the next run tries it again
+            print(f"Skipping {art['url']}: {content}")
+            complete = False
+            continue
+        if content == NO_CONTENT:
+            # Nothing to store, and fetching it again would not change that
+            print(f"Skipping {art['url']}: {content}")
+            empty_urls.append(art["url"])
+            continue
+        yield build_article_record(art, content, published_at, spool)
+
+    remember_seen_urls(empty_urls)
 
-    articles = scrape_top_news(limit=15)
+    # Validators are only kept once every listed article was handed off;
+    # a 304 next run would otherwise hide the ones that failed
+    if complete:
+        save_listing_state(listing_state)
 
-    for art in articles:
+
+def _iter_fetched_serially(articles: list[dict]):
+    for i, art in enumerate(articles):
+        if i:
+            time.sleep(random.uniform(1.0, 2.0))
         content, published_at = fetch_full_article(art["url"])
+        yield art, content, published_at
 
-        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")
-        filename = f"topnews__{sanitize_filename(art['title'])}__{ts}.txt"
-        path = os.path.join(OUTPUT_FOLDER, filename)
 
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(f"Category: Top News\n")
-            f.write(f"Title: {art['title']}\n")
-            f.write(f"URL: {art['url']}\n")
-            f.write(f"PublishedAt: {published_at}\n")
-            f.write("\n" + "=" * 80 + "\n\n")
-            f.write(content)
+def scrape_latest_news(concurrency: int = SCRAPER_CONCURRENCY) -> int:
+    """Directory mode: spool every article to UNPROCESSED_DIR for the importer."""
+    total_saved = 0
 
+    for _ in iter_latest_news(concurrency=concurrency, spool=True):
         total_saved += 1
-        time.sleep(random.uniform(1.0, 2.0))
 
     return total_saved
 
@@ -1,11 +1,11 @@
 from app.database.database import SessionLocal
-from app.services.ai.embedding_pipeline import backfill_article_embeddings
+from app.services.ai.embedding_pipeline import backfill_article_embeddings_batched
 
 
 def backfill_embeddings_core():
     db = SessionLocal()
     try:
-        backfill_article_embeddings(db, limit=100)
+        stats = backfill_article_embeddings_batched(db, limit=100)
     finally:
         db.close()
-    return {"status": "completed"}
+    return {"status": "completed", **stats}
@@ -0,0 +1,246 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# CONFIGURATION
+# ---------------------------------------------------------
+
+# On-disk tier location ("" disables it and keeps the in-memory tier only).
+# Defaults to the user's cache dir, so it does not depend on the CWD.
+EMBED_CACHE_DIR = os.getenv(
+    "EMBED_CACHE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+        "crypto-news-ai",
+        "embeddings",
+    ),
+)
+EMBED_CACHE_MEMORY_SIZE = int(os.getenv("EMBED_CACHE_MEMORY_SIZE", "2048"))
+
+# Index "key" of a truncation marker: never a sha256 hex digest
+TRUNCATED_KEY = "-" * 64
+
+
+# ---------------------------------------------------------
+# Keys
+# ---------------------------------------------------------
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(text: str, model_name: str) -> str:
+    combined = f"{model_name}::{normalize_text(text)}"
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------
+# Two-tier cache
+# ---------------------------------------------------------
+
+
+class EmbeddingCache:
+    """
+    Embedding cache keyed by sha256(model name + normalized text).
+
+    Tier 1 is an in-memory LRU. Tier 2 lives in `<cache_dir>/<model_name>/`:
+    `vectors.f32` is an append-only float32 matrix read through np.memmap,
+    and `index.tsv` maps each key to its row. Vectors are written before
+    their index line, so a crash can only lose entries, never corrupt them:
+    an index line without its newline, or pointing past the last complete
+    vector, is ignored. Torn tails are only repaired by the next append,
+    under the file lock, so readers never cut short another process's write.
+    Cutting off a torn vector appends a truncation marker to the index: the
+    rows past it are reused, so every earlier line pointing there is void.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        cache_dir: str = EMBED_CACHE_DIR,
+        memory_size: int = EMBED_CACHE_MEMORY_SIZE,
+    ):
+        self.model_name = model_name
+        self.dim = dim
+        self.memory_size = memory_size
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._rows = {}
+        self._matrix = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._dir = os.path.join(cache_dir, model_name) if cache_dir else None
+        if self._dir:
+            os.makedirs(self._dir, exist_ok=True)
+            self._vectors_path = os.path.join(self._dir, "vectors.f32")
+            self._index_path = os.path.join(self._dir, "index.tsv")
+            self._load_index()
+
+    # -----------------------------
+    # Disk tier
+    # -----------------------------
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * 4
+
+    def _disk_rows(self) -> int:
+        if not os.path.exists(self._vectors_path):
+            return 0
+        return os.path.getsize(self._vectors_path) // self._row_bytes
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return
+
+        n_rows = self._disk_rows()
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                entry = self._parse_index_line(line)
+                if entry is None:
+                    continue
+                key, row = entry
+                if key == TRUNCATED_KEY:
+                    self._forget_rows_from(row)
+                elif row < n_rows:
+                    self._rows[key] = row
+
+        logger.info(f"Embedding cache: {len(self._rows)} vectors on disk")
+
+    @staticmethod
+    def _parse_index_line(line: str):
+        # A line cut short by a crash has no newline yet
+        if not line.endswith("\n"):
+            return None
+        key, sep, row = line[:-1].partition("\t")
+        if not sep or len(key) != 64 or not row.isdigit():
+            return None
+        return key, int(row)
+
+    def _forget_rows_from(self, row: int):
+        self._rows = {key: r for key, r in self._rows.items() if r < row}
+        self._matrix = None
+
+    def _disk_get(self, key: str):
+        row = self._rows.get(key)
+        if row is None:
+            return None
+
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            n_rows = self._disk_rows()
+            if row >= n_rows:
+                return None
+            self._matrix = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(n_rows, self.dim),
+            )
+        return self._matrix[row].tolist()
+
+    def _disk_put(self, key: str, vector):
+        data = np.asarray(vector, dtype=np.float32).tobytes()
+        if len(data) != self._row_bytes:
+            return
+
+        with open(self._index_path, "a+b") as index_file:
+            # The index lock also serializes appends from other processes
+            if fcntl:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                with open(self._vectors_path, "ab") as f:
+                    # Drop a torn vector left by a writer that crashed
+                    row = f.tell() // self._row_bytes
+                    truncated = f.tell() != row * self._row_bytes
+                    if truncated:
+                        f.truncate(row * self._row_bytes)
+                    f.write(data)
+
+                # ... and end a torn index line. The extra tab keeps it
+                # unparseable: "<key>\t12" may be the start of "<key>\t123"
+                index_file.seek(0, os.SEEK_END)
+                if index_file.tell():
+                    index_file.seek(-1, os.SEEK_END)
+                    if index_file.read(1) != b"\n":
+                        index_file.write(b"\t\n")
+                # Lines that still point at the cut-off row now mean nothing
+                if truncated:
+                    index_file.write(f"{TRUNCATED_KEY}\t{row}\n".encode("utf-8"))
+                    self._forget_rows_from(row)
+                index_file.write(f"{key}\t{row}\n".encode("utf-8"))
+                index_file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+
+        self._rows[key] = row
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def get(self, text: str):
+        key = cache_key(text, self.model_name)
+
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+            if self._dir:
+                vector = self._disk_get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, vector: list[float]):
+        key = cache_key(text, self.model_name)
+
+        with self._lock:
+            self._remember(key, vector)
+            if self._dir and key not in self._rows:
+                try:
+                    self._disk_put(key, vector)
+                except OSError as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+
+    def _remember(self, key: str, vector: list[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "model": self.model_name,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._rows),
+            }
@@ -1,32 +1,155 @@
+import os
+import time
+import logging
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models.news.news_article import NewsArticle
 from app.models.news.embedding import Embedding
-from app.services.ai.embeddings import get_embedding
+from app.services.ai.embeddings import EMBED_BATCH_SIZE, get_embeddings
+from app.services.pipeline.queues import pending_embeddings
+from app.services.search.memory_index import sync_memory_index
 
+logger = logging.getLogger(__name__)
 
-def backfill_article_embeddings(db: Session, limit: int = 100):
-    # Find articles that have no embedding yet
-    articles = (
-        db.query(NewsArticle)
-        .outerjoin(Embedding, Embedding.article_id == NewsArticle.id)
-        .filter(Embedding.id.is_(None))
-        .limit(limit)
+# Articles loaded, encoded and bulk-inserted per DB chunk
+EMBED_CHUNK_SIZE = int(os.getenv("EMBED_CHUNK_SIZE", "256"))
+
+
+def _fetch_pending_articles(db: Session, after_id: int, limit: int):
+    # Articles that have no embedding yet (only the columns we need)
+    return db.execute(pending_embeddings(after_id, limit)).all()
+
+
+def _check_positive(**sizes):
+    for name, size in sizes.items():
+        if size <= 0:
+            raise ValueError(f"{name} must be positive, got {size}")
+
+
+def _embed_chunk(db: Session, articles, batch_size: int) -> tuple[int, int]:
+    """Embed and flag a chunk; returns (embedded, flagged_only) counts."""
+    ids = [a.id for a in articles]
+    # Embedded outside the pipeline with the flag left unset: only flag them
+    stored = set(
+        db.execute(select(Embedding.article_id).where(Embedding.article_id.in_(ids)))
+        .scalars()
         .all()
     )
+    articles = [a for a in articles if a.id not in stored]
 
-    created = 0
+    texts = [f"{a.title}\n\n{a.content}" for a in articles]
+    vectors = get_embeddings(texts, batch_size=batch_size) if texts else []
+
+    # A concurrent backfill may have embedded some of these meanwhile.
+    # No conflict target: the unique key is (article_id) or, on a
+    # partitioned table, (article_id, article_created_at)
+    inserted = []
+    if articles:
+        inserted = db.execute(
+            pg_insert(Embedding)
+            .on_conflict_do_nothing()
+            .returning(Embedding.article_id),
+            [
+                {
+                    "article_id": a.id,
+                    "embedding": vector,
+                    "published_at": a.published_at,
+                    "category": a.category,
+                    "article_created_at": a.created_at,
+                }
+                for a, vector in zip(articles, vectors)
+            ],
+        ).all()
+    # Off the embedding queue, with the embedding in the same transaction
+    db.execute(
+        update(NewsArticle).where(NewsArticle.id.in_(ids)).values(is_embedded=True)
+    )
+    db.commit()
+    return len(inserted), len(ids) - len(inserted)
 
-    for article in articles:
-        text = f"{article.title}\n\n{article.content}"
-        vector = get_embedding(text)
 
-        embedding_row = Embedding(
-            article_id=article.id,
-            embedding=vector,
+def backfill_article_embeddings_batched(
+    db: Session,
+    limit: int = 100,
+    batch_size: int = EMBED_BATCH_SIZE,
+    chunk_size: int = EMBED_CHUNK_SIZE,
+) -> dict:
+    """
+    Embed up to `limit` articles that have no embedding yet.
+
+    Each chunk of `chunk_size` articles is encoded with one encode call
+    (`batch_size` texts per forward pass) and written with one bulk insert.
+    Articles whose embedding was already stored are only flagged: they count
+    towards `limit` and `flagged`, but not towards `created` or the rate.
+    """
+    _check_positive(limit=limit, batch_size=batch_size, chunk_size=chunk_size)
+
+    processed = 0
+    created = 0
+    flagged = 0
+    last_id = 0  # keyset cursor: each chunk continues where the last one ended
+    started = time.perf_counter()
+
+    while processed < limit:
+        articles = _fetch_pending_articles(
+            db, last_id, min(chunk_size, limit - processed)
         )
+        if not articles:
+            break
+        last_id = articles[-1].id
 
-        db.add(embedding_row)
-        created += 1
+        embedded, flagged_only = _embed_chunk(db, articles, batch_size)
+        processed += len(articles)
+        created += embedded
+        flagged += flagged_only
 
-    db.commit()
-    return created
+        logger.info(f"🧠 Embedded {created} articles so far ({flagged} only flagged)")
+
+        if len(articles) < chunk_size:
+            break
+
+    if processed:
+        sync_memory_index(db)
+
+    elapsed = time.perf_counter() - started
+    rate = created / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        f"✅ Embedding backfill: {created} articles in {elapsed:.1f}s "
+        f"({rate:.1f} articles/sec, batch_size={batch_size}), "
+        f"{flagged} already embedded"
+    )
+
+    return {
+        "created": created,
+        "flagged": flagged,
+        "elapsed_seconds": round(elapsed, 3),
+        "articles_per_sec": round(rate, 2),
+    }
+
+
+def embed_articles_by_id(
+    db: Session, article_ids: list[int], batch_size: int = EMBED_BATCH_SIZE
+) -> int:
+    """
+    Embed the given articles (job queue workers); embedded ones are skipped.
+    Returns how many new embeddings were stored.
+    """
+    _check_positive(batch_size=batch_size)
+
+    articles = db.execute(
+        pending_embeddings(0, None).where(NewsArticle.id.in_(article_ids))
+    ).all()
+    if not articles:
+        return 0
+    embedded, _ = _embed_chunk(db, articles, batch_size)
+    sync_memory_index(db)
+    return embedded
+
+
+def backfill_article_embeddings(
+    db: Session, limit: int = 100, batch_size: int = EMBED_BATCH_SIZE
+):
+    return backfill_article_embeddings_batched(db, limit=limit, batch_size=batch_size)[
+        "created"
+    ]
@@ -1,16 +1,73 @@
+import os
 from sentence_transformers import SentenceTransformer
+from app.services.ai.embedding_cache import EmbeddingCache
+
+EMBED_MODEL_NAME = "all-mpnet-base-v2"
+EMBED_DIM = 768  # mpnet embedding size
+
+# Texts per SentenceTransformer.encode call (tune for the box's CPU / RAM)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
 
 _model = None
+_cache = None
 
 
 def get_model():
     global _model
     if _model is None:
-        _model = SentenceTransformer("all-mpnet-base-v2")
+        _model = SentenceTransformer(EMBED_MODEL_NAME)
     return _model
 
 
-def get_embedding(text: str) -> list[float]:
+def get_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache(EMBED_MODEL_NAME, EMBED_DIM)
+    return _cache
+
+
+def get_embedding(text: str, use_cache: bool = True) -> list[float]:
+    cache = get_cache() if use_cache else None
+    if cache:
+        cached = cache.get(text)
+        if cached is not None:
+            return cached
+
     model = get_model()
-    emb = model.encode(text, normalize_embeddings=True)
-    return emb.tolist()
+    emb = model.encode(text, normalize_embeddings=True).tolist()
+
+    if cache:
+        cache.put(text, emb)
+    return emb
+
+
+def get_embeddings(
+    texts: list[str], batch_size: int = EMBED_BATCH_SIZE, use_cache: bool = True
+) -> list[list[float]]:
+    """
+    Encode many texts with a single encode call.
+    The model batches internally, which is far cheaper than one call per text.
+    Only cache misses are sent to the model.
+    """
+    if not texts:
+        return []
+
+    cache = get_cache() if use_cache else None
+    results = [cache.get(t) if cache else None for t in texts]
+    missing = [i for i, vector in enumerate(results) if vector is None]
+
+    if missing:
+        model = get_model()
+        embs = model.encode(
+            [texts[i] for i in missing],
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).tolist()
+
+        for i, emb in zip(missing, embs):
+            results[i] = emb
+            if cache:
+                cache.put(texts[i], emb)
+
+    return results
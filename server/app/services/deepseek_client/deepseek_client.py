@@ -1,7 +1,21 @@
 import os
+import time
+import random
+import asyncio
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import List
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    APIConnectionError,
+    APIStatusError,
+)
+from app.services.rate_limiter import TokenBucket
 
 # ---------------------------------------------------------
 # Load environment variables
@@ -12,10 +26,137 @@ DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 DEEPSEEK_API_BASE = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1")
 DEEPSEEK_MODEL = "deepseek-reasoner"
 
+DEEPSEEK_TIMEOUT_SECONDS = float(os.getenv("DEEPSEEK_TIMEOUT_SECONDS", "120"))
+DEEPSEEK_MAX_RETRIES = int(os.getenv("DEEPSEEK_MAX_RETRIES", "4"))
+DEEPSEEK_BACKOFF_BASE = 1.0  # seconds, doubled per attempt
+DEEPSEEK_BACKOFF_CAP = 30.0
+DEEPSEEK_MAX_CONNECTIONS = int(os.getenv("DEEPSEEK_MAX_CONNECTIONS", "16"))
+# Shared request budget for every DeepSeek call in this process.
+# Unlimited (0) unless configured; 429s are still retried with Retry-After.
+DEEPSEEK_REQUESTS_PER_MINUTE = float(os.getenv("DEEPSEEK_REQUESTS_PER_MINUTE", "0"))
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
 # ---------------------------------------------------------
-# Initialize client
+# Initialize clients
 # ---------------------------------------------------------
-client = OpenAI(api_key=DEEPSEEK_API_KEY, base_url=DEEPSEEK_API_BASE)
+# Retries are handled below so 429 / Retry-After and the rate budget apply
+# to both the sync and the async path.
+client = OpenAI(
+    api_key=DEEPSEEK_API_KEY,
+    base_url=DEEPSEEK_API_BASE,
+    timeout=DEEPSEEK_TIMEOUT_SECONDS,
+    max_retries=0,
+)
+
+rate_limiter = TokenBucket(DEEPSEEK_REQUESTS_PER_MINUTE)
+
+# httpx connection pools are bound to the event loop that created them,
+# so keep one AsyncOpenAI (and its keep-alive pool) per running loop.
+_async_clients = weakref.WeakKeyDictionary()
+# Tasks that close a loop's client; the loop itself only holds them weakly
+_client_closers = set()
+
+
+async def _close_when_loop_ends(async_client: AsyncOpenAI):
+    # asyncio.run() and Runner.close() cancel pending tasks before closing
+    # the loop, so the pool is closed while its loop can still run it
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await async_client.close()
+
+
+def get_async_client() -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+
+    if async_client is None:
+        async_client = AsyncOpenAI(
+            api_key=DEEPSEEK_API_KEY,
+            base_url=DEEPSEEK_API_BASE,
+            timeout=DEEPSEEK_TIMEOUT_SECONDS,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=DEEPSEEK_MAX_CONNECTIONS,
+                    max_keepalive_connections=DEEPSEEK_MAX_CONNECTIONS,
+                    keepalive_expiry=60,
+                ),
+            ),
+        )
+        _async_clients[loop] = async_client
+
+        closer = loop.create_task(_close_when_loop_ends(async_client))
+        _client_closers.add(closer)
+        closer.add_done_callback(_client_closers.discard)
+
+    return async_client
+
+
+# ---------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------
+def _parse_retry_after(value: str):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(error: Exception, attempt: int):
+    """
+    Seconds to wait before retrying `error`, or None if it should not be retried.
+    Honours Retry-After; otherwise exponential backoff with full jitter.
+    """
+    if isinstance(error, APIStatusError):
+        if error.status_code not in RETRYABLE_STATUS:
+            return None
+        retry_after = _parse_retry_after(error.response.headers.get("retry-after"))
+        if retry_after is not None:
+            return min(retry_after, DEEPSEEK_BACKOFF_CAP)
+    elif not isinstance(error, APIConnectionError):
+        return None
+
+    backoff = min(DEEPSEEK_BACKOFF_CAP, DEEPSEEK_BACKOFF_BASE * (2**attempt))
+    return random.uniform(0, backoff)
+
+
+def create_chat_completion(**kwargs):
+    """Sync chat completion with rate limiting and retries."""
+    for attempt in range(DEEPSEEK_MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        try:
+            return client.chat.completions.create(model=DEEPSEEK_MODEL, **kwargs)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == DEEPSEEK_MAX_RETRIES:
+                raise
+            time.sleep(delay)
+
+
+async def create_chat_completion_async(**kwargs):
+    """Async chat completion over the pooled client, same policy as the sync one."""
+    async_client = get_async_client()
+
+    for attempt in range(DEEPSEEK_MAX_RETRIES + 1):
+        await rate_limiter.acquire_async()
+        try:
+            return await async_client.chat.completions.create(
+                model=DEEPSEEK_MODEL, **kwargs
+            )
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == DEEPSEEK_MAX_RETRIES:
+                raise
+            await asyncio.sleep(delay)
 
 
 # ---------------------------------------------------------
@@ -108,29 +249,47 @@ END.
 # ---------------------------------------------------------
 # Run DeepSeek
 # ---------------------------------------------------------
+def _analysis_request(prompt: str) -> dict:
+    return {
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a crypto market analyst.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 900,
+        "temperature": 0.3,
+    }
+
+
+def _analysis_result(response) -> dict:
+    # ✅ Extract ONLY the human-readable analysis
+    analysis_text = response.choices[0].message.content.strip()
+
+    return {
+        "status": "OK",
+        "prediction": analysis_text,  # 🔥 CLEAN TEXT ONLY
+    }
+
+
 def run_deepseek(prompt: str) -> dict:
     try:
-        response = client.chat.completions.create(
-            model=DEEPSEEK_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a crypto market analyst.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=900,
-            temperature=0.3,
-        )
-
-        # ✅ Extract ONLY the human-readable analysis
-        analysis_text = response.choices[0].message.content.strip()
+        response = create_chat_completion(**_analysis_request(prompt))
+        return _analysis_result(response)
 
+    except Exception as e:
         return {
-            "status": "OK",
-            "prediction": analysis_text,  # 🔥 CLEAN TEXT ONLY
+            "status": "ERROR",
+            "prediction": str(e),
         }
 
+
+async def run_deepseek_async(prompt: str) -> dict:
+    try:
+        response = await create_chat_completion_async(**_analysis_request(prompt))
+        return _analysis_result(response)
+
     except Exception as e:
         return {
             "status": "ERROR",
@@ -141,15 +300,29 @@ def run_deepseek(prompt: str) -> dict:
 # ---------------------------------------------------------
 # Full pipeline
 # ---------------------------------------------------------
-def analyze_article_with_deepseek(
-    article: dict,
-    similar_articles: List[dict],
-):
-    final_prompt = build_analysis_prompt(
+def _article_prompt(article: dict, similar_articles: List[dict]) -> str:
+    return build_analysis_prompt(
         article_title=article["title"],
         article_summary=article["summary"],
         reference_articles=similar_articles,
     )
 
+
+def analyze_article_with_deepseek(
+    article: dict,
+    similar_articles: List[dict],
+):
+    final_prompt = _article_prompt(article, similar_articles)
+
     ai_output = run_deepseek(final_prompt)
     return ai_output
+
+
+async def analyze_article_with_deepseek_async(
+    article: dict,
+    similar_articles: List[dict],
+):
+    final_prompt = _article_prompt(article, similar_articles)
+
+    ai_output = await run_deepseek_async(final_prompt)
+    return ai_output
@@ -1,5 +1,8 @@
 import re
-from app.services.deepseek_client.deepseek_client import client, DEEPSEEK_MODEL
+from app.services.deepseek_client.deepseek_client import (
+    create_chat_completion,
+    create_chat_completion_async,
+)
 
 """
 DeepSeek-powered, high-quality summarizer.
@@ -10,15 +13,11 @@ and extracts only the core facts needed for downstream crypto impact analysis.
 """
 
 
-def summarize_with_deepseek(text: str, published_at: str = None) -> str:
-    """
-    High-signal summary generator using DeepSeek.
-    Includes published date explicitly to help downstream automated analysis.
-    """
+def _needs_summary(text: str) -> bool:
+    return bool(text) and len(text.strip()) >= 30
 
-    if not text or len(text.strip()) < 30:
-        return text.strip()
 
+def _summary_request(text: str, published_at: str = None) -> dict:
     # Format date block for LLM consumption
     date_block = ""
     if published_at:
@@ -57,27 +56,56 @@ Article:
 Return ONLY the clean, refined summary — nothing else.
 """
 
+    return {
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    "You produce high-precision summaries for automated analysis. "
+                    "Your goal is to retain only the highest-signal facts."
+                ),
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,
+        "max_tokens": 500,
+    }
+
+
+def _clean_summary(response) -> str:
+    summary = response.choices[0].message.content.strip()
+    return re.sub(r"\s+", " ", summary).strip()
+
+
+def summarize_with_deepseek(text: str, published_at: str = None) -> str:
+    """
+    High-signal summary generator using DeepSeek.
+    Includes published date explicitly to help downstream automated analysis.
+    """
+
+    if not _needs_summary(text):
+        return text.strip()
+
     try:
-        response = client.chat.completions.create(
-            model=DEEPSEEK_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You produce high-precision summaries for automated analysis. "
-                        "Your goal is to retain only the highest-signal facts."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=500,
-        )
+        response = create_chat_completion(**_summary_request(text, published_at))
+        return _clean_summary(response)
 
-        summary = response.choices[0].message.content.strip()
-        summary = re.sub(r"\s+", " ", summary).strip()
+    except Exception as e:
+        print("DeepSeek summarization error:", e)
+        return text[:400].strip()
 
-        return summary
+
+async def summarize_with_deepseek_async(text: str, published_at: str = None) -> str:
+    """Async twin of `summarize_with_deepseek` using the pooled client."""
+
+    if not _needs_summary(text):
+        return text.strip()
+
+    try:
+        response = await create_chat_completion_async(
+            **_summary_request(text, published_at)
+        )
+        return _clean_summary(response)
 
     except Exception as e:
         print("DeepSeek summarization error:", e)
@@ -100,3 +128,12 @@ def generate_summary(text: str, published_at: str = None) -> str:
     except Exception:
         # Fallback to a truncated preview
         return text[:400].strip()
+
+
+async def generate_summary_async(text: str, published_at: str = None) -> str:
+    """Async variant of `generate_summary` for event-loop callers."""
+    try:
+        cleaned = text.strip().replace("\n", " ")
+        return await summarize_with_deepseek_async(cleaned, published_at=published_at)
+    except Exception:
+        return text[:400].strip()
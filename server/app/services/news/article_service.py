@@ -1,11 +1,10 @@
+from sqlalchemy import Text, any_, bindparam, literal, or_, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from dateutil import parser as dateparser
 import hashlib
-from app.services.deepseek_client.summarizer import (
-    generate_summary,
-)  # <-- ADD THIS IMPORT
 from app.models.news.news_article import NewsArticle
 
 
@@ -14,6 +13,45 @@ def compute_hash(title: str, url: str, content: str) -> str:
     return hashlib.sha256(combined.encode("utf-8")).hexdigest()
 
 
+# Transaction-scoped locks on each url and hash about to be checked, taken
+# in key order so two importers with overlapping chunks cannot deadlock.
+# The duplicate check and the insert then see every committed copy: the
+# unique indexes (gone once the tables are partitioned) are not relied on.
+LOCK_ARTICLE_KEYS_SQL = text(
+    """
+SELECT count(pg_advisory_xact_lock(key)) FROM (
+    SELECT DISTINCT hashtextextended(k, 0) AS key
+    FROM unnest(:keys) AS k
+    ORDER BY key
+) keys
+"""
+).bindparams(bindparam("keys", type_=ARRAY(Text)))
+
+
+def lock_article_keys(db: Session, urls: list[str], hashes: list[str]):
+    """Serialize imports of the same url / hash until the caller commits."""
+    db.execute(LOCK_ARTICLE_KEYS_SQL, {"keys": list(urls) + list(hashes)})
+
+
+def find_existing_urls(db: Session, urls: list[str]) -> set[str]:
+    """Return the subset of `urls` already stored in news_articles."""
+    if not urls:
+        return set()
+
+    rows = db.query(NewsArticle.url).filter(NewsArticle.url.in_(urls)).all()
+    return {row.url for row in rows}
+
+
+def parse_published_at(published_at: str):
+    # --- Convert PublishedAt safely ---
+    if not published_at:
+        return None
+    try:
+        return dateparser.parse(published_at)
+    except Exception:
+        return None  # failsafe
+
+
 def insert_article(
     db: Session,
     title: str,
@@ -25,6 +63,7 @@ def insert_article(
     try:
         # Compute deterministic hash
         article_hash = compute_hash(title, url, content)
+        lock_article_keys(db, [url], [article_hash])
 
         # Duplicate check
         existing = (
@@ -34,26 +73,17 @@ def insert_article(
         )
 
         if existing:
+            db.rollback()  # releases the locks
             return {"status": "exists", "id": existing.id}
 
-        # --- Convert PublishedAt safely ---
-        pub_datetime = None
-        if published_at:
-            try:
-                pub_datetime = dateparser.parse(published_at)
-            except Exception:
-                pub_datetime = None  # failsafe
+        pub_datetime = parse_published_at(published_at)
 
-        # --- Generate LLM summary (async) ---
-        content_summary = generate_summary(content, pub_datetime)
-        summary = f"{title}. {content_summary}"
-
-        # --- Create new DB row ---
+        # --- Create new DB row (summary is filled later by summary_service) ---
         new_article = NewsArticle(
             title=title,
             url=url,
             content=content,
-            summary=summary,
+            summary=None,
             category=category,
             hash=article_hash,
             created_at=datetime.utcnow(),
@@ -74,3 +104,111 @@ def insert_article(
     except Exception as e:
         db.rollback()
         return {"status": "error", "error": str(e)}
+
+
+def insert_articles_batch(db: Session, articles: list[dict]) -> list[dict]:
+    """
+    Batch variant of `insert_article` for a chunk of parsed articles.
+
+    One `url = ANY(...) OR hash = ANY(...)` query finds existing rows and one
+    `INSERT ... RETURNING` stores the new ones.
+    Returns one `insert_article`-style result per input, in input order.
+    If the chunk fails, it is rolled back and retried one row at a time, so
+    a bad row only fails itself.
+    """
+    if not articles:
+        return []
+
+    try:
+        hashes = [compute_hash(a["title"], a["url"], a["content"]) for a in articles]
+        urls = [a["url"] for a in articles]
+        lock_article_keys(db, urls, hashes)
+
+        # Duplicate check (whole chunk, one round trip)
+        existing = (
+            db.query(NewsArticle.id, NewsArticle.url, NewsArticle.hash)
+            .filter(
+                or_(
+                    NewsArticle.url == any_(literal(urls, ARRAY(Text))),
+                    NewsArticle.hash == any_(literal(hashes, ARRAY(Text))),
+                )
+            )
+            .all()
+        )
+        id_by_url = {row.url: row.id for row in existing}
+        id_by_hash = {row.hash: row.id for row in existing}
+
+        results = [None] * len(articles)
+        new_rows = []
+        row_by_key = {}  # url / hash -> index into new_rows
+        row_of = {}  # input index -> index into new_rows
+        duplicate_of = {}  # input index -> new_rows index of its first copy
+
+        for i, (art, article_hash) in enumerate(zip(articles, hashes)):
+            existing_id = id_by_url.get(art["url"]) or id_by_hash.get(article_hash)
+            if existing_id:
+                results[i] = {"status": "exists", "id": existing_id}
+                continue
+
+            # Same article twice in one chunk: resolved after the insert
+            first = row_by_key.get(art["url"], row_by_key.get(article_hash))
+            if first is not None:
+                duplicate_of[i] = first
+                continue
+
+            row_of[i] = len(new_rows)
+            row_by_key[art["url"]] = row_by_key[article_hash] = len(new_rows)
+            new_rows.append(
+                {
+                    "title": art["title"],
+                    "url": art["url"],
+                    "content": art["content"],
+                    "summary": None,  # filled later by summary_service
+                    "category": art["category"],
+                    "hash": article_hash,
+                    "created_at": datetime.utcnow(),
+                    "published_at": parse_published_at(art.get("published_at")),
+                    "is_relevant": 1,
+                    "is_analyzed": False,
+                }
+            )
+
+        inserted_ids = {}  # url -> id
+        if new_rows:
+            stmt = (
+                pg_insert(NewsArticle)
+                .values(new_rows)
+                .on_conflict_do_nothing()
+                .returning(NewsArticle.id, NewsArticle.url)
+            )
+            inserted_ids = {row.url: row.id for row in db.execute(stmt)}
+
+        db.commit()
+
+        # Backstop only: the locks above already keep out concurrent copies
+        conflict = {"status": "duplicate", "error": "conflicting row already exists"}
+
+        for i, j in row_of.items():
+            new_id = inserted_ids.get(new_rows[j]["url"])
+            results[i] = {"status": "inserted", "id": new_id} if new_id else conflict
+
+        for i, j in duplicate_of.items():
+            new_id = inserted_ids.get(new_rows[j]["url"])
+            results[i] = {"status": "exists", "id": new_id} if new_id else conflict
+
+        return results
+
+    except Exception:
+        # One bad row must not fail the chunk: store the rows one by one
+        db.rollback()
+        return [
+            insert_article(
+                db,
+                art["title"],
+                art["url"],
+                art["content"],
+                art["category"],
+                art.get("published_at"),
+            )
+            for art in articles
+        ]
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+
+# How often (seconds) a worker re-reads the feed version from the database
+FEED_CACHE_VERSION_TTL = float(os.getenv("FEED_CACHE_VERSION_TTL", "5"))
+# Distinct `limit` values kept serialized
+FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "32"))
+
+# Writers call bump_feed_version() after committing anything the feed shows
+# (a new analysis, deleted articles, dropped partitions). A sequence is never
+# locked and not rolled back, and bumping after the commit means a reader
+# that sees the new value also sees the change. MAX(id) comes from the
+# primary key index and covers writers that died before bumping.
+# Summaries are written before an article is analyzed, so they never change
+# a row the feed already shows.
+VERSION_SQL = text(
+    """
+    SELECT
+        (SELECT COALESCE(MAX(id), 0) FROM ai_analysis),
+        (SELECT last_value FROM feed_generation_seq)
+"""
+)
+
+BUMP_SQL = text("SELECT nextval('feed_generation_seq')")
+
+
+def bump_feed_version(db):
+    """Call after the commit: every process rebuilds on its next version check."""
+    db.execute(BUMP_SQL)
+
+
+@dataclass
+class FeedEntry:
+    version: str
+    etag: str
+    body: bytes
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 weak comparison against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class FeedCache:
+    """
+    Serialized feed responses keyed by request parameters.
+
+    Entries are tagged with the feed version they were built from. The version
+    is read from the database at most every `version_ttl` seconds, so a
+    pipeline running in another process is picked up without coordination;
+    `invalidate()` forces the next request to re-read it immediately.
+    """
+
+    def __init__(
+        self,
+        version_ttl: float = FEED_CACHE_VERSION_TTL,
+        max_entries: int = FEED_CACHE_MAX_ENTRIES,
+    ):
+        self.version_ttl = version_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._version: str | None = None
+        self._checked_at = 0.0
+
+    async def version(self, db) -> str:
+        now = time.monotonic()
+        if self._version is None or now - self._checked_at >= self.version_ttl:
+            newest, generation = (await db.execute(VERSION_SQL)).one()
+            self._version = f"{newest}:{generation}"
+            self._checked_at = now
+        return self._version
+
+    def get(self, key, version: str) -> FeedEntry | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, version: str, payload) -> FeedEntry:
+        body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+        entry = FeedEntry(version=version, etag=make_etag(body), body=body)
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        self._entries.clear()
+        self._version = None
+
+
+feed_cache = FeedCache()
+
+
+def invalidate_feed_cache():
+    feed_cache.invalidate()
@@ -0,0 +1,99 @@
+import json
+import base64
+from datetime import datetime
+from sqlalchemy import select, tuple_
+from app.models.news.news_article import NewsArticle
+from app.models.news.ai_analysis import AiAnalysis
+
+
+# ---------------------------------------------------------
+# Cursors: opaque base64 of the last row's (created_at, id)
+# ---------------------------------------------------------
+
+
+def encode_cursor(created_at: datetime, article_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), article_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raise ValueError for anything that is not a cursor we issued."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, article_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(article_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+# ---------------------------------------------------------
+# Feed query: one statement, only the columns the feed returns
+# ---------------------------------------------------------
+
+
+def latest_prediction():
+    """Correlated subquery: the newest prediction stored for the outer article."""
+    return (
+        select(AiAnalysis.prediction)
+        .where(AiAnalysis.article_id == NewsArticle.id)
+        .order_by(AiAnalysis.created_at.desc(), AiAnalysis.id.desc())
+        .limit(1)
+        .correlate(NewsArticle)
+        .scalar_subquery()
+    )
+
+
+def feed_query(limit: int, category: str = None, cursor: str = None):
+    """
+    Newest analyzed articles first. Pages continue strictly below the cursor
+    row, so every page is an index range scan of `limit` rows, however deep.
+    """
+    query = select(
+        NewsArticle.id,
+        NewsArticle.title,
+        NewsArticle.summary,
+        NewsArticle.category,
+        NewsArticle.published_at,
+        NewsArticle.created_at,
+        latest_prediction().label("prediction"),
+    ).where(NewsArticle.is_analyzed == True)
+
+    if category:
+        query = query.where(NewsArticle.category == category)
+
+    if cursor:
+        created_at, article_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(NewsArticle.created_at, NewsArticle.id) < (created_at, article_id)
+        )
+
+    return query.order_by(NewsArticle.created_at.desc(), NewsArticle.id.desc()).limit(
+        limit
+    )
+
+
+def feed_payload(rows, limit: int = None) -> dict:
+    """
+    `rows` may hold one extra row beyond `limit`; it only signals that
+    another page exists and is not returned.
+    """
+    page = rows if limit is None else rows[:limit]
+    has_more = limit is not None and len(rows) > limit
+
+    return {
+        "last_updated": page[0].created_at if page else None,
+        "next_cursor": (
+            encode_cursor(page[-1].created_at, page[-1].id) if has_more else None
+        ),
+        "data": [
+            {
+                "id": row.id,
+                "title": row.title,
+                "summary": row.summary,
+                "category": row.category,
+                "published_at": row.published_at,
+                "analysis": {"prediction": row.prediction},
+            }
+            for row in page
+        ],
+    }
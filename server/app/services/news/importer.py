@@ -1,47 +1,100 @@
 import os
 import shutil
-from fastapi import logger
-from app.services.news.article_service import insert_article
+import logging
+from itertools import islice
+from app.scrapers.cryptoslate_scraper.scraper import (
+    forget_listing_state,
+    iter_latest_news,
+    remember_seen_urls,
+)
+from app.services.news.article_service import insert_articles_batch
 from app.services.news.load_scraped_articles import load_all_scraped_articles
 from app.services.news.paths import FAILED_DIR
 from app.database.database import SessionLocal
 
+logger = logging.getLogger(__name__)
 
-def import_scraped_articles_core():
-    articles = load_all_scraped_articles()
+# Articles per dedup query / bulk insert
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "200"))
+
+STORED_STATUSES = ("inserted", "exists")
+
+
+def _finalize_article(art: dict, result: dict):
+    """Drop the spool file of a stored article; keep failed ones for inspection."""
+    filepath = art.get("filepath")
+
+    if result["status"] in STORED_STATUSES:
+        if filepath:
+            try:
+                os.remove(filepath)
+            except Exception as e:
+                logger.warning(f"Failed to delete {filepath}: {e}")
+        return
+
+    if filepath:
+        shutil.move(filepath, os.path.join(FAILED_DIR, art["filename"]))
+    else:
+        logger.warning(f"Streamed article failed ({result['status']}): {art['url']}")
+
+
+def _chunks(items, size: int):
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def import_articles(articles, batch_size: int = IMPORT_BATCH_SIZE) -> list[dict]:
+    """
+    Insert article records from any iterable (a loaded directory or a live
+    scraper generator) and report one status entry per record.
+    Each chunk of `batch_size` records costs one dedup query and one insert.
+    """
     response = []
+    stored_urls = []
 
     with SessionLocal() as db:
-        for art in articles:
-            result = insert_article(
-                db=db,
-                title=art["title"],
-                url=art["url"],
-                content=art["content"],
-                category=art["category"],
-                published_at=art["published_at"],
-            )
-
-            response.append(
-                {
-                    "file": art["filename"],
-                    "status": result["status"],
-                    "id": result.get("id"),
-                    "error": result.get("error"),
-                }
-            )
-
-            if result["status"] in ("inserted", "exists"):
-                try:
-                    os.remove(art["filepath"])
-                except Exception as e:
-                    logger.warning(f"Failed to delete {art['filepath']}: {e}")
-            else:
-                shutil.move(
-                    art["filepath"],
-                    os.path.join(FAILED_DIR, art["filename"]),
+        for chunk in _chunks(articles, max(1, batch_size)):
+            results = insert_articles_batch(db, chunk)
+
+            for art, result in zip(chunk, results):
+                if result["status"] in STORED_STATUSES:
+                    stored_urls.append(art["url"])
+                response.append(
+                    {
+                        "file": art["filename"] or art["url"],
+                        "status": result["status"],
+                        "id": result.get("id"),
+                        "error": result.get("error"),
+                    }
                 )
 
-        db.commit()
+                _finalize_article(art, result)
+
+    # Only stored URLs: failed ones must stay eligible for the next scrape
+    remember_seen_urls(stored_urls)
+    return response
+
+
+def _forget_listing_on_failure(response: list[dict]):
+    # The listing was accepted once every article was fetched; if one then
+    # failed to insert, a 304 next run must not keep it from being retried
+    if any(entry["status"] not in STORED_STATUSES for entry in response):
+        forget_listing_state()
+
+
+def import_scraped_articles_core():
+    response = import_articles(load_all_scraped_articles())
+    _forget_listing_on_failure(response)
+    return response
+
 
+def import_streamed_articles_core(spool: bool = True):
+    """
+    Scrape and import in one pass: each article is inserted as soon as it is
+    downloaded. `spool` keeps a file copy until the insert succeeds.
+    """
+    # One record per chunk so each article is stored as soon as it arrives
+    response = import_articles(iter_latest_news(spool=spool), batch_size=1)
+    _forget_listing_on_failure(response)
     return response
@@ -0,0 +1,215 @@
+import os
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import Integer, Text, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.database.database import SessionLocal, engine
+from app.database.partitioning import drop_expired_partitions, partitioning_enabled
+from app.services.news.feed_cache import bump_feed_version, invalidate_feed_cache
+from app.services.search.memory_index import invalidate_memory_index
+
+logger = logging.getLogger(__name__)
+
+# Default age (days, by created_at) after which articles are deleted
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "30"))
+# Per-category overrides, e.g. "Regulation=60,ETF=14" (category case is ignored)
+RETENTION_CATEGORY_DAYS = os.getenv("RETENTION_CATEGORY_DAYS", "")
+# Articles deleted per transaction (embeddings / analyses cascade with them)
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+# Pause between batches so autovacuum, WAL shipping and readers keep up
+RETENTION_PAUSE_SECONDS = float(os.getenv("RETENTION_PAUSE_SECONDS", "0.2"))
+
+
+def parse_category_days(raw: str) -> dict[str, int]:
+    """{lowercased category: days}; raises ValueError on a malformed entry."""
+    windows = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        category, sep, days = part.partition("=")
+        category = category.strip().lower()
+        try:
+            days = int(days)
+        except ValueError:
+            days = -1
+        if not sep or not category or days < 0:
+            raise ValueError(
+                f"RETENTION_CATEGORY_DAYS: expected 'Category=days', got {part!r}"
+            )
+        windows[category] = days
+    return windows
+
+
+# Parsed at import so a bad value stops the app / scheduler at startup
+# instead of failing the first cleanup run
+CATEGORY_DAYS = parse_category_days(RETENTION_CATEGORY_DAYS)
+
+
+def normalize_category_days(category_days: dict[str, int] = None) -> dict[str, int]:
+    if category_days is None:
+        return dict(CATEGORY_DAYS)
+    return {category.lower(): days for category, days in category_days.items()}
+
+
+def retention_horizon_days(
+    default_days: int = RETENTION_DAYS, category_days: dict[str, int] = None
+) -> int:
+    """Age after which every category has expired (whole partitions can go)."""
+    category_days = normalize_category_days(category_days)
+    return max([default_days, *category_days.values()])
+
+
+# One batch: the next `batch_size` expired ids above `after_id`, walked in
+# primary key order, deleted in the same statement. The category window is
+# joined in from two parallel arrays of lowercased categories.
+DELETE_BATCH_SQL = text(
+    """
+WITH expired AS (
+    SELECT na.id
+    FROM news_articles na
+    LEFT JOIN unnest(CAST(:categories AS text[]), CAST(:days AS int[]))
+        AS w(category, days) ON w.category = lower(na.category)
+    WHERE na.id > :after_id
+      AND na.created_at < :now - make_interval(days => COALESCE(w.days, :default_days))
+    ORDER BY na.id
+    LIMIT :batch_size
+)
+DELETE FROM news_articles
+WHERE id IN (SELECT id FROM expired)
+RETURNING id, category
+"""
+).bindparams(
+    bindparam("categories", type_=ARRAY(Text)),
+    bindparam("days", type_=ARRAY(Integer)),
+)
+
+
+# ---------------------------------------------------------
+# Progress of the current / last run (read by the status route)
+# ---------------------------------------------------------
+
+_progress_lock = threading.Lock()
+_progress = {"running": False}
+
+# One run per process at a time (scheduler job vs. HTTP trigger)
+_run_lock = threading.Lock()
+
+
+class RetentionAlreadyRunning(RuntimeError):
+    pass
+
+
+def retention_progress() -> dict:
+    with _progress_lock:
+        return dict(_progress)
+
+
+def _set_progress(**fields):
+    with _progress_lock:
+        _progress.update(fields)
+
+
+# ---------------------------------------------------------
+# Retention job
+# ---------------------------------------------------------
+
+
+def run_retention(
+    default_days: int = RETENTION_DAYS,
+    category_days: dict[str, int] = None,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause_seconds: float = RETENTION_PAUSE_SECONDS,
+    max_batches: int = None,
+) -> dict:
+    """
+    Delete expired articles in short transactions of at most `batch_size`
+    rows. Embeddings and analyses go with them through ON DELETE CASCADE.
+    With partitioning, partitions past every category's window are dropped
+    first and the batches only cover shorter category windows.
+    """
+    if not _run_lock.acquire(blocking=False):
+        raise RetentionAlreadyRunning("Retention cleanup is already running")
+
+    try:
+        return _run_retention(
+            default_days, category_days, batch_size, pause_seconds, max_batches
+        )
+    finally:
+        _run_lock.release()
+
+
+def _run_retention(
+    default_days: int,
+    category_days: dict[str, int],
+    batch_size: int,
+    pause_seconds: float,
+    max_batches: int,
+) -> dict:
+    category_days = normalize_category_days(category_days)
+
+    params = {
+        "categories": list(category_days),
+        "days": list(category_days.values()),
+        "default_days": default_days,
+        "batch_size": max(1, batch_size),
+        # Fixed for the whole run, so rows expiring mid-run wait for the next one
+        "now": datetime.utcnow(),
+    }
+
+    started = time.perf_counter()
+    deleted = batches = last_id = 0
+    by_category = Counter()
+    partitions = []
+    _set_progress(running=True, started_at=params["now"], deleted=0, batches=0)
+
+    try:
+        if partitioning_enabled():
+            partitions = drop_expired_partitions(
+                engine, retention_horizon_days(default_days, category_days)
+            )
+            _set_progress(partitions_dropped=len(partitions))
+
+        while max_batches is None or batches < max_batches:
+            with SessionLocal() as db:
+                rows = db.execute(
+                    DELETE_BATCH_SQL, {**params, "after_id": last_id}
+                ).all()
+                db.commit()
+                if rows:
+                    bump_feed_version(db)
+
+            if not rows:
+                break
+
+            deleted += len(rows)
+            batches += 1
+            last_id = max(row.id for row in rows)
+            by_category.update(row.category for row in rows)
+            _set_progress(deleted=deleted, batches=batches, last_id=last_id)
+            logger.info(f"🗑 Retention batch {batches}: {deleted} articles deleted")
+
+            if len(rows) < params["batch_size"]:
+                break
+            time.sleep(pause_seconds)
+    finally:
+        elapsed = round(time.perf_counter() - started, 3)
+        _set_progress(running=False, elapsed_seconds=elapsed)
+
+        if deleted or partitions:
+            invalidate_feed_cache()
+            invalidate_memory_index()
+
+    logger.info(
+        f"✅ Retention done: {deleted} articles in {batches} batches, "
+        f"{len(partitions)} partitions dropped ({elapsed}s)"
+    )
+    return {
+        "deleted": deleted,
+        "deleted_by_category": dict(by_category),
+        "batches": batches,
+        "partitions_dropped": len(partitions),
+        "elapsed_seconds": elapsed,
+    }
@@ -0,0 +1,157 @@
+"""
+Table sizes and pipeline backlog for /stats.
+
+Monitoring scrapes /stats often, so results are cached per count mode for
+STATS_CACHE_TTL seconds and concurrent misses wait for a single refresh.
+Row counts are either exact COUNT(*)s or the planner's pg_class.reltuples
+estimates (kept fresh by autovacuum / ANALYZE), summed over partitions.
+
+Backlog queries match the partial indexes on news_articles, which only hold
+pending rows, so their cost follows the backlog rather than the table.
+"""
+
+import os
+import time
+import asyncio
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Seconds a computed /stats payload is served before it is recomputed
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+# exact (COUNT(*)) | estimate (pg_class.reltuples)
+STATS_COUNT_MODE = os.getenv("STATS_COUNT_MODE", "exact").lower()
+
+COUNT_MODES = ("exact", "estimate")
+
+EXACT_COUNT_SQL = text(
+    """
+    SELECT
+        (SELECT COUNT(*) FROM news_articles) AS articles,
+        (SELECT COUNT(*) FROM embeddings) AS embeddings
+"""
+)
+
+# A partitioned parent has no reltuples of its own (-1); its partitions do.
+# -1 also means "never analyzed" on a plain table, hence GREATEST.
+ESTIMATE_COUNT_SQL = text(
+    """
+    SELECT
+        COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint
+    FROM pg_class c
+    WHERE c.oid = to_regclass(:table)
+       OR c.oid IN (
+           SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table)
+       )
+"""
+)
+
+# Predicates mirror the partial indexes on NewsArticle and the queue queries
+# in app/services/pipeline/queues.py.
+PENDING_SQL = text(
+    """
+    SELECT
+        s.pending AS summary_pending,
+        s.oldest AS summary_oldest,
+        e.pending AS embedding_pending,
+        e.oldest AS embedding_oldest,
+        a.pending AS analysis_pending,
+        a.oldest AS analysis_oldest
+    FROM
+        (
+            SELECT COUNT(*) AS pending, MIN(created_at) AS oldest
+            FROM news_articles
+            WHERE summary IS NULL
+        ) s,
+        (
+            SELECT COUNT(*) AS pending, MIN(na.created_at) AS oldest
+            FROM news_articles na
+            WHERE na.is_embedded = false
+        ) e,
+        (
+            SELECT COUNT(*) AS pending, MIN(created_at) AS oldest
+            FROM news_articles
+            WHERE is_analyzed = false AND summary IS NOT NULL
+        ) a
+"""
+)
+
+PENDING_STAGES = ("summary", "embedding", "analysis")
+
+
+def pending_payload(row, now: datetime) -> dict:
+    """Backlog per stage, plus the age of the oldest pending article overall."""
+    stages = {}
+    for stage in PENDING_STAGES:
+        oldest = row[f"{stage}_oldest"]
+        stages[stage] = {
+            "pending": row[f"{stage}_pending"],
+            "oldest_age_seconds": (
+                round((now - oldest).total_seconds()) if oldest else None
+            ),
+        }
+
+    ages = [s["oldest_age_seconds"] for s in stages.values()]
+    ages = [age for age in ages if age is not None]
+    return {
+        "pending": stages,
+        "oldest_pending_age_seconds": max(ages) if ages else None,
+    }
+
+
+async def compute_stats(db: AsyncSession, mode: str = STATS_COUNT_MODE) -> dict:
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {mode}")
+
+    if mode == "exact":
+        counts = (await db.execute(EXACT_COUNT_SQL)).mappings().one()
+    else:
+        counts = {
+            key: (await db.execute(ESTIMATE_COUNT_SQL, {"table": table})).scalar()
+            for key, table in (
+                ("articles", "news_articles"),
+                ("embeddings", "embeddings"),
+            )
+        }
+
+    pending = (await db.execute(PENDING_SQL)).mappings().one()
+    now = datetime.utcnow()
+
+    return {
+        "articles": counts["articles"],
+        "embeddings": counts["embeddings"],
+        "count_mode": mode,
+        **pending_payload(pending, now),
+        "generated_at": now,
+    }
+
+
+class StatsCache:
+    """Payloads per count mode, recomputed at most every `ttl` seconds."""
+
+    def __init__(self, ttl: float = STATS_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, dict]] = {}
+        self._lock = asyncio.Lock()
+
+    def _fresh(self, mode: str) -> dict | None:
+        entry = self._entries.get(mode)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    async def get(self, mode: str, compute) -> dict:
+        payload = self._fresh(mode)
+        if payload is not None:
+            return payload
+
+        async with self._lock:
+            # Another request may have refreshed it while this one waited
+            payload = self._fresh(mode)
+            if payload is None:
+                payload = await compute()
+                self._entries[mode] = (time.monotonic(), payload)
+            return payload
+
+
+stats_cache = StatsCache()
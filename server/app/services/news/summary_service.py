@@ -0,0 +1,86 @@
+import os
+import asyncio
+import logging
+from sqlalchemy import text
+from app.database.database import SessionLocal
+from app.services.pipeline.queues import pending_summaries
+from app.services.deepseek_client.summarizer import generate_summary_async
+
+logger = logging.getLogger(__name__)
+
+# Articles claimed from the queue per round
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "20"))
+# LLM summary calls in flight (the DeepSeek token bucket still applies)
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+
+
+# ---------------------------------------------------------
+# Queue: news_articles WHERE summary IS NULL
+# ---------------------------------------------------------
+
+
+def fetch_pending_summaries(after_id: int, limit: int) -> list[dict]:
+    with SessionLocal() as db:
+        rows = db.execute(pending_summaries(after_id, limit)).all()
+        return [row._asdict() for row in rows]
+
+
+def store_summaries(summaries: list[dict]):
+    if not summaries:
+        return
+
+    with SessionLocal() as db:
+        # Never overwrite a summary written by another worker meanwhile
+        db.execute(
+            text(
+                """
+            UPDATE news_articles
+            SET summary = :summary
+            WHERE id = :id AND summary IS NULL
+        """
+            ),
+            summaries,
+        )
+        db.commit()
+
+
+# ---------------------------------------------------------
+# Summarization stage
+# ---------------------------------------------------------
+
+
+async def _summarize(article: dict, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        content_summary = await generate_summary_async(
+            article["content"], article["published_at"]
+        )
+    return {"id": article["id"], "summary": f"{article['title']}. {content_summary}"}
+
+
+async def summarize_pending_articles(
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    concurrency: int = SUMMARY_CONCURRENCY,
+    limit: int = None,
+) -> dict:
+    """
+    Fill `summary` for every article inserted without one, `concurrency`
+    LLM calls at a time, writing each batch back as soon as it completes.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    last_id = 0
+    done = 0
+
+    while limit is None or done < limit:
+        size = batch_size if limit is None else min(batch_size, limit - done)
+        pending = await asyncio.to_thread(fetch_pending_summaries, last_id, size)
+        if not pending:
+            break
+
+        summaries = await asyncio.gather(*(_summarize(a, semaphore) for a in pending))
+        await asyncio.to_thread(store_summaries, summaries)
+
+        last_id = pending[-1]["id"]
+        done += len(pending)
+        logger.info(f"📝 Summarized {done} articles so far")
+
+    return {"summarized": done}
@@ -1,59 +1,131 @@
+import os
 import asyncio
 from app.database.database import SessionLocal
 import logging
-from app.models.news.news_article import NewsArticle
+from app.services.pipeline.jobs import enqueue_pending
 from app.services.pipeline.process_article import process_article
+from app.services.pipeline.queues import pending_analyses
+from app.services.rate_limiter import TokenBucket
 
 from app.scrapers.cryptoslate_scraper.scraper import scrape_latest_news
 from app.services.ai.backfill_embedding_core import backfill_embeddings_core
-from app.services.news.importer import import_scraped_articles_core
+from app.services.news.importer import (
+    import_scraped_articles_core,
+    import_streamed_articles_core,
+)
+from app.services.news.summary_service import summarize_pending_articles
 
 
 logger = logging.getLogger(__name__)
 
+# Articles analyzed at the same time (1 = strictly sequential)
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "4"))
+# Max articles started per minute (0 = no budget)
+ANALYSIS_REQUESTS_PER_MINUTE = float(os.getenv("ANALYSIS_REQUESTS_PER_MINUTE", "0"))
+ARTICLE_TIMEOUT_SECONDS = 300  # safety for HostHatch
+
+# Stream scraped articles straight into the importer instead of via files
+PIPELINE_STREAMING = os.getenv("PIPELINE_STREAMING", "true").lower() == "true"
+# Keep a file copy of streamed articles until they are stored (crash recovery)
+SCRAPER_SPOOL = os.getenv("SCRAPER_SPOOL", "true").lower() == "true"
+# Hand embedding and analysis to the pipeline_jobs workers (pipeline/worker.py)
+PIPELINE_JOB_QUEUE = os.getenv("PIPELINE_JOB_QUEUE", "false").lower() == "true"
+
+
+async def _process_article_guarded(
+    article_id: int, semaphore: asyncio.Semaphore, budget: TokenBucket
+) -> str | None:
+    """Analyze one article; returns the error, or None on success."""
+    async with semaphore:
+        await budget.acquire_async()
+        logger.info(f"🔍 Processing article ID={article_id}")
+        try:
+            await asyncio.wait_for(
+                process_article(article_id),
+                timeout=ARTICLE_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"⏰ Timeout processing article ID={article_id}")
+            return f"timeout after {ARTICLE_TIMEOUT_SECONDS}s"
+        except Exception as e:
+            logger.exception(f"❌ Failed processing article ID={article_id}")
+            return repr(e)
+        return None
+
+
+async def process_articles(
+    article_ids: list[int],
+    concurrency: int = ANALYSIS_CONCURRENCY,
+    requests_per_minute: float = ANALYSIS_REQUESTS_PER_MINUTE,
+):
+    """
+    Analyze articles with at most `concurrency` in flight.
+    Each article keeps its own timeout and error isolation; returns the
+    error per article (None on success), in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    budget = TokenBucket(requests_per_minute)
+
+    return await asyncio.gather(
+        *(
+            _process_article_guarded(article_id, semaphore, budget)
+            for article_id in article_ids
+        )
+    )
+
 
 async def process_daily_news():
     logger.info("🚀 Daily News Pipeline Started")
 
-    try:
-        logger.info("🕸 Starting scraper...")
-        scrape_latest_news()  # sync, fast enough to stay here
-    except Exception as e:
-        logger.error(f"❌ Scraper failed: {e}")
+    if PIPELINE_STREAMING:
+        # STEP 0+1 — Scrape and import in one pass (OFF event loop)
+        try:
+            logger.info("🕸 Streaming scraper into importer...")
+            await asyncio.to_thread(import_streamed_articles_core, SCRAPER_SPOOL)
+        except Exception as e:
+            logger.error(f"❌ Streaming import failed: {e}")
+    else:
+        try:
+            logger.info("🕸 Starting scraper...")
+            scrape_latest_news()  # sync, fast enough to stay here
+        except Exception as e:
+            logger.error(f"❌ Scraper failed: {e}")
 
-    # STEP 1 — Import scraped articles (OFF event loop)
+    # STEP 1 — Import spooled files (directory mode, or leftovers of a crashed run)
     logger.info("📥 Importing scraped articles...")
     await asyncio.to_thread(import_scraped_articles_core)
 
-    # STEP 2 — Generate embeddings (OFF event loop)
-    logger.info("🧠 Generating embeddings...")
-    await asyncio.to_thread(backfill_embeddings_core)
+    if PIPELINE_JOB_QUEUE:
+        # STEP 2 — Summaries here; embedding and analysis go to the job queue
+        logger.info("🧠 Generating summaries...")
+        await summarize_pending_articles()
+
+        def enqueue_jobs():
+            with SessionLocal() as db:
+                return enqueue_pending(db)
+
+        queued = await asyncio.to_thread(enqueue_jobs)
+        logger.info(f"📬 Queued pipeline jobs for the workers: {queued}")
+        logger.info("✅ Daily News Pipeline Completed Successfully")
+        return
+
+    # STEP 2 — Summaries (async LLM calls) and embeddings (OFF event loop) together
+    logger.info("🧠 Generating summaries and embeddings...")
+    await asyncio.gather(
+        summarize_pending_articles(),
+        asyncio.to_thread(backfill_embeddings_core),
+    )
 
     # STEP 3 — Fetch articles to analyze (OFF event loop)
     def fetch_new_article_ids():
         with SessionLocal() as db:
-            return [
-                a.id
-                for a in db.query(NewsArticle.id)
-                .filter(NewsArticle.is_analyzed == False)
-                .all()
-            ]
+            return db.execute(pending_analyses()).scalars().all()
 
     new_article_ids = await asyncio.to_thread(fetch_new_article_ids)
 
     logger.info(f"📝 Found {len(new_article_ids)} new articles to analyze.")
 
-    # STEP 4 — Process articles (STRICTLY SEQUENTIAL)
-    for article_id in new_article_ids:
-        logger.info(f"🔍 Processing article ID={article_id}")
-        try:
-            await asyncio.wait_for(
-                process_article(article_id),
-                timeout=300,  # safety for HostHatch
-            )
-        except asyncio.TimeoutError:
-            logger.error(f"⏰ Timeout processing article ID={article_id}")
-        except Exception:
-            logger.exception(f"❌ Failed processing article ID={article_id}")
+    # STEP 4 — Process articles (bounded concurrency)
+    await process_articles(new_article_ids)
 
     logger.info("✅ Daily News Pipeline Completed Successfully")
@@ -0,0 +1,303 @@
+"""
+Durable Postgres job queue for the embedding and analysis stages.
+
+Each pending article gets one `pipeline_jobs` row per stage. Workers
+(app/services/pipeline/worker.py, any number of processes or hosts) claim
+batches with `FOR UPDATE SKIP LOCKED`, so concurrent claims never return the
+same job and never wait on each other. A claim is a lease: the job's
+available_at moves JOB_VISIBILITY_TIMEOUT seconds ahead and the claim
+transaction commits right away, so no lock is held while the work runs.
+
+- done: the job row is deleted
+- failed: requeued with exponential backoff, or dead-lettered
+  (status 'dead') after JOB_MAX_ATTEMPTS attempts
+- worker gone (crash, kill, lost node): the lease runs out and the job is
+  claimed again, which counts as an attempt
+
+The attempt number doubles as the lease token: a worker whose lease ran out
+and was reclaimed can no longer complete or fail the job.
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass
+from sqlalchemy import bindparam, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal
+from app.models.news.news_article import NewsArticle
+from app.models.pipeline.pipeline_job import PipelineJob
+from app.services.pipeline.queues import pending_analyses, pending_embeddings
+
+logger = logging.getLogger(__name__)
+
+JOB_STAGES = ("embedding", "analysis")
+
+# Seconds a claimed job stays invisible to other workers
+JOB_VISIBILITY_TIMEOUT = float(os.getenv("JOB_VISIBILITY_TIMEOUT", "900"))
+# Attempts (claims) before a job is dead-lettered
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+# Delay before the first retry, doubled per attempt, capped at one hour
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "30"))
+JOB_RETRY_BACKOFF_MAX = 3600
+# Idle workers poll this often (seconds)
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "5"))
+
+
+@dataclass
+class Job:
+    id: int
+    article_id: int
+    attempts: int
+
+
+# ---------------------------------------------------------
+# SQL
+# ---------------------------------------------------------
+
+# Leases that ran out on their last attempt: the worker died every time
+REAP_SQL = text(
+    """
+WITH expired AS (
+    SELECT id FROM pipeline_jobs
+    WHERE stage = :stage
+      AND status = 'running'
+      AND attempts >= :max_attempts
+      AND available_at <= timezone('utc', now())
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE pipeline_jobs j
+SET status = 'dead',
+    last_error = COALESCE(j.last_error || '; ', '') || 'lease expired',
+    updated_at = timezone('utc', now())
+FROM expired
+WHERE j.id = expired.id
+"""
+)
+
+# Walks ix_pipeline_jobs_claim; rows locked by another claim are skipped
+CLAIM_SQL = text(
+    """
+WITH claimable AS (
+    SELECT id FROM pipeline_jobs
+    WHERE stage = :stage
+      AND status <> 'dead'
+      AND available_at <= timezone('utc', now())
+      AND attempts < :max_attempts
+    ORDER BY available_at, id
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE pipeline_jobs j
+SET status = 'running',
+    attempts = j.attempts + 1,
+    available_at = timezone('utc', now()) + make_interval(secs => :visibility),
+    updated_at = timezone('utc', now())
+FROM claimable
+WHERE j.id = claimable.id
+RETURNING j.id, j.article_id, j.attempts
+"""
+)
+
+COMPLETE_SQL = text(
+    """
+DELETE FROM pipeline_jobs
+WHERE id = :id AND attempts = :attempts AND status = 'running'
+"""
+)
+
+FAIL_SQL = text(
+    """
+UPDATE pipeline_jobs
+SET status = CASE WHEN attempts >= :max_attempts THEN 'dead' ELSE 'queued' END,
+    available_at = timezone('utc', now()) + make_interval(
+        secs => LEAST(:backoff * power(2, attempts - 1), :backoff_max)
+    ),
+    last_error = :error,
+    updated_at = timezone('utc', now())
+WHERE id = :id AND attempts = :attempts AND status = 'running'
+RETURNING status
+"""
+)
+
+RETRY_DEAD_SQL = text(
+    """
+UPDATE pipeline_jobs
+SET status = 'queued',
+    attempts = 0,
+    available_at = timezone('utc', now()),
+    updated_at = timezone('utc', now())
+WHERE status = 'dead' AND (CAST(:stage AS text) IS NULL OR stage = :stage)
+"""
+).bindparams(bindparam("stage", required=False))
+
+
+# ---------------------------------------------------------
+# Queue operations (the caller commits)
+# ---------------------------------------------------------
+
+
+def enqueue(db: Session, stage: str, articles) -> int:
+    """
+    Queue `stage` for the articles selected by `articles` (a select whose
+    first column is the article id). Articles that already have a job for
+    the stage, live or dead, are skipped.
+    """
+    ids = articles.subquery()
+    statement = (
+        pg_insert(PipelineJob)
+        .from_select(
+            ["stage", "article_id"],
+            select(literal(stage), list(ids.c)[0]),
+        )
+        .on_conflict_do_nothing(index_elements=["stage", "article_id"])
+    )
+    return db.execute(statement).rowcount
+
+
+def enqueue_pending(db: Session) -> dict:
+    """Jobs for every article whose embedding or analysis is outstanding."""
+    embedding = enqueue(db, "embedding", pending_embeddings(0, None))
+    # Analysis reads the stored vector: the embedding worker queues the rest
+    analysis = enqueue(
+        db, "analysis", pending_analyses().where(NewsArticle.is_embedded == True)
+    )
+    db.commit()
+    return {"embedding": embedding, "analysis": analysis}
+
+
+def claim(
+    db: Session,
+    stage: str,
+    limit: int,
+    visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> list[Job]:
+    db.execute(REAP_SQL, {"stage": stage, "max_attempts": max_attempts})
+    rows = db.execute(
+        CLAIM_SQL,
+        {
+            "stage": stage,
+            "limit": limit,
+            "visibility": visibility_timeout,
+            "max_attempts": max_attempts,
+        },
+    ).all()
+    return sorted((Job(*row) for row in rows), key=lambda job: job.id)
+
+
+def complete(db: Session, job: Job) -> bool:
+    """False when the lease was lost (the job was claimed again meanwhile)."""
+    return (
+        db.execute(COMPLETE_SQL, {"id": job.id, "attempts": job.attempts}).rowcount == 1
+    )
+
+
+def fail(
+    db: Session,
+    job: Job,
+    error: str,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+    backoff: float = JOB_RETRY_BACKOFF,
+) -> str | None:
+    """Requeue or dead-letter the job; returns its new status (None: lease lost)."""
+    return db.execute(
+        FAIL_SQL,
+        {
+            "id": job.id,
+            "attempts": job.attempts,
+            "error": error,
+            "max_attempts": max_attempts,
+            "backoff": backoff,
+            "backoff_max": JOB_RETRY_BACKOFF_MAX,
+        },
+    ).scalar()
+
+
+def retry_dead(db: Session, stage: str = None) -> int:
+    return db.execute(RETRY_DEAD_SQL, {"stage": stage}).rowcount
+
+
+def job_counts(db: Session) -> dict:
+    rows = db.execute(
+        select(PipelineJob.stage, PipelineJob.status, func.count()).group_by(
+            PipelineJob.stage, PipelineJob.status
+        )
+    ).all()
+    counts = {stage: {"queued": 0, "running": 0, "dead": 0} for stage in JOB_STAGES}
+    for stage, status, count in rows:
+        counts.setdefault(stage, {})[status] = count
+    return counts
+
+
+# ---------------------------------------------------------
+# Worker loop
+# ---------------------------------------------------------
+
+
+def work_batch(
+    stage: str,
+    handler,
+    batch_size: int,
+    visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+    backoff: float = JOB_RETRY_BACKOFF,
+) -> int:
+    """
+    Claim up to `batch_size` jobs and run `handler(jobs)` on them.
+
+    The handler returns {job id: error} for the jobs that failed; the rest
+    are completed. If it raises, the whole batch fails.
+    Returns the number of jobs claimed (0: the queue is empty for now).
+    """
+    with SessionLocal() as db:
+        jobs = claim(db, stage, batch_size, visibility_timeout, max_attempts)
+        db.commit()
+    if not jobs:
+        return 0
+
+    try:
+        errors = handler(jobs)
+    except Exception as e:
+        logger.exception(f"❌ {stage} batch of {len(jobs)} jobs failed")
+        errors = {job.id: repr(e) for job in jobs}
+
+    with SessionLocal() as db:
+        for job in jobs:
+            if job.id in errors:
+                status = fail(db, job, errors[job.id], max_attempts, backoff)
+                if status == "dead":
+                    logger.error(
+                        f"💀 {stage} job {job.id} (article {job.article_id}) "
+                        f"dead-lettered: {errors[job.id]}"
+                    )
+            else:
+                status = "done" if complete(db, job) else None
+            if status is None:
+                logger.warning(
+                    f"⚠️ {stage} job {job.id} lease expired before it finished"
+                )
+        db.commit()
+
+    logger.info(f"✅ {stage}: {len(jobs) - len(errors)} done, {len(errors)} failed")
+    return len(jobs)
+
+
+def run_worker(
+    stage: str,
+    handler,
+    batch_size: int,
+    once: bool = False,
+    poll_seconds: float = JOB_POLL_SECONDS,
+    should_stop=lambda: False,
+):
+    """Work batches until stopped; sleep `poll_seconds` while the queue is empty."""
+    logger.info(f"👷 {stage} worker started (batch_size={batch_size})")
+    while not should_stop():
+        if work_batch(stage, handler, batch_size):
+            continue
+        if once:
+            break
+        time.sleep(poll_seconds)
+    logger.info(f"🛑 {stage} worker stopped")
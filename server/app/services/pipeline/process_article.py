@@ -2,10 +2,17 @@ import asyncio
 from asyncio.log import logger
 from app.models.news.news_article import NewsArticle
 from app.models.news.ai_analysis import AiAnalysis
-from app.services.search.search_service import search_similar_articles
+from app.services.search.search_service import search_similar_articles_by_id
 import datetime
-from app.services.deepseek_client.deepseek_client import analyze_article_with_deepseek
+from app.services.deepseek_client.deepseek_client import (
+    analyze_article_with_deepseek_async,
+)
 from app.database.database import SessionLocal
+from app.services.news.feed_cache import bump_feed_version, invalidate_feed_cache
+
+
+class AnalysisFailed(RuntimeError):
+    """DeepSeek returned an error result; nothing is stored for the article."""
 
 
 async def process_article(article_id: int):
@@ -29,23 +36,26 @@ async def process_article(article_id: int):
     if not article_data:
         return
 
-    # STEP 1 — semantic search (OFF event loop)
+    # STEP 1 — semantic search (OFF event loop, reuses the stored embedding)
     references = await asyncio.to_thread(
-        search_similar_articles,
-        article_data["content"],
-        article_data["category"],
+        search_similar_articles_by_id,
         article_data["id"],
+        article_data["category"],
+        article_data["content"],
     )
 
-    # STEP 2 — DeepSeek analysis (OFF event loop)
-    output = await asyncio.to_thread(
-        analyze_article_with_deepseek,
+    # STEP 2 — DeepSeek analysis (native async, pooled client)
+    output = await analyze_article_with_deepseek_async(
         {
             "title": article_data["title"],
             "summary": article_data["summary"],
         },
         references,
     )
+    # Raise rather than store the error text as the prediction: the article
+    # stays unanalyzed, so the next run (or the job queue's retry) redoes it
+    if isinstance(output, dict) and output.get("status") == "ERROR":
+        raise AnalysisFailed(output.get("prediction") or "DeepSeek analysis failed")
 
     # STEP 3 — persist analysis (OFF event loop)
     def persist():
@@ -57,16 +67,20 @@ async def process_article(article_id: int):
                 else str(output)
             )
 
+            article = db.query(NewsArticle).get(article_data["id"])
+
             analysis = AiAnalysis(
                 article_id=article_data["id"],
                 prediction=prediction_text,
                 created_at=datetime.datetime.utcnow(),
+                article_created_at=article.created_at,
             )
             db.add(analysis)
 
-            article = db.query(NewsArticle).get(article_data["id"])
             article.is_analyzed = True
 
             db.commit()
+            bump_feed_version(db)
 
     await asyncio.to_thread(persist)
+    invalidate_feed_cache()
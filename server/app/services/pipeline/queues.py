@@ -0,0 +1,66 @@
+"""
+Work-queue queries of the daily pipeline, each written to match its index.
+
+Every queue is walked in id order from a keyset cursor (`id > after_id`), so
+a run reads each index once instead of rescanning from the start per chunk.
+All three indexes are partial on news_articles, (id) INCLUDE (created_at),
+and only hold pending rows, so a queue scan costs the size of its backlog,
+not of the table:
+
+- summaries: ix_news_articles_pending_summary, WHERE summary IS NULL
+- embeddings: ix_news_articles_pending_embedding, WHERE is_embedded = false.
+  The flag is the only predicate: an embedding written outside the
+  pipeline is flagged by the migration backfill step, or by the worker
+  that picks the row up (without encoding it again)
+- analyses: ix_news_articles_pending_analysis,
+  WHERE is_analyzed = false AND summary IS NOT NULL
+
+See benchmarks/bench_queue_scans.py.
+"""
+
+from sqlalchemy import select
+from app.models.news.news_article import NewsArticle
+
+
+def pending_summaries(after_id: int, limit: int):
+    return (
+        select(
+            NewsArticle.id,
+            NewsArticle.title,
+            NewsArticle.content,
+            NewsArticle.published_at,
+        )
+        .where(NewsArticle.summary.is_(None), NewsArticle.id > after_id)
+        .order_by(NewsArticle.id)
+        .limit(limit)
+    )
+
+
+def pending_embeddings(after_id: int, limit: int):
+    return (
+        select(
+            NewsArticle.id,
+            NewsArticle.title,
+            NewsArticle.content,
+            NewsArticle.published_at,
+            NewsArticle.category,
+            NewsArticle.created_at,
+        )
+        .where(NewsArticle.is_embedded == False, NewsArticle.id > after_id)
+        .order_by(NewsArticle.id)
+        .limit(limit)
+    )
+
+
+def pending_analyses(after_id: int = 0, limit: int = None):
+    # Analysis needs the summary, so unsummarized articles wait their turn
+    query = (
+        select(NewsArticle.id)
+        .where(
+            NewsArticle.is_analyzed == False,
+            NewsArticle.summary.isnot(None),
+            NewsArticle.id > after_id,
+        )
+        .order_by(NewsArticle.id)
+    )
+    return query.limit(limit) if limit else query
@@ -0,0 +1,118 @@
+"""
+Job queue workers for the embedding and analysis stages (see jobs.py).
+
+Run as many as the box (or boxes) can take; they share the queue through
+Postgres. From server/:
+
+    python -m app.services.pipeline.worker embedding
+    python -m app.services.pipeline.worker analysis --batch 8
+    python -m app.services.pipeline.worker enqueue      # queue pending articles
+    python -m app.services.pipeline.worker status
+    python -m app.services.pipeline.worker retry-dead [--stage analysis]
+
+SIGTERM / SIGINT stop a worker after its current batch.
+"""
+
+import asyncio
+import logging
+import signal
+from app.database.database import SessionLocal
+from app.models.news.news_article import NewsArticle
+from app.services.ai.embedding_pipeline import EMBED_CHUNK_SIZE, embed_articles_by_id
+from app.services.pipeline.daily_pipeline import ANALYSIS_CONCURRENCY, process_articles
+from app.services.pipeline.jobs import (
+    enqueue,
+    enqueue_pending,
+    job_counts,
+    retry_dead,
+    run_worker,
+)
+from app.services.pipeline.queues import pending_analyses
+
+logger = logging.getLogger(__name__)
+
+
+def embed_jobs(jobs) -> dict:
+    article_ids = [job.article_id for job in jobs]
+    with SessionLocal() as db:
+        embedded = embed_articles_by_id(db, article_ids)
+        # Summarized ones can be analyzed now that their vector is stored
+        queued = enqueue(
+            db,
+            "analysis",
+            pending_analyses().where(NewsArticle.id.in_(article_ids)),
+        )
+        db.commit()
+    logger.info(f"🧠 Embedded {embedded} articles, queued {queued} analyses")
+    return {}
+
+
+# One event loop for the worker's lifetime: the DeepSeek client pool is per loop
+_analysis_runner = asyncio.Runner()
+
+
+def analyze_jobs(jobs) -> dict:
+    with SessionLocal() as db:
+        # A reclaimed job may have been finished by the worker that lost it
+        pending = set(
+            db.execute(
+                pending_analyses().where(
+                    NewsArticle.id.in_([job.article_id for job in jobs])
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    todo = [job for job in jobs if job.article_id in pending]
+    errors = _analysis_runner.run(process_articles([job.article_id for job in todo]))
+    return {job.id: error for job, error in zip(todo, errors) if error}
+
+
+STAGE_HANDLERS = {
+    "embedding": (embed_jobs, EMBED_CHUNK_SIZE),
+    # One batch in flight at a time, so the batch is the concurrency
+    "analysis": (analyze_jobs, ANALYSIS_CONCURRENCY),
+}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "command", choices=[*STAGE_HANDLERS, "enqueue", "status", "retry-dead"]
+    )
+    ap.add_argument("--batch", type=int, help="jobs claimed at a time")
+    ap.add_argument("--once", action="store_true", help="exit once the queue is empty")
+    ap.add_argument("--stage", choices=list(STAGE_HANDLERS))
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command in STAGE_HANDLERS:
+        handler, batch_size = STAGE_HANDLERS[args.command]
+        stopping = []
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        try:
+            run_worker(
+                args.command,
+                handler,
+                args.batch or batch_size,
+                once=args.once,
+                should_stop=lambda: bool(stopping),
+            )
+        finally:
+            # Cancels the loop's pending tasks, which closes the DeepSeek pool
+            _analysis_runner.close()
+    else:
+        with SessionLocal() as db:
+            if args.command == "enqueue":
+                logger.info(f"📬 Queued: {enqueue_pending(db)}")
+            elif args.command == "retry-dead":
+                requeued = retry_dead(db, args.stage)
+                db.commit()
+                logger.info(f"🔁 Requeued {requeued} dead jobs")
+            logger.info(f"📊 Jobs: {job_counts(db)}")
@@ -0,0 +1,48 @@
+import time
+import asyncio
+import threading
+
+
+class TokenBucket:
+    """
+    Token-bucket request budget.
+
+    `rate_per_minute` tokens refill continuously up to `burst`. State is
+    guarded by a thread lock and waiting is done by the caller, so one bucket
+    can be shared by threads and by any number of event loops.
+    A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst if burst else max(1, int(rate_per_minute)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,313 @@
+"""
+In-process similarity search over recent article vectors.
+
+With VECTOR_SEARCH_BACKEND=memory, every embedding published in the last
+MEMORY_INDEX_DAYS lives in one contiguous float32 matrix, with parallel
+arrays for article id, published_at and category. A query is one
+matrix-vector product, a mask and an argpartition; only the top rows are
+then read from Postgres, by primary key.
+
+The matrix follows the embeddings table by id: `sync()` appends rows with
+an id above the last one seen, drops rows that fell out of the window, and
+runs at most every MEMORY_INDEX_SYNC_SECONDS from search. Ids are not
+committed in order (several workers insert at once), so each sync also
+re-reads the last MEMORY_INDEX_SYNC_OVERLAP ids, skipping the ones it
+already holds. Deletes are not
+visible that way, so retention jobs call `invalidate_memory_index()` and
+the next search reloads everything. Meant for single-node deployments;
+each process holds its own copy.
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import Integer, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from pgvector.sqlalchemy import Vector
+from app.services.search.vector_query import recency_cutoff
+
+logger = logging.getLogger(__name__)
+
+# pgvector (SQL ORDER BY <=>) | memory (this module)
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "pgvector").lower()
+# Widest recency window any category searches (see CATEGORY_RECENCY_DAYS)
+MEMORY_INDEX_DAYS = int(os.getenv("MEMORY_INDEX_DAYS", "45"))
+# Max staleness versus embeddings written by other processes
+MEMORY_INDEX_SYNC_SECONDS = float(os.getenv("MEMORY_INDEX_SYNC_SECONDS", "60"))
+
+# Ids below the newest one seen that are read again, for rows whose
+# transaction committed after a higher id's
+MEMORY_INDEX_SYNC_OVERLAP = int(os.getenv("MEMORY_INDEX_SYNC_OVERLAP", "5000"))
+
+EMBED_DIM = 768  # mpnet embedding size
+
+SYNC_SQL = (
+    text(
+        """
+SELECT id, article_id, embedding, published_at, category
+FROM embeddings
+WHERE id > :after_id
+  AND id <> ALL(:known_ids)
+  AND published_at >= :cutoff
+ORDER BY id
+"""
+    )
+    .bindparams(bindparam("known_ids", type_=ARRAY(Integer)))
+    .columns(embedding=Vector(EMBED_DIM))
+)
+
+ARTICLES_SQL = text(
+    """
+SELECT
+    na.id,
+    na.title,
+    na.url,
+    na.summary,
+    na.hash,
+    CASE WHEN na.summary IS NULL THEN na.content END AS content,
+    na.category,
+    na.published_at
+FROM news_articles na
+WHERE na.id = ANY(:ids)
+"""
+).bindparams(bindparam("ids", type_=ARRAY(Integer)))
+
+
+# Parallel per-row buffers of MemoryVectorIndex
+ARRAYS = ("matrix", "article_ids", "embedding_ids", "published", "categories")
+
+
+def _epoch(ts: datetime) -> float:
+    # published_at is naive UTC
+    return (ts - datetime(1970, 1, 1)).total_seconds()
+
+
+class MemoryVectorIndex:
+    def __init__(
+        self,
+        dim: int = EMBED_DIM,
+        window_days: int = MEMORY_INDEX_DAYS,
+        sync_overlap: int = MEMORY_INDEX_SYNC_OVERLAP,
+    ):
+        self.dim = dim
+        self.window_days = window_days
+        self.sync_overlap = sync_overlap
+        self._lock = threading.Lock()  # guards the arrays
+        self._sync_lock = threading.Lock()  # one sync query at a time
+        self._generation = 0  # bumped by invalidate()
+        self._reset()
+
+    def _reset(self, capacity: int = 1024):
+        self.size = 0
+        self.last_embedding_id = 0
+        self.synced_at = 0.0
+        self.loaded = False
+        self.matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        self.article_ids = np.zeros(capacity, dtype=np.int64)
+        self.embedding_ids = np.zeros(capacity, dtype=np.int64)
+        self.published = np.zeros(capacity, dtype=np.float64)  # epoch seconds
+        self.categories = np.empty(capacity, dtype=object)
+
+    # -----------------------------------------------------
+    # Mutation (callers hold self._lock)
+    # -----------------------------------------------------
+
+    def _grow(self, needed: int):
+        capacity = len(self.article_ids)
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+
+        # New buffers: in-flight searches keep reading their old snapshot
+        for name in ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def _append(self, rows):
+        if not rows:
+            return
+
+        start, end = self.size, self.size + len(rows)
+        self._grow(end)
+
+        vectors = np.asarray([r.embedding for r in rows], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.matrix[start:end] = vectors / np.maximum(norms, 1e-12)
+        self.article_ids[start:end] = [r.article_id for r in rows]
+        self.embedding_ids[start:end] = [r.id for r in rows]
+        self.published[start:end] = [_epoch(r.published_at) for r in rows]
+        self.categories[start:end] = [r.category for r in rows]
+
+        self.size = end
+        self.last_embedding_id = max(self.last_embedding_id, rows[-1].id)
+
+    def _trim(self, cutoff: datetime):
+        keep = self.published[: self.size] >= _epoch(cutoff)
+        if keep.all():
+            return
+
+        # Compact into fresh buffers (see _grow)
+        kept = int(keep.sum())
+        for name in ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros_like(old)
+            new[:kept] = old[: self.size][keep]
+            setattr(self, name, new)
+        self.size = kept
+
+    # -----------------------------------------------------
+    # Sync with the embeddings table
+    # -----------------------------------------------------
+
+    def cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(days=self.window_days)
+
+    def sync(self, db: Session) -> int:
+        """Append embeddings added since the last sync; drop expired rows."""
+        with self._sync_lock:
+            generation = self._generation
+            cutoff = self.cutoff()
+
+            # Late commits below the newest id are caught by the overlap
+            after_id = max(0, self.last_embedding_id - self.sync_overlap)
+            with self._lock:
+                ids = self.embedding_ids[: self.size]
+                known_ids = ids[ids > after_id].tolist()
+
+            # Searches keep running while the rows are fetched
+            rows = db.execute(
+                SYNC_SQL,
+                {"after_id": after_id, "known_ids": known_ids, "cutoff": cutoff},
+            ).all()
+
+            with self._lock:
+                if generation != self._generation:
+                    return 0  # invalidated meanwhile; the next refresh reloads
+
+                self._append(rows)
+                self._trim(cutoff)
+                self.synced_at = time.monotonic()
+
+                if not self.loaded:
+                    self.loaded = True
+                    logger.info(f"🧮 Memory vector index loaded: {self.size} vectors")
+
+            return len(rows)
+
+    def refresh(self, db: Session, max_age: float = MEMORY_INDEX_SYNC_SECONDS):
+        if not self.loaded or time.monotonic() - self.synced_at >= max_age:
+            self.sync(db)
+
+    def invalidate(self):
+        """Forget everything; the next refresh reloads the whole window."""
+        with self._lock:
+            self._generation += 1
+            self._reset(capacity=max(1024, len(self.article_ids)))
+
+    # -----------------------------------------------------
+    # Search
+    # -----------------------------------------------------
+
+    def search(
+        self,
+        query_vector,
+        cutoff: datetime,
+        current_id: int,
+        limit: int,
+        category: str = None,
+    ) -> list[tuple[int, float]]:
+        """Top `limit` (article_id, cosine similarity) pairs, best first."""
+        with self._lock:
+            size = self.size
+            matrix = self.matrix[:size]
+            article_ids = self.article_ids[:size]
+            published = self.published[:size]
+            categories = self.categories[:size]
+
+        if size == 0 or limit <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        scores = matrix @ query
+        mask = (published >= _epoch(cutoff)) & (article_ids != current_id)
+        if category:
+            mask &= categories == category
+        scores[~mask] = -np.inf
+
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return []
+
+        k = min(limit, candidates)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [(int(article_ids[i]), float(scores[i])) for i in top]
+
+
+# ---------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------
+
+_index = None
+
+
+def get_memory_index() -> MemoryVectorIndex:
+    global _index
+    if _index is None:
+        _index = MemoryVectorIndex()
+    return _index
+
+
+def memory_index_enabled() -> bool:
+    return VECTOR_SEARCH_BACKEND == "memory"
+
+
+def sync_memory_index(db: Session):
+    """Pick up freshly written embeddings right away (no-op when disabled)."""
+    if memory_index_enabled() and _index is not None and _index.loaded:
+        _index.sync(db)
+
+
+def invalidate_memory_index():
+    if _index is not None:
+        _index.invalidate()
+
+
+def run_memory_query(
+    db: Session, query_vector, max_days: int, limit: int, current_id: int
+):
+    """
+    Same rows as vector_query.run_vector_query, ranked in process.
+    Postgres is only asked for the winning articles, by primary key.
+    """
+    index = get_memory_index()
+    index.refresh(db)
+
+    hits = index.search(query_vector, recency_cutoff(max_days), current_id, limit)
+    if not hits:
+        return []
+
+    articles = {
+        row["id"]: row
+        for row in db.execute(ARTICLES_SQL, {"ids": [a for a, _ in hits]})
+        .mappings()
+        .all()
+    }
+
+    return [
+        {**articles[article_id], "similarity_score": score}
+        for article_id, score in hits
+        if article_id in articles
+    ]
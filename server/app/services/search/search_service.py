@@ -1,11 +1,17 @@
-from typing import List
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
 from app.services.ai.embeddings import get_embedding
 from app.services.deepseek_client.summarizer import generate_summary
-from sqlalchemy import text, bindparam, Integer
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from pgvector.sqlalchemy import Vector
 
 from app.database.database import SessionLocal
+from app.models.news.embedding import Embedding
+from app.services.search.memory_index import memory_index_enabled, run_memory_query
+from app.services.search.vector_query import run_search_query, run_vector_query
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------
 # CONFIGURATION
@@ -15,7 +21,6 @@ PRIMARY_THRESHOLD = 0.70  # strong similarity cutoff
 FALLBACK_THRESHOLD = 0.60  # softer similarity if primary fails
 MAX_FETCH = 20  # initial pool from pgvector
 MAX_CONTEXT_RESULTS = 5  # final RAG references count
-EMBED_DIM = 768  # mpnet embedding size
 
 # Dynamic recency windows based on category
 CATEGORY_RECENCY_DAYS = {
@@ -31,55 +36,59 @@ DEFAULT_RECENCY = 21  # fallback if unknown category
 
 
 # ---------------------------------------------------------
-# SQL TEMPLATE (dynamic recency + exclude current article)
+# Helper: Similarity backend (pgvector SQL or in-process matrix)
 # ---------------------------------------------------------
 
-BASE_SQL = """
-SELECT
-    na.id,
-    na.title,
-    na.url,
-    na.content,
-    na.category,
-    na.published_at,
-    1 - (e.embedding <=> :query_embedding) AS similarity_score
-FROM embeddings e
-JOIN news_articles na ON na.id = e.article_id
-WHERE na.published_at >= NOW() - (INTERVAL '1 day' * :max_days)
-  AND na.id != :current_id
-ORDER BY e.embedding <=> :query_embedding
-LIMIT :limit
-"""
+
+def _similar_rows(
+    db: Session, query_vector, max_days: int, limit: int, current_id: int
+):
+    if memory_index_enabled():
+        return run_memory_query(db, query_vector, max_days, limit, current_id)
+    return run_vector_query(db, query_vector, max_days, limit, current_id)
 
 
 # ---------------------------------------------------------
-# Helper: Execute pgvector query
+# Helper: Summary cache keyed by news_articles.hash
 # ---------------------------------------------------------
 
 
-def _run_vector_query(
-    db: Session, query_vector, max_days: int, limit: int, current_id: int
-):
-    sql = BASE_SQL.replace(":max_days", str(max_days))
+def _store_summary(article_hash: str, summary: str):
+    """Persist a generated summary so no later search re-summarizes the row."""
+    try:
+        with SessionLocal() as db:
+            db.execute(
+                text(
+                    """
+                UPDATE news_articles
+                SET summary = :summary
+                WHERE hash = :hash AND summary IS NULL
+            """
+                ),
+                {"summary": summary, "hash": article_hash},
+            )
+            db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to cache summary for hash={article_hash}: {e}")
+
+
+def _reference_summary(row) -> str:
+    """
+    Stored summaries (already "<title>. <summary>") are used as-is.
+    Only rows whose `summary` column is empty go to the LLM, and the result is
+    written back against the row's content hash.
+    """
+    if row["summary"]:
+        return row["summary"]
 
-    sql = text(sql).bindparams(
-        bindparam("query_embedding", type_=Vector(EMBED_DIM)),
-        bindparam("limit", type_=Integer),
-        bindparam("current_id", type_=Integer),
+    content_summary = generate_summary(
+        row["content"] or "",
+        published_at=row["published_at"],
     )
+    summary = f"{row['title']}. {content_summary}"
 
-    return (
-        db.execute(
-            sql,
-            {
-                "query_embedding": query_vector,
-                "limit": limit,
-                "current_id": current_id,
-            },
-        )
-        .mappings()
-        .all()
-    )
+    _store_summary(row["hash"], summary)
+    return summary
 
 
 # ---------------------------------------------------------
@@ -89,15 +98,10 @@ def _run_vector_query(
 
 def _row_to_article_summary(row):
     """Convert a DB row into a clean summary reference object."""
-    content_summary = generate_summary(
-        row["content"],
-        published_at=row["published_at"],
-    )
-
     return {
         "id": row["id"],
         "title": row["title"],
-        "summary": f"{row['title']}. {content_summary}",
+        "summary": _reference_summary(row),
         "url": row["url"],
         "category": row["category"],
         "published_at": row["published_at"],
@@ -106,22 +110,27 @@ def _row_to_article_summary(row):
 
 
 # ---------------------------------------------------------
-# MAIN LOGIC: Semantic search with dynamic recency windows
+# Helper: Load an article's stored embedding
 # ---------------------------------------------------------
 
 
-def search_similar_articles(
-    query_text: str, category: str, current_id: int
-) -> List[dict]:
+def _load_article_embedding(db: Session, article_id: int):
+    """Return the vector stored for `article_id`, or None if not embedded yet."""
+    return (
+        db.query(Embedding.embedding)
+        .filter(Embedding.article_id == article_id)
+        .order_by(Embedding.id.desc())
+        .limit(1)
+        .scalar()
+    )
 
-    max_days = CATEGORY_RECENCY_DAYS.get(category, DEFAULT_RECENCY)
-    query_vector = get_embedding(query_text)
 
-    with SessionLocal() as db:
-        initial_rows = _run_vector_query(
-            db, query_vector, max_days, MAX_FETCH, current_id
-        )
+# ---------------------------------------------------------
+# Helper: Threshold filtering for RAG references
+# ---------------------------------------------------------
+
 
+def _select_references(initial_rows) -> List[dict]:
     primary = []
     fallback = []
 
@@ -141,6 +150,83 @@ def search_similar_articles(
     return [_row_to_article_summary(r) for r in initial_rows[:MAX_CONTEXT_RESULTS]]
 
 
+# ---------------------------------------------------------
+# MAIN LOGIC: Semantic search with dynamic recency windows
+# ---------------------------------------------------------
+
+
+def search_similar_articles(
+    query_text: str, category: str, current_id: int
+) -> List[dict]:
+
+    max_days = CATEGORY_RECENCY_DAYS.get(category, DEFAULT_RECENCY)
+    query_vector = get_embedding(query_text)
+
+    with SessionLocal() as db:
+        initial_rows = _similar_rows(db, query_vector, max_days, MAX_FETCH, current_id)
+
+    return _select_references(initial_rows)
+
+
+def search_similar_articles_by_id(
+    article_id: int, category: str, fallback_text: Optional[str] = None
+) -> List[dict]:
+    """
+    Same search as `search_similar_articles`, but keyed by article id.
+
+    The article's vector is read from the `embeddings` table, so the
+    transformer only runs when the article has not been embedded yet.
+    """
+
+    max_days = CATEGORY_RECENCY_DAYS.get(category, DEFAULT_RECENCY)
+
+    with SessionLocal() as db:
+        query_vector = _load_article_embedding(db, article_id)
+
+        if query_vector is None:
+            if not fallback_text:
+                return []
+            query_vector = get_embedding(fallback_text)
+
+        initial_rows = _similar_rows(db, query_vector, max_days, MAX_FETCH, article_id)
+
+    return _select_references(initial_rows)
+
+
+def _naive_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    # published_at columns are naive UTC
+    if ts is None or ts.tzinfo is None:
+        return ts
+    return ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def search_articles(
+    db: Session,
+    query_text: str,
+    top_k: int = 10,
+    category: Optional[str] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+    min_similarity: float = 0.0,
+) -> List[dict]:
+    """
+    User-facing semantic search. The query goes through the embedding cache
+    and results carry the stored summary only (None until the pipeline has
+    written one); this path never calls the LLM.
+    """
+    query_vector = get_embedding(query_text)
+
+    return run_search_query(
+        db,
+        query_vector,
+        top_k,
+        category=category,
+        published_after=_naive_utc(published_after),
+        published_before=_naive_utc(published_before),
+        min_similarity=min_similarity,
+    )
+
+
 # ---------------------------------------------------------
 # END OF FILE
 # ---------------------------------------------------------
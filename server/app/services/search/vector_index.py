@@ -0,0 +1,180 @@
+"""
+Approximate nearest-neighbour index on embeddings.embedding (pgvector).
+
+The index type and its build parameters come from the environment. The
+index name encodes them, so a config change shows up as a "wrong" index
+that `ensure_vector_index()` replaces. Search-time knobs are applied per
+transaction with `apply_search_settings()`. From server/:
+
+    python -m app.services.search.vector_index [--rebuild]
+"""
+
+import os
+import logging
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.database.database import engine
+from app.database.partitioning import is_partitioned
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# CONFIGURATION
+# ---------------------------------------------------------
+
+# hnsw | ivfflat | none (exact search, sequential scan)
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "hnsw").lower()
+
+# HNSW build / search parameters
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "128"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "200"))
+
+# IVFFlat build / search parameters (lists ~ rows / 1000 up to 1M rows)
+IVFFLAT_LISTS = int(os.getenv("IVFFLAT_LISTS", "100"))
+IVFFLAT_PROBES = int(os.getenv("IVFFLAT_PROBES", "10"))
+
+# pgvector >= 0.8 only: keep scanning the index until LIMIT rows pass the
+# WHERE clause (strict_order | relaxed_order). Unset = server default (off).
+VECTOR_ITERATIVE_SCAN = os.getenv("VECTOR_ITERATIVE_SCAN", "").lower()
+ITERATIVE_SCAN_MODES = {
+    "hnsw": ("strict_order", "relaxed_order"),
+    "ivfflat": ("relaxed_order",),
+}
+
+# Cosine distance, matching the `<=>` operator used by search_service
+VECTOR_OPS = "vector_cosine_ops"
+
+
+def index_name(index_type: str = VECTOR_INDEX_TYPE, table: str = "embeddings") -> str:
+    if index_type == "hnsw":
+        return f"ix_{table}_hnsw_m{HNSW_M}_ef{HNSW_EF_CONSTRUCTION}"
+    if index_type == "ivfflat":
+        return f"ix_{table}_ivfflat_l{IVFFLAT_LISTS}"
+    raise ValueError(f"Unknown vector index type: {index_type}")
+
+
+def index_ddl(
+    index_type: str = VECTOR_INDEX_TYPE,
+    table: str = "embeddings",
+    concurrently: bool = True,
+) -> str:
+    if index_type == "hnsw":
+        params = f"m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION}"
+    elif index_type == "ivfflat":
+        params = f"lists = {IVFFLAT_LISTS}"
+    else:
+        raise ValueError(f"Unknown vector index type: {index_type}")
+
+    # Partitioned tables build one index per partition, never concurrently
+    create = "CREATE INDEX CONCURRENTLY" if concurrently else "CREATE INDEX"
+    return (
+        f"{create} IF NOT EXISTS {index_name(index_type, table)} "
+        f"ON {table} USING {index_type} (embedding {VECTOR_OPS}) "
+        f"WITH ({params})"
+    )
+
+
+# ---------------------------------------------------------
+# Index management
+# ---------------------------------------------------------
+
+
+def existing_vector_indexes(conn) -> dict[str, bool]:
+    """ANN indexes on embeddings, mapped to whether they are valid."""
+    rows = conn.execute(
+        text(
+            """
+        SELECT c.relname, i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE i.indrelid = 'embeddings'::regclass
+          AND am.amname IN ('hnsw', 'ivfflat')
+    """
+        )
+    ).all()
+    return {name: valid for name, valid in rows}
+
+
+def ensure_vector_index(
+    bind=engine, index_type: str = VECTOR_INDEX_TYPE, rebuild: bool = False
+) -> dict:
+    """
+    Make the configured ANN index the only one on embeddings.
+    Other ANN indexes (old type or parameters, failed builds) are dropped
+    only after the new one is valid, so search is never left without one.
+    """
+    wanted = None if index_type == "none" else index_name(index_type)
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        existing = existing_vector_indexes(conn)
+        concurrently = not is_partitioned(conn, "embeddings")
+        drop = "DROP INDEX CONCURRENTLY" if concurrently else "DROP INDEX"
+
+        if wanted and (rebuild or existing.get(wanted) is False):
+            logger.info(f"🧹 Dropping {wanted} for rebuild")
+            conn.execute(text(f"{drop} IF EXISTS {wanted}"))
+            existing.pop(wanted, None)
+
+        created = False
+        if wanted and wanted not in existing:
+            logger.info(f"🏗 Building vector index {wanted}")
+            conn.execute(text(index_ddl(index_type, concurrently=concurrently)))
+            created = True
+
+        dropped = [name for name in existing if name != wanted]
+        for name in dropped:
+            logger.info(f"🧹 Dropping stale vector index {name}")
+            conn.execute(text(f"{drop} IF EXISTS {name}"))
+
+    return {"index": wanted, "created": created, "dropped": dropped}
+
+
+# ---------------------------------------------------------
+# Query-time settings
+# ---------------------------------------------------------
+
+
+def search_settings(
+    index_type: str = VECTOR_INDEX_TYPE,
+    limit: int = 0,
+    iterative_scan: str = VECTOR_ITERATIVE_SCAN,
+) -> dict:
+    if index_type == "hnsw":
+        # HNSW returns at most ef_search candidates before filtering
+        settings = {"hnsw.ef_search": max(HNSW_EF_SEARCH, limit)}
+    elif index_type == "ivfflat":
+        settings = {"ivfflat.probes": IVFFLAT_PROBES}
+    else:
+        return {}
+
+    if iterative_scan:
+        if iterative_scan not in ITERATIVE_SCAN_MODES[index_type]:
+            raise ValueError(
+                f"Unsupported iterative scan for {index_type}: {iterative_scan}"
+            )
+        settings[f"{index_type}.iterative_scan"] = iterative_scan
+
+    return settings
+
+
+def apply_search_settings(
+    db: Session, index_type: str = VECTOR_INDEX_TYPE, limit: int = 0
+):
+    """SET LOCAL the search knobs; they last until the current transaction ends."""
+    for name, value in search_settings(index_type, limit).items():
+        # SET does not take bind parameters; values are config ints / known modes
+        db.execute(text(f"SET LOCAL {name} = {value}"))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rebuild", action="store_true")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"✅ {ensure_vector_index(rebuild=args.rebuild)}")
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, Integer, bindparam, select, text
+from sqlalchemy.orm import Session
+from pgvector.sqlalchemy import Vector
+from app.database.partitioning import partitioning_enabled
+from app.services.search.vector_index import apply_search_settings
+from app.models.news.embedding import Embedding
+from app.models.news.news_article import NewsArticle
+
+EMBED_DIM = 768  # mpnet embedding size
+
+# ---------------------------------------------------------
+# SQL: recency + exclusion on embeddings' own columns
+# ---------------------------------------------------------
+
+# With partitioning (app/database/partitioning.py) the recency filter is
+# repeated on the partition key so old partitions are skipped. An article is
+# stored after it is published, so published_at >= cutoff implies
+# article_created_at >= cutoff; source timestamps can run a few hours ahead
+# of UTC, hence the slack. On a plain table the repeated, correlated range
+# filter only skews the planner's row estimates, so it is left out.
+PRUNE_PARTITIONS = partitioning_enabled()
+PRUNE_SLACK = timedelta(days=1)
+
+
+def similar_sql(prune: bool = PRUNE_PARTITIONS):
+    # Every value is a bound parameter, so the statement text never changes
+    # and the driver / server can reuse one prepared plan. Filtering on
+    # e.published_at / e.article_id lets the ANN or published_at index drive
+    # the scan; news_articles is only touched for the LIMIT rows that come back.
+    prune_filter = "AND e.article_created_at >= :prune_cutoff" if prune else ""
+    params = [
+        bindparam("query_embedding", type_=Vector(EMBED_DIM)),
+        bindparam("cutoff", type_=DateTime),
+        bindparam("current_id", type_=Integer),
+        bindparam("limit", type_=Integer),
+    ]
+    if prune:
+        params.append(bindparam("prune_cutoff", type_=DateTime))
+
+    return text(
+        f"""
+SELECT
+    na.id,
+    na.title,
+    na.url,
+    na.summary,
+    na.hash,
+    CASE WHEN na.summary IS NULL THEN na.content END AS content,
+    na.category,
+    na.published_at,
+    1 - (e.embedding <=> :query_embedding) AS similarity_score
+FROM embeddings e
+JOIN news_articles na ON na.id = e.article_id
+WHERE e.published_at >= :cutoff
+  AND e.article_id != :current_id
+  {prune_filter}
+ORDER BY e.embedding <=> :query_embedding
+LIMIT :limit
+"""
+    ).bindparams(*params)
+
+
+SIMILAR_SQL = similar_sql()
+
+
+def recency_cutoff(max_days: int) -> datetime:
+    # published_at is stored as naive UTC
+    return datetime.utcnow() - timedelta(days=max_days)
+
+
+def run_vector_query(
+    db: Session, query_vector, max_days: int, limit: int, current_id: int
+):
+    # ef_search / probes / iterative scan, scoped to this transaction
+    apply_search_settings(db, limit=limit)
+    cutoff = recency_cutoff(max_days)
+    params = {
+        "query_embedding": query_vector,
+        "cutoff": cutoff,
+        "current_id": current_id,
+        "limit": limit,
+    }
+    if PRUNE_PARTITIONS:
+        params["prune_cutoff"] = cutoff - PRUNE_SLACK
+
+    rows = db.execute(SIMILAR_SQL, params).mappings().all()
+
+    # relaxed_order iterative scans may return rows slightly out of order
+    return sorted(rows, key=lambda r: r["similarity_score"], reverse=True)
+
+
+# ---------------------------------------------------------
+# User-facing search: optional filters, stored columns only
+# ---------------------------------------------------------
+
+
+def search_query(
+    query_vector,
+    top_k: int,
+    category: str = None,
+    published_after: datetime = None,
+    published_before: datetime = None,
+    min_similarity: float = 0.0,
+):
+    """
+    Filters are added only when given, and all of them run on embeddings'
+    own columns, so the ANN index scan is filtered before any join.
+    """
+    distance = Embedding.embedding.cosine_distance(query_vector)
+
+    query = select(
+        NewsArticle.id,
+        NewsArticle.title,
+        NewsArticle.url,
+        NewsArticle.summary,
+        NewsArticle.category,
+        NewsArticle.published_at,
+        (1 - distance).label("similarity"),
+    ).join(NewsArticle, NewsArticle.id == Embedding.article_id)
+
+    if category:
+        query = query.where(Embedding.category == category)
+    if published_after:
+        query = query.where(Embedding.published_at >= published_after)
+        if PRUNE_PARTITIONS:
+            query = query.where(
+                Embedding.article_created_at >= published_after - PRUNE_SLACK
+            )
+    if published_before:
+        query = query.where(Embedding.published_at < published_before)
+    if min_similarity > 0:
+        query = query.where(distance <= 1 - min_similarity)
+
+    return query.order_by(distance).limit(top_k)
+
+
+def run_search_query(db: Session, query_vector, top_k: int, **filters) -> list[dict]:
+    apply_search_settings(db, limit=top_k)
+
+    rows = db.execute(search_query(query_vector, top_k, **filters)).mappings().all()
+    return sorted(
+        (dict(row) for row in rows), key=lambda r: r["similarity"], reverse=True
+    )
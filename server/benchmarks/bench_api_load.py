@@ -0,0 +1,89 @@
+"""
+Concurrent-request load benchmark for the read-heavy API routes.
+
+Fires `--concurrency` clients at a running server for `--duration` seconds
+and reports throughput and latency percentiles per path. Run it against the
+same database before and after a change to compare. From server/:
+
+    uvicorn app.main:app --workers 1 &
+    python -m benchmarks.bench_api_load --base-url http://127.0.0.1:8000 \
+        --path /api/news --path /stats --concurrency 64 --duration 20
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+
+async def _client_loop(client: httpx.AsyncClient, path: str, deadline: float, out: dict):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            resp = await client.get(path)
+            ok = resp.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if ok:
+            out["latencies"].append(elapsed_ms)
+        else:
+            out["errors"] += 1
+
+
+async def run_path(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    out = {"latencies": [], "errors": 0}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        # Warm-up: open connections and let the server fill its pools
+        await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(_client_loop(client, path, deadline, out) for _ in range(concurrency))
+        )
+
+    latencies = sorted(out["latencies"])
+    if not latencies:
+        return {"path": path, "requests": 0, "errors": out["errors"]}
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": out["errors"],
+        "rps": len(latencies) / duration,
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+    }
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--path", action="append", dest="paths")
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--duration", type=float, default=20.0)
+    args = ap.parse_args()
+
+    paths = args.paths or ["/api/news", "/stats"]
+
+    print(f"{'path':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for path in paths:
+        r = await run_path(args.base_url, path, args.concurrency, args.duration)
+        if not r["requests"]:
+            print(f"{path:<24}{'-':>10}{'-':>10}{'-':>10}{'-':>10}{r['errors']:>8}")
+            continue
+        print(
+            f"{path:<24}{r['rps']:>10.1f}{r['p50']:>10.1f}{r['p95']:>10.1f}"
+            f"{r['p99']:>10.1f}{r['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
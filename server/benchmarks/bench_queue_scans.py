@@ -0,0 +1,241 @@
+"""
+Latency of the pipeline work-queue scans on a large synthetic table.
+
+Builds a scratch schema (`bench_queues`, dropped afterwards) with --rows
+articles spread over 30 days: the newest --backlog are waiting for a summary
+and an embedding, the --backlog before them for analysis, and every 10000th
+older article is missing its embedding. news_articles / ai_analysis come from the
+models; embeddings keeps only its key columns (1M vectors would be ~3 GB and
+play no part in the queue scans).
+
+Each queue query is timed against the bare tables, then again after the
+model's partial / feed indexes are built. The embedding queue compares the
+old LEFT JOIN ... IS NULL query with the one in
+app/services/pipeline/queues.py. Point DATABASE_URL at a local Postgres,
+never at Neon. From server/:
+
+    DATABASE_URL=postgresql://postgres@localhost/bench \
+        python -m benchmarks.bench_queue_scans --rows 1000000
+"""
+
+import time
+import argparse
+import statistics
+
+from sqlalchemy import select, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.database.database import engine
+from app.models.news.ai_analysis import AiAnalysis
+from app.models.news.embedding import Embedding
+from app.models.news.news_article import NewsArticle
+from app.services.news.feed_service import feed_query
+from app.services.news.stats_service import PENDING_SQL
+from app.services.pipeline.queues import (
+    pending_analyses,
+    pending_embeddings,
+    pending_summaries,
+)
+
+SCHEMA = "bench_queues"
+
+# Indexes under test; everything else (primary keys, unique keys) is built
+# up front, as it exists on every deployment
+QUEUE_INDEXES = (
+    "ix_news_articles_pending_summary",
+    "ix_news_articles_pending_embedding",
+    "ix_news_articles_pending_analysis",
+    "ix_news_articles_feed",
+    "ix_news_articles_feed_category",
+)
+
+
+def old_pending_embeddings(limit: int):
+    """The backfill query before: outer join, rescanned from id 0 per chunk."""
+    return (
+        select(NewsArticle.id, NewsArticle.title, NewsArticle.content)
+        .outerjoin(Embedding, Embedding.article_id == NewsArticle.id)
+        .where(Embedding.id.is_(None))
+        .order_by(NewsArticle.id)
+        .limit(limit)
+    )
+
+
+def load_tables(conn, rows: int, backlog: int):
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"SET search_path TO {SCHEMA}"))
+
+    conn.execute(CreateTable(NewsArticle.__table__))
+    conn.execute(CreateTable(AiAnalysis.__table__))
+    conn.execute(
+        text(
+            """
+        CREATE TABLE embeddings (
+            id serial PRIMARY KEY,
+            article_id integer NOT NULL,
+            article_created_at timestamp
+        )
+    """
+        )
+    )
+
+    # Newest `backlog`: nothing done yet. The `backlog` before: summarized
+    # and embedded, waiting for analysis. The rest: done.
+    conn.execute(
+        text(
+            """
+        INSERT INTO news_articles
+            (title, url, content, summary, category, published_at, hash,
+             created_at, is_relevant, is_analyzed, is_embedded)
+        SELECT
+            'title ' || g,
+            'bench://' || g,
+            'body ' || g,
+            CASE WHEN g > :rows - :backlog THEN NULL ELSE 'summary ' || g END,
+            (ARRAY['Bitcoin', 'Ethereum', 'Regulation', 'ETF'])[1 + g % 4],
+            ts,
+            md5(g::text),
+            ts,
+            1,
+            g <= :rows - 2 * :backlog,
+            g <= :rows - :backlog AND g % 10000 <> 0
+        FROM generate_series(1, :rows) AS g,
+             LATERAL (SELECT now() - (:rows - g) * (interval '30 days' / :rows)) AS t(ts)
+    """
+        ),
+        {"rows": rows, "backlog": backlog},
+    )
+    conn.execute(
+        text(
+            """
+        INSERT INTO embeddings (article_id, article_created_at)
+        SELECT id, created_at FROM news_articles
+        WHERE id <= :rows - :backlog AND id % 10000 <> 0
+    """
+        ),
+        {"rows": rows, "backlog": backlog},
+    )
+    conn.execute(
+        text(
+            """
+        INSERT INTO ai_analysis (article_id, prediction, created_at)
+        SELECT id, 'neutral', created_at FROM news_articles WHERE is_analyzed
+    """
+        )
+    )
+
+    conn.execute(
+        text("CREATE UNIQUE INDEX ux_embeddings_article_id ON embeddings (article_id)")
+    )
+    for table in (NewsArticle.__table__, AiAnalysis.__table__):
+        for index in table.indexes:
+            if index.name not in QUEUE_INDEXES:
+                conn.execute(text(_index_ddl(conn, index)))
+
+    vacuum_analyze(conn)
+
+
+def _index_ddl(conn, index) -> str:
+    # Inside the load transaction, so never CONCURRENTLY
+    ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+    return ddl.replace("INDEX CONCURRENTLY", "INDEX", 1)
+
+
+def build_queue_indexes(conn) -> float:
+    started = time.perf_counter()
+    for index in NewsArticle.__table__.indexes:
+        if index.name in QUEUE_INDEXES:
+            conn.execute(text(_index_ddl(conn, index)))
+    elapsed = time.perf_counter() - started
+    vacuum_analyze(conn)
+    return elapsed
+
+
+def vacuum_analyze(conn):
+    # Fresh visibility map, so index-only scans really are index-only
+    conn.commit()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as other:
+        for table in ("news_articles", "embeddings", "ai_analysis"):
+            other.execute(text(f"VACUUM ANALYZE {SCHEMA}.{table}"))
+
+
+def plan_summary(conn, statement) -> str:
+    compiled = statement.compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()[0]
+
+    nodes, stack = [], [plan["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Scan" in node["Node Type"] or "Join" in node["Node Type"]:
+            name = node.get("Index Name") or node.get("Relation Name") or ""
+            nodes.append(f"{node['Node Type']} {name}".strip())
+        stack.extend(reversed(node.get("Plans", [])))
+    return ", ".join(dict.fromkeys(nodes))
+
+
+def time_query(conn, statement, repeat: int) -> float:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(statement).all()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.median(latencies)
+
+
+def queries(chunk: int) -> dict:
+    return {
+        "summary queue (chunk)": pending_summaries(0, chunk),
+        "analysis queue (all)": pending_analyses(),
+        "embedding queue, LEFT JOIN": old_pending_embeddings(chunk),
+        "embedding queue, new": pending_embeddings(0, chunk),
+        "feed first page": feed_query(45),
+        "feed page, one category": feed_query(45, category="ETF"),
+        "/stats backlog": PENDING_SQL,
+    }
+
+
+def run(conn, label: str, chunk: int, repeat: int) -> dict:
+    print(f"\n{label}")
+    print(f"{'query':<30}{'median ms':>12}  plan")
+    results = {}
+    for name, statement in queries(chunk).items():
+        results[name] = time_query(conn, statement, repeat)
+        print(f"{name:<30}{results[name]:>12.2f}  {plan_summary(conn, statement)}")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--backlog", type=int, default=2000)
+    ap.add_argument("--chunk", type=int, default=256)
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    with engine.connect() as conn:
+        try:
+            started = time.perf_counter()
+            load_tables(conn, args.rows, args.backlog)
+            print(
+                f"Loaded {args.rows} articles in {time.perf_counter() - started:.1f}s"
+            )
+
+            before = run(conn, "Without queue indexes", args.chunk, args.repeat)
+            build = build_queue_indexes(conn)
+            print(f"\nQueue indexes built in {build:.1f}s")
+            after = run(conn, "With queue indexes", args.chunk, args.repeat)
+
+            print(f"\n{'query':<30}{'speedup':>12}")
+            for name in before:
+                print(f"{name:<30}{before[name] / after[name]:>11.1f}x")
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
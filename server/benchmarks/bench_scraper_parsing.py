@@ -0,0 +1,103 @@
+"""
+Parse-time benchmark for the scraper's HTML backends.
+
+Runs every installed backend over the saved HTML fixtures and prints the
+mean / p95 parse time per page. The "full-tree" row is the old behaviour
+(full html.parser tree) and is the speedup baseline. Run from server/:
+
+    python -m benchmarks.bench_scraper_parsing [--repeat 200] [--fixtures DIR]
+"""
+
+import os
+import time
+import argparse
+import statistics
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.cryptoslate_scraper.parsers import (
+    available_backends,
+    fetch_published_date,
+    parse_article_html,
+    parse_top_news_html,
+    _article_content,
+)
+
+DEFAULT_FIXTURES = os.path.join("tests", "fixtures", "cryptoslate")
+
+
+def load_pages(fixtures_dir: str) -> list[tuple[str, str]]:
+    pages = []
+    for filename in sorted(os.listdir(fixtures_dir)):
+        if filename.endswith(".html"):
+            with open(os.path.join(fixtures_dir, filename), encoding="utf-8") as f:
+                pages.append((filename, f.read()))
+    return pages
+
+
+def parse_page_full_tree(filename: str, html: str):
+    """The pre-backend behaviour: full html.parser tree, selectors tried in turn."""
+    soup = BeautifulSoup(html, "html.parser")
+    if filename.startswith("top_news"):
+        return soup.find("section", id="top-news-panel-24h")
+    return _article_content(soup), fetch_published_date(soup)
+
+
+def parse_page(filename: str, html: str, backend: str):
+    if backend == "full-tree":
+        return parse_page_full_tree(filename, html)
+    if filename.startswith("top_news"):
+        return parse_top_news_html(html, backend=backend)
+    return parse_article_html(html, backend=backend)
+
+
+def time_backend(filename: str, html: str, backend: str, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse_page(filename, html, backend)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    args = ap.parse_args()
+
+    pages = load_pages(args.fixtures)
+    backends = ["full-tree"] + available_backends()
+
+    print(f"{'page':<24}{'backend':<14}{'mean ms':>10}{'p95 ms':>10}{'speedup':>10}")
+
+    for filename, html in pages:
+        baseline = None
+        reference = parse_page(filename, html, "html.parser")
+
+        for backend in backends:
+            if backend != "full-tree":
+                result = parse_page(filename, html, backend)
+                if _comparable(result) != _comparable(reference):
+                    print(f"!! {backend} output differs from html.parser on {filename}")
+
+            timings = time_backend(filename, html, backend, args.repeat)
+            mean = statistics.mean(timings)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            baseline = baseline or mean
+
+            print(
+                f"{filename:<24}{backend:<14}{mean:>10.3f}{p95:>10.3f}"
+                f"{baseline / mean:>9.1f}x"
+            )
+
+
+def _comparable(result):
+    # Listing entries carry a fetch timestamp; compare everything else
+    if isinstance(result, list):
+        return [(r["title"], r["url"]) for r in result]
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Recall vs latency of pgvector ANN indexes against exact search.
+
+Loads a synthetic clustered corpus of unit vectors into a scratch table
+(`bench_embeddings`, dropped afterwards), computes exact top-k neighbours
+with numpy, then times the same `ORDER BY embedding <=> q LIMIT k` query
+with no index, HNSW (over several ef_search values) and IVFFlat (over
+several probes). Point DATABASE_URL at a local Postgres, never at Neon.
+From server/:
+
+    DATABASE_URL=postgresql://postgres@localhost/bench \
+        python -m benchmarks.bench_vector_index --rows 20000 --queries 100
+"""
+
+import io
+import time
+import argparse
+import statistics
+
+import numpy as np
+from sqlalchemy import text
+
+from app.database.database import engine
+from app.services.search import vector_index
+
+TABLE = "bench_embeddings"
+
+
+def make_corpus(rows: int, dim: int, clusters: int, seed: int = 7):
+    """Topic-like clusters: news embeddings are far from uniform."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    data = centers[labels] + 0.6 * rng.normal(size=(rows, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def make_queries(corpus: np.ndarray, count: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    picks = corpus[rng.choice(len(corpus), size=count, replace=False)]
+    noisy = picks + 0.3 * rng.normal(size=picks.shape).astype(np.float32)
+    return noisy / np.linalg.norm(noisy, axis=1, keepdims=True)
+
+
+def exact_neighbours(corpus: np.ndarray, queries: np.ndarray, k: int):
+    scores = queries @ corpus.T
+    return [set(np.argsort(-row)[:k] + 1) for row in scores]  # ids are 1-based
+
+
+def vector_literal(vec) -> str:
+    return "[" + ",".join(f"{x:.6g}" for x in vec) + "]"
+
+
+def load_table(corpus: np.ndarray):
+    dim = corpus.shape[1]
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cur.execute(f"CREATE TABLE {TABLE} (id integer PRIMARY KEY, embedding vector({dim}))")
+
+        buf = io.StringIO()
+        for i, vec in enumerate(corpus, start=1):
+            buf.write(f"{i}\t{vector_literal(vec)}\n")
+        buf.seek(0)
+        cur.copy_expert(f"COPY {TABLE} (id, embedding) FROM STDIN", buf)
+
+        cur.execute(f"ANALYZE {TABLE}")
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def build_index(index_type: str) -> float:
+    started = time.perf_counter()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SET maintenance_work_mem = '512MB'"))
+        conn.execute(text(vector_index.index_ddl(index_type, TABLE)))
+    return time.perf_counter() - started
+
+
+def drop_index(index_type: str):
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"DROP INDEX IF EXISTS {vector_index.index_name(index_type, TABLE)}")
+        )
+
+
+def run_queries(queries, truth, k: int, settings: dict) -> dict:
+    latencies, recalls = [], []
+    sql = text(
+        f"SELECT id FROM {TABLE} ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k"
+    )
+
+    with engine.connect() as conn:
+        for name, value in settings.items():
+            conn.execute(text(f"SET {name} = {int(value)}"))
+
+        for q, expected in zip(queries, truth):
+            literal = vector_literal(q)
+            started = time.perf_counter()
+            ids = conn.execute(sql, {"q": literal, "k": k}).scalars().all()
+            latencies.append((time.perf_counter() - started) * 1000)
+            recalls.append(len(expected & set(ids)) / k)
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "recall": statistics.mean(recalls),
+        "p50": cuts[49],
+        "p95": cuts[94],
+    }
+
+
+def report(label: str, r: dict):
+    print(f"{label:<28}{r['recall']:>10.3f}{r['p50']:>10.2f}{r['p95']:>10.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--clusters", type=int, default=200)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("-k", type=int, default=20)
+    ap.add_argument("--keep", action="store_true", help="keep the scratch table")
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.rows, args.dim, args.clusters)
+    queries = make_queries(corpus, args.queries)
+    truth = exact_neighbours(corpus, queries, args.k)
+
+    started = time.perf_counter()
+    load_table(corpus)
+    print(f"Loaded {args.rows} x {args.dim} vectors in {time.perf_counter() - started:.1f}s")
+
+    print(f"\n{'config':<28}{'recall@' + str(args.k):>10}{'p50 ms':>10}{'p95 ms':>10}")
+    report("exact (seq scan)", run_queries(queries, truth, args.k, {}))
+
+    try:
+        seconds = build_index("hnsw")
+        print(f"-- hnsw m={vector_index.HNSW_M} ef_construction="
+              f"{vector_index.HNSW_EF_CONSTRUCTION} built in {seconds:.1f}s")
+        for ef in (20, 40, 100, 200):
+            settings = {"hnsw.ef_search": max(ef, args.k)}
+            report(f"hnsw ef_search={ef}", run_queries(queries, truth, args.k, settings))
+        drop_index("hnsw")
+
+        seconds = build_index("ivfflat")
+        print(f"-- ivfflat lists={vector_index.IVFFLAT_LISTS} built in {seconds:.1f}s")
+        for probes in (1, 5, 10, 20):
+            settings = {"ivfflat.probes": probes}
+            report(f"ivfflat probes={probes}", run_queries(queries, truth, args.k, settings))
+        drop_index("ivfflat")
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
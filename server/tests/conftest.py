@@ -0,0 +1,40 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.database.migrations import run_migrations  # noqa: E402
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="module")
+def bind():
+    """Migrated engine on TEST_DATABASE_URL; the test is skipped without it."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    bind = create_engine(TEST_DATABASE_URL)
+    try:
+        run_migrations(bind)
+        yield bind
+    finally:
+        bind.dispose()
+
+
+@pytest.fixture
+def empty_tables(bind):
+    """Deletes every article and pipeline job before the test."""
+    with bind.begin() as conn:
+        conn.execute(text("DELETE FROM pipeline_jobs"))
+        # ON DELETE CASCADE takes embeddings and analyses along
+        conn.execute(text("DELETE FROM news_articles"))
+
+
+@pytest.fixture
+def session_factory(bind, empty_tables):
+    return sessionmaker(bind=bind)
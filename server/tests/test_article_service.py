@@ -0,0 +1,43 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.services.news.article_service import insert_articles_batch  # noqa: E402
+
+
+def record(name: str, content: str = "body") -> dict:
+    return {
+        "category": "Top News",
+        "title": name,
+        "url": f"https://example.com/{name}",
+        "published_at": "2026-10-17T09:30:00+00:00",
+        "content": content,
+    }
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+def test_bad_row_does_not_fail_its_chunk(db):
+    insert_articles_batch(db, [record("stored-earlier")])
+
+    results = insert_articles_batch(
+        db,
+        [
+            record("first"),
+            record("broken", content="NUL \x00 byte"),
+            record("stored-earlier"),
+            record("last"),
+        ],
+    )
+
+    assert [r["status"] for r in results] == ["inserted", "error", "exists", "inserted"]
+    titles = db.execute(text("SELECT title FROM news_articles ORDER BY id"))
+    assert [row.title for row in titles] == ["stored-earlier", "first", "last"]
@@ -0,0 +1,150 @@
+import os
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "test-key")
+
+from app.routes import news_analysis_route  # noqa: E402
+from app.services.deepseek_client import deepseek_client  # noqa: E402
+
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "deepseek-reasoner",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "  MOCK ANALYSIS  "},
+            "finish_reason": "stop",
+        }
+    ],
+}
+
+
+def start_mock_server(responses):
+    """Serve queued (status, headers) responses, then 200 completions."""
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            calls.append(json.loads(self.rfile.read(length)))
+
+            status, headers = responses.pop(0) if responses else (200, {})
+            body = json.dumps(COMPLETION if status == 200 else {"error": {}})
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, calls
+
+
+def use_server(monkeypatch, server):
+    monkeypatch.setattr(
+        deepseek_client,
+        "DEEPSEEK_API_BASE",
+        f"http://127.0.0.1:{server.server_address[1]}/v1",
+    )
+    monkeypatch.setattr(deepseek_client, "DEEPSEEK_BACKOFF_BASE", 0.01)
+
+
+def test_async_client_retries_after_429(monkeypatch):
+    server, calls = start_mock_server([(429, {"Retry-After": "0"})])
+    use_server(monkeypatch, server)
+
+    try:
+        result = asyncio.run(deepseek_client.run_deepseek_async("prompt"))
+    finally:
+        server.shutdown()
+
+    assert result == {"status": "OK", "prediction": "MOCK ANALYSIS"}
+    assert len(calls) == 2
+
+
+def test_async_client_does_not_retry_client_errors(monkeypatch):
+    server, calls = start_mock_server([(400, {})])
+    use_server(monkeypatch, server)
+
+    try:
+        result = asyncio.run(deepseek_client.run_deepseek_async("prompt"))
+    finally:
+        server.shutdown()
+
+    assert result["status"] == "ERROR"
+    assert len(calls) == 1
+
+
+def test_async_client_runs_concurrent_calls(monkeypatch):
+    server, calls = start_mock_server([(503, {}), (503, {})])
+    use_server(monkeypatch, server)
+
+    async def run_many():
+        return await asyncio.gather(
+            *(deepseek_client.run_deepseek_async(f"prompt {i}") for i in range(8))
+        )
+
+    try:
+        results = asyncio.run(run_many())
+    finally:
+        server.shutdown()
+
+    assert all(r["status"] == "OK" for r in results)
+    assert len(calls) == 10
+
+
+def test_async_client_is_closed_with_its_loop():
+    async def open_client():
+        return deepseek_client.get_async_client()
+
+    async_client = asyncio.run(open_client())
+
+    assert async_client.is_closed()
+
+
+def test_retry_after_http_date_is_honoured():
+    assert deepseek_client._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert deepseek_client._parse_retry_after("2.5") == 2.5
+    assert deepseek_client._parse_retry_after(None) is None
+
+
+@pytest.mark.parametrize(
+    "result, status_code, body",
+    [
+        ({"status": "OK", "prediction": " ANALYSIS "}, 200, {"status": "IMPACT"}),
+        ({"status": "OK", "prediction": "NO_IMPACT\n"}, 200, {"status": "NO_IMPACT"}),
+        ({"status": "ERROR", "prediction": "timeout"}, 502, {}),
+    ],
+)
+def test_analyze_news_route_reads_the_result_dict(
+    monkeypatch, result, status_code, body
+):
+    async def fake_analyze(article, similar):
+        return result
+
+    monkeypatch.setattr(
+        news_analysis_route, "analyze_article_with_deepseek_async", fake_analyze
+    )
+    app = FastAPI()
+    app.include_router(news_analysis_route.router, prefix="/api")
+
+    response = TestClient(app).get("/api/analyze-news/1")
+
+    assert response.status_code == status_code
+    assert body.items() <= response.json().items()
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.services.ai.embedding_cache import EmbeddingCache, cache_key
+
+MODEL = "test-model"
+DIM = 4
+
+
+def vector(seed: float) -> list[float]:
+    return [seed + i for i in range(DIM)]
+
+
+def open_cache(tmp_path) -> EmbeddingCache:
+    return EmbeddingCache(MODEL, DIM, cache_dir=str(tmp_path), memory_size=2)
+
+
+def cache_file(tmp_path, name: str) -> str:
+    return os.path.join(tmp_path, MODEL, name)
+
+
+def test_round_trip_through_disk(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put("first text", vector(1))
+    cache.put("second   text", vector(2))
+
+    reopened = open_cache(tmp_path)
+
+    assert reopened.get("first text") == vector(1)
+    # Whitespace is normalized before hashing
+    assert reopened.get("second text") == vector(2)
+    assert reopened.get("unknown") is None
+    assert reopened.stats()["disk_hits"] == 2
+    assert reopened.stats()["disk_entries"] == 2
+
+
+def test_torn_index_line_is_ignored(tmp_path):
+    cache = open_cache(tmp_path)
+    for i in range(3):
+        cache.put(f"text {i}", vector(i))
+
+    # A crash mid-line: "<key>\t12" is all that reached the disk of "...\t123\n"
+    torn = cache_key("torn text", MODEL)
+    with open(cache_file(tmp_path, "index.tsv"), "a", encoding="utf-8") as f:
+        f.write(f"{torn}\t1")
+
+    reopened = open_cache(tmp_path)
+    assert reopened.get("torn text") is None
+
+    # The next append terminates the torn line instead of extending it
+    reopened.put("after crash", vector(9))
+    again = open_cache(tmp_path)
+    assert again.get("torn text") is None
+    assert again.get("after crash") == vector(9)
+    assert again.get("text 1") == vector(1)
+
+
+def test_index_rows_past_the_vector_file_are_ignored(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put("kept", vector(1))
+    cache.put("lost", vector(2))
+
+    # The second vector lost its last bytes; its index line survived
+    path = cache_file(tmp_path, "vectors.f32")
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    reopened = open_cache(tmp_path)
+    assert reopened.get("kept") == vector(1)
+    assert reopened.get("lost") is None
+    # Opening never rewrites the files another process may be appending to
+    assert os.path.getsize(path) == 2 * DIM * 4 - 3
+
+    # The next append drops the torn tail and lands on a row boundary
+    reopened.put("next", vector(3))
+    again = open_cache(tmp_path)
+    assert again.get("next") == vector(3)
+    assert os.path.getsize(path) == 2 * DIM * 4
+
+    # "next" reused the lost row: the stale index line must not resolve to it
+    assert reopened.get("lost") is None
+    assert again.get("lost") is None
+    assert again.get("kept") == vector(1)
+    again.put("later", vector(4))
+    assert open_cache(tmp_path).get("lost") is None
+
+
+def test_wrong_sized_vectors_are_not_written(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put("short", [1.0, 2.0])
+
+    assert not os.path.exists(cache_file(tmp_path, "vectors.f32"))
+    assert open_cache(tmp_path).get("short") is None
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_numpy_vectors_are_accepted(tmp_path, dtype):
+    cache = open_cache(tmp_path)
+    cache.put("array", np.arange(DIM, dtype=dtype))
+
+    assert open_cache(tmp_path).get("array") == [0.0, 1.0, 2.0, 3.0]
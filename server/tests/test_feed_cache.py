@@ -0,0 +1,130 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.database.database import get_async_db  # noqa: E402
+from app.routes import news_feed_route  # noqa: E402
+from app.services.news.feed_cache import (  # noqa: E402
+    VERSION_SQL,
+    FeedCache,
+    bump_feed_version,
+    etag_matches,
+)
+
+
+class FakeVersionDb:
+    """Answers the version query with whatever `state` currently holds."""
+
+    def __init__(self, state):
+        self.state = state
+        self.queries = 0
+
+    async def execute(self, _statement):
+        self.queries += 1
+        state = self.state
+
+        class Result:
+            def one(self):
+                return state["newest"], state["generation"]
+
+        return Result()
+
+
+def make_client(monkeypatch, cache: FeedCache, state: dict):
+    builds = []
+
+    async def fake_build(db, limit, category=None, cursor=None):
+        builds.append(limit)
+        return {"last_updated": None, "data": [{"id": state["newest"]}][:limit]}
+
+    monkeypatch.setattr(news_feed_route, "feed_cache", cache)
+    monkeypatch.setattr(news_feed_route, "build_news_feed", fake_build)
+
+    db = FakeVersionDb(state)
+
+    async def override():
+        yield db
+
+    app = FastAPI()
+    app.include_router(news_feed_route.router, prefix="/api")
+    app.dependency_overrides[get_async_db] = override
+    return TestClient(app), builds, db
+
+
+def test_feed_is_served_from_cache_until_version_changes(monkeypatch):
+    state = {"newest": 1, "generation": 1}
+    cache = FeedCache(version_ttl=0)
+    client, builds, _ = make_client(monkeypatch, cache, state)
+
+    first = client.get("/api/news?limit=5")
+    second = client.get("/api/news?limit=5")
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert builds == [5]
+
+    # A new analysis bumps the version and the next request rebuilds
+    state["newest"] = 2
+    third = client.get("/api/news?limit=5")
+
+    assert third.json()["data"] == [{"id": 2}]
+    assert third.headers["etag"] != first.headers["etag"]
+    assert builds == [5, 5]
+
+    # Retention deleting from the middle of the id range bumps the generation
+    state["generation"] = 2
+    client.get("/api/news?limit=5")
+    assert builds == [5, 5, 5]
+
+
+def test_if_none_match_returns_304(monkeypatch):
+    state = {"newest": 1, "generation": 1}
+    client, _, _ = make_client(monkeypatch, FeedCache(version_ttl=0), state)
+
+    etag = client.get("/api/news").headers["etag"]
+    cached = client.get("/api/news", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+def test_version_is_rechecked_at_most_once_per_ttl(monkeypatch):
+    state = {"newest": 1, "generation": 1}
+    cache = FeedCache(version_ttl=3600)
+    client, builds, db = make_client(monkeypatch, cache, state)
+
+    for _ in range(10):
+        client.get("/api/news")
+    assert db.queries == 1
+
+    # Same-process writers skip the wait
+    state["newest"] = 2
+    cache.invalidate()
+    assert client.get("/api/news").json()["data"] == [{"id": 2}]
+    assert db.queries == 2
+    assert len(builds) == 2
+
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+
+
+def test_bump_changes_the_stored_version(bind):
+    with bind.connect() as conn:
+        before = conn.execute(VERSION_SQL).one()
+        bump_feed_version(conn)
+        after = conn.execute(VERSION_SQL).one()
+
+    assert after[0] == before[0]
+    assert after[1] > before[1]
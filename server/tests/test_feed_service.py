@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.database.base import Base
+from app.models.news.news_article import NewsArticle
+from app.models.news.ai_analysis import AiAnalysis
+from app.models.news.embedding import Embedding  # noqa: F401  (mapper registry)
+from app.services.news.feed_service import (
+    decode_cursor,
+    encode_cursor,
+    feed_payload,
+    feed_query,
+)
+
+
+def make_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[NewsArticle.__table__, AiAnalysis.__table__]
+    )
+    return engine
+
+
+def seed(db: Session, count: int, categories=("Top News",)):
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        article = NewsArticle(
+            title=f"Title {i}",
+            url=f"https://example.com/{i}",
+            content="body " * 500,
+            summary=f"Summary {i}",
+            category=categories[i % len(categories)],
+            hash=f"h{i}",
+            created_at=start + timedelta(minutes=i),
+            is_analyzed=True,
+        )
+        db.add(article)
+        db.flush()
+
+        # Two analyses per article; the feed shows the newer one
+        for n, label in enumerate(("old", "new")):
+            db.add(
+                AiAnalysis(
+                    article_id=article.id,
+                    prediction=f"{label} {i}",
+                    created_at=start + timedelta(minutes=i, seconds=n),
+                )
+            )
+    db.commit()
+
+
+def test_feed_is_one_statement_without_content():
+    engine = make_db()
+    statements = []
+
+    with Session(engine) as db:
+        seed(db, 60)
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        payload = feed_payload(db.execute(feed_query(45)).all())
+
+    assert len(statements) == 1
+    assert "content" not in statements[0]
+
+    assert len(payload["data"]) == 45
+    newest = payload["data"][0]
+    assert newest["id"] == 60
+    assert newest["analysis"] == {"prediction": "new 59"}
+    assert payload["last_updated"] == datetime(2025, 1, 1) + timedelta(minutes=59)
+
+
+def test_article_without_analysis_row_has_no_prediction():
+    engine = make_db()
+
+    with Session(engine) as db:
+        db.add(
+            NewsArticle(
+                title="t",
+                url="u",
+                content="c",
+                category="Top News",
+                hash="h",
+                is_analyzed=True,
+            )
+        )
+        db.commit()
+
+        payload = feed_payload(db.execute(feed_query(45)).all())
+
+    assert payload["data"][0]["analysis"] == {"prediction": None}
+
+
+def read_pages(db: Session, limit: int, category: str = None) -> list[list[int]]:
+    pages, cursor = [], None
+    while True:
+        rows = db.execute(feed_query(limit + 1, category, cursor)).all()
+        payload = feed_payload(rows, limit)
+        pages.append([item["id"] for item in payload["data"]])
+
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_cover_the_feed_once_in_order():
+    engine = make_db()
+
+    with Session(engine) as db:
+        seed(db, 60)
+        pages = read_pages(db, 25)
+
+    assert [len(p) for p in pages] == [25, 25, 10]
+    assert sum(pages, []) == list(range(60, 0, -1))
+
+
+def test_cursor_pages_with_category_filter():
+    engine = make_db()
+
+    with Session(engine) as db:
+        seed(db, 30, categories=("Bitcoin", "Ethereum"))
+        pages = read_pages(db, 4, category="Ethereum")
+
+    # Odd indexes (ids 2, 4, ...) are Ethereum
+    assert sum(pages, []) == list(range(30, 0, -2))
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    for bad in ("not-a-cursor", "", encode_cursor(created_at, 42)[:-3]):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
@@ -0,0 +1,209 @@
+import os
+import threading
+from collections import Counter
+
+import pytest
+from sqlalchemy import text
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ.setdefault("DEEPSEEK_API_KEY", "test-key")
+
+from app.models.news.news_article import NewsArticle  # noqa: E402
+from app.services.pipeline import jobs  # noqa: E402
+from app.services.pipeline.queues import pending_analyses  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def jobs_session(session_factory, monkeypatch):
+    monkeypatch.setattr(jobs, "SessionLocal", session_factory)
+
+
+def seed_articles(factory, count: int) -> list[int]:
+    with factory() as db:
+        ids = [
+            db.execute(
+                text(
+                    """
+                INSERT INTO news_articles
+                    (title, url, content, summary, category, hash, is_analyzed)
+                VALUES ('t', :url, 'body', 's', 'Bitcoin', :url, false)
+                RETURNING id
+            """
+                ),
+                {"url": f"jobs-test://{i}"},
+            ).scalar()
+            for i in range(count)
+        ]
+        db.commit()
+    return ids
+
+
+def test_enqueue_is_idempotent(session_factory):
+    ids = seed_articles(session_factory, 3)
+
+    with session_factory() as db:
+        assert jobs.enqueue_pending(db) == {"embedding": 3, "analysis": 0}
+        assert jobs.enqueue_pending(db) == {"embedding": 0, "analysis": 0}
+
+        query = pending_analyses().where(NewsArticle.id.in_(ids[:2]))
+        assert jobs.enqueue(db, "analysis", query) == 2
+        db.commit()
+
+        counts = jobs.job_counts(db)
+    assert counts["embedding"]["queued"] == 3
+    assert counts["analysis"]["queued"] == 2
+
+
+def test_concurrent_claims_skip_locked_rows(session_factory):
+    seed_articles(session_factory, 3)
+    with session_factory() as db:
+        jobs.enqueue_pending(db)
+
+    # The first claim is still uncommitted: its rows are skipped, not waited on
+    with session_factory() as first, session_factory() as second:
+        a = jobs.claim(first, "embedding", 2)
+        b = jobs.claim(second, "embedding", 10)
+        first.commit()
+        second.commit()
+
+    assert len(a) == 2 and len(b) == 1
+    assert not {job.id for job in a} & {job.id for job in b}
+
+
+def test_workers_process_each_job_once(session_factory):
+    seed_articles(session_factory, 40)
+    with session_factory() as db:
+        jobs.enqueue_pending(db)
+
+    seen = Counter()
+    lock = threading.Lock()
+
+    def handler(batch):
+        with lock:
+            seen.update(job.article_id for job in batch)
+        return {}
+
+    workers = [
+        threading.Thread(
+            target=jobs.run_worker,
+            args=("embedding", handler, 3),
+            kwargs={"once": True},
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(seen) == 40 and set(seen.values()) == {1}
+    with session_factory() as db:
+        assert jobs.job_counts(db)["embedding"] == {
+            "queued": 0,
+            "running": 0,
+            "dead": 0,
+        }
+
+
+def test_expired_lease_is_reclaimed(session_factory):
+    seed_articles(session_factory, 1)
+    with session_factory() as db:
+        jobs.enqueue_pending(db)
+
+        # Worker A claims and stalls past its (zero) visibility timeout
+        (stale,) = jobs.claim(db, "embedding", 1, visibility_timeout=0)
+        db.commit()
+
+        (fresh,) = jobs.claim(db, "embedding", 1)
+        db.commit()
+        assert (fresh.id, fresh.attempts) == (stale.id, 2)
+
+        # A can no longer complete or fail it; B can
+        assert not jobs.complete(db, stale)
+        assert jobs.fail(db, stale, "late") is None
+        assert jobs.complete(db, fresh)
+        db.commit()
+        assert jobs.job_counts(db)["embedding"]["running"] == 0
+
+
+def test_failures_retry_then_dead_letter(session_factory):
+    seed_articles(session_factory, 2)
+    with session_factory() as db:
+        jobs.enqueue_pending(db)
+
+    def handler(batch):
+        return {job.id: "boom" for job in batch if job.article_id % 2}
+
+    def run():
+        return jobs.work_batch("embedding", handler, 10, max_attempts=2, backoff=0)
+
+    assert run() == 2  # one done, one requeued
+    assert run() == 1  # retried, then dead-lettered
+    assert run() == 0
+
+    with session_factory() as db:
+        dead = db.execute(
+            text("SELECT attempts, last_error FROM pipeline_jobs WHERE status = 'dead'")
+        ).all()
+        assert dead == [(2, "boom")]
+
+        # The fake handler embedded nothing, so both articles are still
+        # pending; only the one whose job is dead-lettered is not queued again
+        assert jobs.enqueue_pending(db)["embedding"] == 1
+        assert jobs.retry_dead(db, "embedding") == 1
+        db.commit()
+        assert jobs.job_counts(db)["embedding"]["queued"] == 2
+
+
+def test_failed_analysis_is_retried_not_stored(session_factory, monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    from app.services.pipeline import process_article, worker
+
+    (article_id,) = seed_articles(session_factory, 1)
+    with session_factory() as db:
+        jobs.enqueue(db, "analysis", pending_analyses())
+        db.commit()
+
+    async def failing_analysis(article, references):
+        return {"status": "ERROR", "prediction": "upstream 503"}
+
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    monkeypatch.setattr(process_article, "SessionLocal", session_factory)
+    monkeypatch.setattr(
+        process_article, "search_similar_articles_by_id", lambda *args: []
+    )
+    monkeypatch.setattr(
+        process_article, "analyze_article_with_deepseek_async", failing_analysis
+    )
+
+    def run():
+        return jobs.work_batch(
+            "analysis", worker.analyze_jobs, 10, max_attempts=2, backoff=0
+        )
+
+    assert run() == 1
+    with session_factory() as db:
+        status, error = db.execute(
+            text("SELECT status, last_error FROM pipeline_jobs")
+        ).one()
+        assert status == "queued"
+        assert "upstream 503" in error
+        assert db.get(NewsArticle, article_id).is_analyzed is False
+        assert db.execute(text("SELECT count(*) FROM ai_analysis")).scalar() == 0
+
+    assert run() == 1
+    with session_factory() as db:
+        assert jobs.job_counts(db)["analysis"]["dead"] == 1
+
+
+def test_lease_lost_on_last_attempt_is_dead_lettered(session_factory):
+    seed_articles(session_factory, 1)
+    with session_factory() as db:
+        jobs.enqueue_pending(db)
+        jobs.claim(db, "embedding", 1, visibility_timeout=0, max_attempts=1)
+        db.commit()
+
+        assert jobs.claim(db, "embedding", 1, max_attempts=1) == []
+        db.commit()
+        assert jobs.job_counts(db)["embedding"]["dead"] == 1
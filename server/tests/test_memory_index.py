@@ -0,0 +1,139 @@
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.services.search.memory_index import MemoryVectorIndex  # noqa: E402
+
+DIM = 16
+
+
+class FakeDb:
+    """Serves embeddings rows with id > after_id, minus known ids, like SYNC_SQL."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, _statement, params):
+        rows = sorted(
+            (
+                r
+                for r in self.rows
+                if r.id > params["after_id"]
+                and r.id not in params["known_ids"]
+                and r.published_at >= params["cutoff"]
+            ),
+            key=lambda r: r.id,
+        )
+        return SimpleNamespace(all=lambda: rows)
+
+
+def make_rows(count: int, start_id: int = 1, days_old=lambda i: 0, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=start_id + i,
+            article_id=1000 + start_id + i,
+            embedding=rng.normal(size=DIM).astype(np.float32),
+            published_at=now - timedelta(days=days_old(i), minutes=1),
+            category="Bitcoin" if i % 2 else "Ethereum",
+        )
+        for i in range(count)
+    ]
+
+
+def exact_top(rows, query, limit, cutoff, current_id):
+    q = query / np.linalg.norm(query)
+    scored = [
+        (r.article_id, float(r.embedding @ q / np.linalg.norm(r.embedding)))
+        for r in rows
+        if r.published_at >= cutoff and r.article_id != current_id
+    ]
+    return sorted(scored, key=lambda s: -s[1])[:limit]
+
+
+def test_search_matches_exact_ranking_with_filters():
+    rows = make_rows(3000, days_old=lambda i: i % 60)
+    index = MemoryVectorIndex(dim=DIM, window_days=90)
+    index.sync(FakeDb(rows))
+
+    query = np.random.default_rng(1).normal(size=DIM)
+    cutoff = datetime.utcnow() - timedelta(days=14)
+    current_id = rows[0].article_id
+
+    hits = index.search(query, cutoff, current_id, limit=20)
+    expected = exact_top(rows, query, 20, cutoff, current_id)
+
+    assert [a for a, _ in hits] == [a for a, _ in expected]
+    assert np.allclose([s for _, s in hits], [s for _, s in expected], atol=1e-5)
+    assert current_id not in {a for a, _ in hits}
+
+
+def test_category_filter_and_small_candidate_sets():
+    rows = make_rows(10)
+    index = MemoryVectorIndex(dim=DIM)
+    index.sync(FakeDb(rows))
+
+    cutoff = datetime.utcnow() - timedelta(days=1)
+    hits = index.search(rows[0].embedding, cutoff, 0, limit=50, category="Bitcoin")
+
+    assert len(hits) == 5
+    assert {a for a, _ in hits} == {
+        r.article_id for r in rows if r.category == "Bitcoin"
+    }
+
+
+def test_sync_is_incremental_and_trims_expired_rows():
+    old = make_rows(5, start_id=1, days_old=lambda i: 40)
+    fresh = make_rows(5, start_id=6, seed=1)
+    db = FakeDb(old + fresh)
+
+    index = MemoryVectorIndex(dim=DIM, window_days=45)
+    assert index.sync(db) == 10
+
+    # New rows arrive; only they are read, and the window moved past `old`
+    newer = make_rows(2000, start_id=11, seed=2)
+    db.rows += newer
+    index.window_days = 30
+
+    assert index.sync(db) == 2000
+    assert index.size == 2005
+    assert index.last_embedding_id == 2010
+    assert set(index.article_ids[: index.size]) == {r.article_id for r in fresh + newer}
+
+
+def test_rows_committed_out_of_id_order_are_picked_up():
+    rows = make_rows(10)
+    # Id 5 was allocated first but its transaction commits last
+    late = rows.pop(4)
+    db = FakeDb(list(rows))
+
+    index = MemoryVectorIndex(dim=DIM, sync_overlap=100)
+    assert index.sync(db) == 9
+    assert index.last_embedding_id == 10
+
+    db.rows.append(late)
+    assert index.sync(db) == 1
+    # Rows already held are not read or appended twice
+    assert index.sync(db) == 0
+    assert index.size == 10
+    assert sorted(index.article_ids[: index.size]) == sorted(
+        r.article_id for r in rows + [late]
+    )
+
+
+def test_invalidate_reloads_on_next_refresh():
+    db = FakeDb(make_rows(10))
+    index = MemoryVectorIndex(dim=DIM)
+    index.refresh(db)
+
+    db.rows = db.rows[:3]  # rows deleted by retention
+    index.invalidate()
+    index.refresh(db)
+
+    assert index.size == 3
@@ -0,0 +1,226 @@
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import sessionmaker
+from pgvector.sqlalchemy import Vector
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.database import partitioning  # noqa: E402
+from app.database.migrations import run_migrations  # noqa: E402
+from app.services.news.article_service import (  # noqa: E402
+    compute_hash,
+    insert_articles_batch,
+    lock_article_keys,
+)
+from app.services.search.vector_index import existing_vector_indexes  # noqa: E402
+from app.services.search.vector_query import PRUNE_SLACK, similar_sql  # noqa: E402
+
+
+def test_interval_start_and_partition_names():
+    ts = datetime(2026, 10, 18, 15, 30)  # a Sunday
+
+    assert partitioning.interval_start(ts, "day") == datetime(2026, 10, 18)
+    assert partitioning.interval_start(ts, "week") == datetime(2026, 10, 12)
+    assert (
+        partitioning.partition_name("embeddings", datetime(2026, 10, 12))
+        == "embeddings_p20261012"
+    )
+    with pytest.raises(ValueError):
+        partitioning.interval_start(ts, "month")
+
+
+def drop_tables(bind):
+    with bind.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS ai_analysis, embeddings CASCADE"))
+        conn.execute(text("DROP TABLE IF EXISTS news_articles CASCADE"))
+
+
+@pytest.fixture
+def bind(bind):
+    # Rebuilds the news tables from scratch: point it at a throwaway database
+    drop_tables(bind)
+    run_migrations(bind)
+    try:
+        yield bind
+    finally:
+        drop_tables(bind)
+
+
+def seed(conn, days_old: int) -> int:
+    created = datetime.utcnow() - timedelta(days=days_old)
+    article_id = conn.execute(
+        text(
+            """
+        INSERT INTO news_articles (title, url, content, category, hash, created_at)
+        VALUES ('t', :url, 'body', 'Bitcoin', :url, :created)
+        RETURNING id
+    """
+        ),
+        {"url": f"partition-test://{days_old}", "created": created},
+    ).scalar()
+    # article_created_at left NULL, as on a database from before the column
+    conn.execute(
+        text(
+            "INSERT INTO embeddings (article_id, embedding) VALUES (:id, :e)"
+        ).bindparams(bindparam("e", type_=Vector(768))),
+        {"id": article_id, "e": [1.0] + [0.0] * 767},
+    )
+    conn.execute(
+        text("INSERT INTO ai_analysis (article_id, prediction) VALUES (:id, 'p')"),
+        {"id": article_id},
+    )
+    return article_id
+
+
+def test_convert_then_drop_expired_partitions(bind):
+    with bind.begin() as conn:
+        ids = [seed(conn, days) for days in (0, 5, 40)]
+
+    result = partitioning.convert_to_partitioned(bind, interval="day", ahead=2)
+    assert result["rows"] == {"news_articles": 3, "embeddings": 3, "ai_analysis": 3}
+
+    # Model and vector indexes build on the partitioned tables
+    migrated = run_migrations(bind)
+    assert "ix_news_articles_feed" in migrated["indexes_created"]
+
+    today = partitioning.partition_name(
+        "news_articles", partitioning.interval_start(datetime.utcnow(), "day")
+    )
+    old_day = partitioning.interval_start(datetime.utcnow() - timedelta(days=40), "day")
+
+    with bind.begin() as conn:
+        for table in partitioning.PARTITION_KEYS:
+            assert partitioning.is_partitioned(conn, table)
+        assert all(existing_vector_indexes(conn).values())
+
+        # The old sequence keeps numbering; the row lands in today's partition
+        new_id, partition = conn.execute(
+            text(
+                """
+            INSERT INTO news_articles (title, url, content, category, hash, created_at)
+            VALUES ('t', 'partition-test://new', 'body', 'Bitcoin', 'new', :now)
+            RETURNING id, tableoid::regclass::text
+        """
+            ),
+            {"now": datetime.utcnow()},
+        ).one()
+        assert new_id > max(ids)
+        assert partition == today
+
+        # Similarity search with the pruning filter skips old partitions
+        explain = text("EXPLAIN " + similar_sql(prune=True).text).bindparams(
+            bindparam("query_embedding", type_=Vector(768))
+        )
+        cutoff = datetime.utcnow() - timedelta(days=10)
+        plan = "\n".join(
+            conn.execute(
+                explain,
+                {
+                    "query_embedding": [1.0] + [0.0] * 767,
+                    "cutoff": cutoff,
+                    "prune_cutoff": cutoff - PRUNE_SLACK,
+                    "current_id": 0,
+                    "limit": 5,
+                },
+            ).scalars()
+        )
+        assert "embeddings_p" in plan
+        assert partitioning.partition_name("embeddings", old_day) not in plan
+
+    # Every day from the oldest article on got a partition; the empty ones
+    # past the window go as well. Children are detached before articles.
+    dropped = partitioning.drop_expired_partitions(bind, keep_days=30)
+    old = [
+        dropped.index(partitioning.partition_name(table, old_day))
+        for table in ("ai_analysis", "embeddings", "news_articles")
+    ]
+    assert old == sorted(old)
+
+    with bind.connect() as conn:
+        articles = set(conn.execute(text("SELECT id FROM news_articles")).scalars())
+        embedded = set(
+            conn.execute(text("SELECT article_id FROM embeddings")).scalars()
+        )
+    assert articles == {ids[0], ids[1], new_id}
+    assert embedded == {ids[0], ids[1]}
+
+    # An empty DEFAULT partition from an earlier version is dropped, so
+    # rows can no longer land where they block a range being created
+    with bind.begin() as conn:
+        conn.execute(
+            text("CREATE TABLE ai_analysis_default PARTITION OF ai_analysis DEFAULT")
+        )
+
+    # Convert already made today + 2 days; two more per table
+    created = partitioning.ensure_partitions(bind, interval="day", ahead=4)
+    assert len(created) == 2 * len(partitioning.PARTITION_KEYS)
+    with bind.connect() as conn:
+        assert (
+            conn.execute(text("SELECT to_regclass('ai_analysis_default')")).scalar()
+            is None
+        )
+
+
+def wait_for_blocked_imports(bind, count: int, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    with bind.connect() as conn:
+        while time.monotonic() < deadline:
+            waiting = conn.execute(
+                text(
+                    "SELECT count(DISTINCT pid) FROM pg_locks "
+                    "WHERE locktype = 'advisory' AND NOT granted"
+                )
+            ).scalar()
+            if waiting >= count:
+                return True
+            time.sleep(0.05)
+    return False
+
+
+def test_concurrent_imports_of_one_url_store_it_once(bind):
+    partitioning.convert_to_partitioned(bind, interval="day", ahead=1)
+    Session = sessionmaker(bind=bind)
+    article = {
+        "category": "Bitcoin",
+        "title": "t",
+        "url": "partition-test://race",
+        "published_at": None,
+        "content": "body",
+    }
+
+    # Hold the article's locks so both imports queue up behind them, then
+    # let them go at once: nothing but the locks can keep them apart now
+    with Session() as holder:
+        lock_article_keys(
+            holder,
+            [article["url"]],
+            [compute_hash(article["title"], article["url"], article["content"])],
+        )
+
+        results = []
+
+        def import_once():
+            with Session() as db:
+                results.extend(insert_articles_batch(db, [article]))
+
+        threads = [threading.Thread(target=import_once) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        assert wait_for_blocked_imports(bind, 2)
+        holder.commit()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(r["status"] for r in results) == ["exists", "inserted"]
+    with bind.connect() as conn:
+        stored = conn.execute(
+            text("SELECT count(*) FROM news_articles WHERE url = :u"),
+            {"u": article["url"]},
+        ).scalar()
+    assert stored == 1
@@ -0,0 +1,80 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import bindparam, text
+from pgvector.sqlalchemy import Vector
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.database.migrations import run_migrations  # noqa: E402
+from app.services.pipeline.queues import (  # noqa: E402
+    pending_analyses,
+    pending_embeddings,
+    pending_summaries,
+)
+
+
+def seed(conn, name: str, summary=None, analyzed=False, embedded=False, flagged=False):
+    article_id = conn.execute(
+        text(
+            """
+        INSERT INTO news_articles
+            (title, url, content, summary, category, hash, created_at,
+             is_analyzed, is_embedded)
+        VALUES ('t', :url, 'body', :summary, 'Bitcoin', :url, :created,
+                :analyzed, :flagged)
+        RETURNING id
+    """
+        ),
+        {
+            "url": f"queue-test://{name}",
+            "summary": summary,
+            "created": datetime.utcnow(),
+            "analyzed": analyzed,
+            "flagged": flagged,
+        },
+    ).scalar()
+    if embedded:
+        conn.execute(
+            text(
+                "INSERT INTO embeddings (article_id, embedding) VALUES (:id, :e)"
+            ).bindparams(bindparam("e", type_=Vector(768))),
+            {"id": article_id, "e": [1.0] + [0.0] * 767},
+        )
+    return article_id
+
+
+@pytest.mark.usefixtures("empty_tables")
+def test_queues_walk_pending_rows_by_keyset(bind):
+    with bind.begin() as conn:
+        new = [seed(conn, f"new-{i}") for i in range(3)]
+        summarized = seed(conn, "summarized", summary="s")
+        seed(conn, "done", "s", analyzed=True, embedded=True, flagged=True)
+        # Embedded outside the pipeline: flag never set
+        unflagged = seed(conn, "unflagged", "s", analyzed=True, embedded=True)
+
+    with bind.connect() as conn:
+        assert conn.execute(pending_summaries(0, 10)).scalars().all() == new
+        assert conn.execute(pending_analyses()).scalars().all() == [summarized]
+
+        first = conn.execute(pending_embeddings(0, 2)).all()
+        assert [a.id for a in first] == new[:2]
+        rest = conn.execute(pending_embeddings(first[-1].id, 10)).all()
+        assert [a.id for a in rest] == new[2:] + [summarized, unflagged]
+
+    # The migration backfill step flags it, so it leaves the queue
+    run_migrations(bind)
+
+    with bind.connect() as conn:
+        rest = conn.execute(pending_embeddings(first[-1].id, 10)).all()
+        assert [a.id for a in rest] == new[2:] + [summarized]
+
+        # The embedding queue is driven by its partial index
+        conn.execute(text("SET enable_seqscan = off"))
+        statement = pending_embeddings(0, 10).compile(
+            dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+        )
+        plan = "\n".join(conn.execute(text(f"EXPLAIN {statement}")).scalars())
+    assert "ix_news_articles_pending_embedding" in plan
@@ -0,0 +1,110 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import bindparam, text
+from pgvector.sqlalchemy import Vector
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.services.news import retention  # noqa: E402
+
+
+def test_parse_category_days():
+    assert retention.parse_category_days("Regulation=60, Top News=14,") == {
+        "regulation": 60,
+        "top news": 14,
+    }
+
+
+@pytest.mark.parametrize("raw", ["Regulation", "Regulation=sixty", "=5", "ETF=-1"])
+def test_malformed_category_days_are_rejected(raw):
+    with pytest.raises(ValueError):
+        retention.parse_category_days(raw)
+
+
+def seed(conn, category: str, days_old: int, count: int) -> list[int]:
+    created = datetime.utcnow() - timedelta(days=days_old)
+    ids = []
+    for i in range(count):
+        url = f"retention-test://{category}/{days_old}/{i}"
+        article_id = conn.execute(
+            text(
+                """
+            INSERT INTO news_articles (title, url, content, category, hash, created_at)
+            VALUES ('t', :url, 'body', :category, :url, :created)
+            RETURNING id
+        """
+            ),
+            {"url": url, "category": category, "created": created},
+        ).scalar()
+        conn.execute(
+            text(
+                "INSERT INTO embeddings (article_id, embedding) VALUES (:id, :e)"
+            ).bindparams(bindparam("e", type_=Vector(768))),
+            {"id": article_id, "e": [1.0] + [0.0] * 767},
+        )
+        conn.execute(
+            text("INSERT INTO ai_analysis (article_id, prediction) VALUES (:id, 'p')"),
+            {"id": article_id},
+        )
+        ids.append(article_id)
+    return ids
+
+
+def test_batched_retention_with_category_windows(bind, session_factory, monkeypatch):
+    monkeypatch.setattr(retention, "SessionLocal", session_factory)
+
+    with bind.begin() as conn:
+        expired = seed(conn, "Bitcoin", 40, 7)
+        kept_recent = seed(conn, "Bitcoin", 5, 3)
+        # Regulation keeps 60 days, so these stay, whatever the case
+        kept_regulation = seed(conn, "Regulation", 40, 1)
+        kept_regulation += seed(conn, "REGULATION", 41, 1)
+        expired += seed(conn, "Regulation", 70, 2)
+
+    progress = []
+    original = retention._set_progress
+
+    def spy(**fields):
+        original(**fields)
+        progress.append(retention.retention_progress())
+
+    monkeypatch.setattr(retention, "_set_progress", spy)
+
+    stats = retention.run_retention(
+        default_days=30,
+        category_days={"regulation": 60},
+        batch_size=3,
+        pause_seconds=0,
+    )
+
+    assert stats["deleted"] == 9
+    assert stats["deleted_by_category"] == {"Bitcoin": 7, "Regulation": 2}
+    assert stats["batches"] == 3
+    assert [p["deleted"] for p in progress if "last_id" in p][:3] == [3, 6, 9]
+    assert retention.retention_progress()["running"] is False
+
+    with bind.connect() as conn:
+        remaining = set(conn.execute(text("SELECT id FROM news_articles")).scalars())
+        embedded = set(
+            conn.execute(text("SELECT article_id FROM embeddings")).scalars()
+        )
+        analyzed = set(
+            conn.execute(text("SELECT article_id FROM ai_analysis")).scalars()
+        )
+
+    assert remaining == set(kept_recent + kept_regulation)
+    # ON DELETE CASCADE took the dependent rows along
+    assert embedded == remaining
+    assert analyzed == remaining
+
+
+def test_second_run_is_rejected_while_one_is_active():
+    assert retention._run_lock.acquire(blocking=False)
+    try:
+        with pytest.raises(retention.RetentionAlreadyRunning):
+            retention.run_retention()
+    finally:
+        retention._run_lock.release()
@@ -0,0 +1,327 @@
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+import app.database  # noqa: E402,F401  (registers the models first)
+from app.scrapers.cryptoslate_scraper import scraper  # noqa: E402
+from app.scrapers.cryptoslate_scraper import parsers  # noqa: E402
+from app.services.news import importer  # noqa: E402
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "cryptoslate")
+LISTING_ETAG = '"listing-v1"'
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def start_fixture_server(article_delay: float = 0.2, blocked_paths=(), empty_paths=()):
+    """Local stand-in for cryptoslate.com serving the saved HTML fixtures.
+    `blocked_paths` answer 403, which the scraper does not retry;
+    `empty_paths` serve a page without article text."""
+    stats = {"requests": [], "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                stats["requests"].append((self.path, time.monotonic()))
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            try:
+                if self.path == "/top-news/":
+                    if self.headers.get("If-None-Match") == LISTING_ETAG:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    base = f"http://127.0.0.1:{self.server.server_address[1]}"
+                    body = read_fixture("top_news.html").replace("{{BASE}}", base)
+                elif self.path in blocked_paths:
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+                elif self.path in empty_paths:
+                    body = "<html><body><video src='/clip.mp4'></video></body></html>"
+                else:
+                    time.sleep(article_delay)
+                    body = read_fixture("article.html")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("ETag", LISTING_ETAG)
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+            finally:
+                with lock:
+                    stats["in_flight"] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def use_fixture_site(monkeypatch, server, tmp_path, known_urls=()):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    spool = tmp_path / "unprocessed"
+    spool.mkdir()
+    monkeypatch.setattr(scraper, "TOP_NEWS_URL", f"{base}/top-news/")
+    monkeypatch.setattr(scraper, "OUTPUT_FOLDER", str(spool))
+    monkeypatch.setattr(scraper, "LISTING_STATE_PATH", str(tmp_path / "state.json"))
+    monkeypatch.setattr(scraper, "SEEN_URLS_PATH", str(tmp_path / "seen.txt"))
+    monkeypatch.setattr(scraper, "SCRAPER_MIN_INTERVAL", 0.0)
+    monkeypatch.setattr(
+        scraper, "existing_article_urls", lambda urls: set(urls) & set(known_urls)
+    )
+    return base, spool
+
+
+def test_concurrent_scrape_writes_every_article(monkeypatch, tmp_path):
+    server, stats = start_fixture_server()
+    _, spool = use_fixture_site(monkeypatch, server, tmp_path)
+
+    try:
+        saved = scraper.scrape_latest_news(concurrency=4)
+    finally:
+        server.shutdown()
+
+    files = sorted(os.listdir(spool))
+    assert saved == 5
+    assert len(files) == 5
+    assert 1 < stats["max_in_flight"] <= 4
+
+    with open(os.path.join(spool, files[0]), encoding="utf-8") as f:
+        text = f.read()
+    assert "PublishedAt: 2026-10-17T09:30:00+00:00" in text
+    assert "Paragraph 12 of the article body" in text
+
+
+def test_unchanged_listing_finishes_in_one_request(monkeypatch, tmp_path):
+    server, stats = start_fixture_server(article_delay=0.0)
+    use_fixture_site(monkeypatch, server, tmp_path)
+
+    try:
+        first = scraper.scrape_latest_news(concurrency=4)
+        stats["requests"].clear()
+        second = scraper.scrape_latest_news(concurrency=4)
+    finally:
+        server.shutdown()
+
+    assert first == 5
+    assert second == 0
+    assert [path for path, _ in stats["requests"]] == ["/top-news/"]
+
+
+def test_known_urls_are_not_fetched(monkeypatch, tmp_path):
+    server, stats = start_fixture_server(article_delay=0.0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    known = [f"{base}/sec-delays-decision-on-spot-solana-etf-applications-again/"]
+    use_fixture_site(monkeypatch, server, tmp_path, known_urls=known)
+
+    try:
+        saved = scraper.scrape_latest_news(concurrency=4)
+    finally:
+        server.shutdown()
+
+    fetched = [path for path, _ in stats["requests"]]
+    assert saved == 4
+    assert "/sec-delays-decision-on-spot-solana-etf-applications-again/" not in fetched
+
+
+def test_failed_articles_are_retried_next_run(monkeypatch, tmp_path):
+    blocked = "/tether-mints-another-billion-usdt-as-stablecoin-supply-hits-record/"
+    server, stats = start_fixture_server(article_delay=0.0, blocked_paths={blocked})
+    use_fixture_site(monkeypatch, server, tmp_path)
+
+    stored = {}
+
+    def fake_insert(db, chunk):
+        # The first attempt at the BlackRock story fails at insert time
+        results = []
+        for art in chunk:
+            if "blackrock" in art["url"] and "blackrock" not in stored:
+                stored["blackrock"] = None
+                results.append({"status": "error", "error": "boom"})
+            else:
+                stored[art["url"]] = art["content"]
+                results.append({"status": "inserted", "id": len(stored)})
+        return results
+
+    monkeypatch.setattr(importer, "insert_articles_batch", fake_insert)
+
+    try:
+        first = importer.import_streamed_articles_core(spool=False)
+        stats["requests"].clear()
+        second = importer.import_streamed_articles_core(spool=False)
+    finally:
+        server.shutdown()
+
+    # The blocked article is skipped rather than stored as a placeholder
+    assert [entry["status"] for entry in first].count("inserted") == 3
+    assert not any("FETCH_FAILED" in str(body) for body in stored.values())
+    assert all("tether" not in url for url in scraper.load_seen_urls())
+
+    # No 304 for the listing, and only the two failures are fetched again
+    fetched = sorted(path for path, _ in stats["requests"])
+    assert (
+        fetched[0]
+        == "/blackrock-bitcoin-fund-records-largest-weekly-inflow-since-launch/"
+    )
+    assert fetched[1:] == [blocked, "/top-news/"]
+    assert [entry["status"] for entry in second] == ["inserted"]
+
+
+def test_empty_pages_do_not_defeat_the_conditional_listing(monkeypatch, tmp_path):
+    empty = "/tether-mints-another-billion-usdt-as-stablecoin-supply-hits-record/"
+    server, stats = start_fixture_server(article_delay=0.0, empty_paths={empty})
+    use_fixture_site(monkeypatch, server, tmp_path)
+
+    try:
+        first = scraper.scrape_latest_news(concurrency=4)
+        stats["requests"].clear()
+        second = scraper.scrape_latest_news(concurrency=4)
+    finally:
+        server.shutdown()
+
+    # The empty page is not stored, but neither is it fetched every run
+    assert first == 4
+    assert second == 0
+    assert [path for path, _ in stats["requests"]] == ["/top-news/"]
+
+
+def test_failed_directory_import_rescrapes_the_listing(monkeypatch, tmp_path):
+    server, stats = start_fixture_server(article_delay=0.0)
+    _, spool = use_fixture_site(monkeypatch, server, tmp_path)
+    failed_dir = tmp_path / "failed"
+    failed_dir.mkdir()
+    monkeypatch.setattr(importer, "FAILED_DIR", str(failed_dir))
+
+    def load_spool():
+        articles = []
+        for name in sorted(os.listdir(spool)):
+            path = os.path.join(spool, name)
+            with open(path, encoding="utf-8") as f:
+                url = next(line for line in f if line.startswith("URL: "))[5:].strip()
+            articles.append({"url": url, "filename": name, "filepath": path})
+        return articles
+
+    def fake_insert(db, chunk):
+        return [
+            {"status": "error" if "blackrock" in art["url"] else "inserted"}
+            for art in chunk
+        ]
+
+    monkeypatch.setattr(importer, "load_all_scraped_articles", load_spool)
+    monkeypatch.setattr(importer, "insert_articles_batch", fake_insert)
+
+    try:
+        scraper.scrape_latest_news(concurrency=4)
+        importer.import_scraped_articles_core()
+        stats["requests"].clear()
+        rescraped = scraper.scrape_latest_news(concurrency=4)
+    finally:
+        server.shutdown()
+
+    # No 304: the listing is read again and only the failed article refetched
+    assert rescraped == 1
+    assert sorted(path for path, _ in stats["requests"]) == [
+        "/blackrock-bitcoin-fund-records-largest-weekly-inflow-since-launch/",
+        "/top-news/",
+    ]
+
+
+class FakeClock:
+    """Stand-in for `time`: each thread has its own timeline, and sleeping
+    only advances the sleeping thread, so spacing is exact and scheduling
+    noise plays no part."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def monotonic(self):
+        return getattr(self._local, "now", 0.0)
+
+    def sleep(self, seconds):
+        self._local.now = self.monotonic() + seconds
+
+
+def test_politeness_policy_spaces_request_starts(monkeypatch):
+    clock = FakeClock()
+    starts = []
+    lock = threading.Lock()
+    page = read_fixture("article.html")
+
+    def fake_get(url, **kwargs):
+        with lock:
+            starts.append(clock.monotonic())
+        return SimpleNamespace(status_code=200, text=page)
+
+    monkeypatch.setattr(scraper, "time", clock)
+    monkeypatch.setattr(scraper.session, "get", fake_get)
+    articles = [{"url": f"https://example.test/story-{i}/"} for i in range(6)]
+
+    results = list(
+        scraper.iter_fetched_articles(
+            articles,
+            scraper.PolitenessPolicy(concurrency=4, min_interval=0.1, jitter=0),
+        )
+    )
+
+    assert len(results) == 6
+    assert sorted(starts) == pytest.approx([0.1 * i for i in range(6)])
+
+
+@pytest.mark.parametrize("backend", parsers.available_backends())
+def test_parser_backends_agree(backend):
+    article = read_fixture("article.html")
+    listing = read_fixture("top_news.html")
+
+    assert parsers.parse_article_html(article, backend=backend) == (
+        parsers.parse_article_html(article, backend="html.parser")
+    )
+    assert [
+        a["url"] for a in parsers.parse_top_news_html(listing, backend=backend)
+    ] == [a["url"] for a in parsers.parse_top_news_html(listing, backend="html.parser")]
+
+
+def test_restricted_parse_falls_back_to_full_page():
+    html = """
+    <html><body>
+      <div class="post-date">Oct. 17, 2026 at 9:30 am UTC</div>
+      <div class="single__content"><p>Body outside any article tag.</p></div>
+    </body></html>
+    """
+    content, published_at = parsers.parse_article_html(html, backend="html.parser")
+
+    assert content == "Body outside any article tag."
+    assert published_at.startswith("2026-10-17T09:30")
+
+
+@pytest.mark.parametrize("backend", parsers.available_backends())
+def test_teaser_articles_do_not_replace_the_body(backend):
+    html = """
+    <html><head>
+      <meta property="article:published_time" content="2026-10-17T09:30:00+00:00">
+    </head><body>
+      <div class="single__content"><p>The real story.</p><p>Second paragraph.</p></div>
+      <aside>
+        <article class="teaser"><p>Related: another headline</p></article>
+        <article class="teaser"><p>Related: one more headline</p></article>
+      </aside>
+    </body></html>
+    """
+    content, published_at = parsers.parse_article_html(html, backend=backend)
+
+    assert content == "The real story.\nSecond paragraph."
+    assert published_at == "2026-10-17T09:30:00+00:00"
@@ -0,0 +1,158 @@
+import os
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from pgvector.sqlalchemy import Vector
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.database.database import get_async_db, to_async_url  # noqa: E402
+from app.routes import cleanup_stats  # noqa: E402
+from app.services.news import stats_service  # noqa: E402
+from app.services.news.stats_service import StatsCache, compute_stats  # noqa: E402
+
+
+def test_cache_serves_one_computation_per_ttl():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"n": len(calls)}
+
+    async def scrape(cache):
+        return await asyncio.gather(*(cache.get("exact", compute) for _ in range(10)))
+
+    # Concurrent misses share a single refresh
+    assert asyncio.run(scrape(StatsCache(ttl=60))) == [{"n": 1}] * 10
+    assert len(calls) == 1
+
+    # Expired entries are recomputed
+    calls.clear()
+    cache = StatsCache(ttl=0)
+    asyncio.run(cache.get("exact", compute))
+    asyncio.run(cache.get("exact", compute))
+    assert len(calls) == 2
+
+
+def test_stats_route_caches_per_mode(monkeypatch):
+    calls = []
+
+    async def fake_compute(db, mode):
+        calls.append(mode)
+        return {"count_mode": mode}
+
+    monkeypatch.setattr(cleanup_stats, "stats_cache", StatsCache(ttl=60))
+    monkeypatch.setattr(cleanup_stats, "compute_stats", fake_compute)
+
+    async def override():
+        yield None
+
+    app = FastAPI()
+    app.include_router(cleanup_stats.router)
+    app.dependency_overrides[get_async_db] = override
+    client = TestClient(app)
+
+    assert client.get("/stats").json()["count_mode"] == "exact"
+    assert client.get("/stats").json()["count_mode"] == "exact"
+    assert client.get("/stats?mode=estimate").json()["count_mode"] == "estimate"
+    assert client.get("/stats?mode=bogus").status_code == 422
+    assert calls == ["exact", "estimate"]
+
+
+def test_pending_payload_ages():
+    now = datetime(2026, 10, 18, 12, 0)
+    row = {
+        "summary_pending": 2,
+        "summary_oldest": now - timedelta(minutes=5),
+        "embedding_pending": 0,
+        "embedding_oldest": None,
+        "analysis_pending": 1,
+        "analysis_oldest": now - timedelta(hours=2),
+    }
+
+    payload = stats_service.pending_payload(row, now)
+
+    assert payload["pending"]["summary"] == {"pending": 2, "oldest_age_seconds": 300}
+    assert payload["pending"]["embedding"] == {
+        "pending": 0,
+        "oldest_age_seconds": None,
+    }
+    assert payload["oldest_pending_age_seconds"] == 7200
+
+
+def seed(conn, name: str, summary, analyzed: bool, embedded: bool, hours_old: int):
+    article_id = conn.execute(
+        text(
+            """
+        INSERT INTO news_articles
+            (title, url, content, summary, category, hash, created_at,
+             is_analyzed, is_embedded)
+        VALUES ('t', :url, 'body', :summary, 'Bitcoin', :url, :created,
+                :analyzed, :embedded)
+        RETURNING id
+    """
+        ),
+        {
+            "url": f"stats-test://{name}",
+            "summary": summary,
+            "created": datetime.utcnow() - timedelta(hours=hours_old),
+            "analyzed": analyzed,
+            "embedded": embedded,
+        },
+    ).scalar()
+    if embedded:
+        conn.execute(
+            text(
+                "INSERT INTO embeddings (article_id, embedding) VALUES (:id, :e)"
+            ).bindparams(bindparam("e", type_=Vector(768))),
+            {"id": article_id, "e": [1.0] + [0.0] * 767},
+        )
+
+
+@pytest.mark.usefixtures("empty_tables")
+def test_compute_stats_against_postgres(bind):
+    with bind.begin() as conn:
+        seed(conn, "new", None, False, False, hours_old=3)
+        seed(conn, "summarized", "s", False, True, hours_old=2)
+        seed(conn, "done", "s", True, True, hours_old=1)
+        conn.execute(text("ANALYZE news_articles"))
+        conn.execute(text("ANALYZE embeddings"))
+
+    async def run(mode):
+        engine = create_async_engine(
+            to_async_url(bind.url.render_as_string(hide_password=False))
+        )
+        try:
+            async with AsyncSession(engine) as db:
+                return await compute_stats(db, mode)
+        finally:
+            await engine.dispose()
+
+    exact = asyncio.run(run("exact"))
+    estimate = asyncio.run(run("estimate"))
+
+    for stats in (exact, estimate):
+        assert (stats["articles"], stats["embeddings"]) == (3, 2)
+
+    pending = exact["pending"]
+    assert pending["summary"]["pending"] == 1
+    assert pending["embedding"]["pending"] == 1
+    assert pending["analysis"]["pending"] == 1
+    assert 3 * 3600 - 60 <= exact["oldest_pending_age_seconds"] <= 3 * 3600 + 60
+
+    # The backlog counts are answerable from the partial indexes alone
+    with bind.begin() as conn:
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(
+            conn.execute(text("EXPLAIN " + stats_service.PENDING_SQL.text)).scalars()
+        )
+    assert "ix_news_articles_pending_summary" in plan
+    assert "ix_news_articles_pending_embedding" in plan
+    assert "ix_news_articles_pending_analysis" in plan
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.services.search import vector_index  # noqa: E402
+
+
+def test_index_ddl_uses_cosine_ops_and_config():
+    ddl = vector_index.index_ddl("hnsw")
+
+    assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+    assert f"m = {vector_index.HNSW_M}" in ddl
+    assert "CONCURRENTLY" in ddl
+    assert vector_index.index_name("ivfflat").startswith("ix_embeddings_ivfflat")
+
+
+def test_search_settings_never_cap_results_below_limit():
+    ef = vector_index.search_settings("hnsw", limit=10_000)["hnsw.ef_search"]
+
+    assert ef == 10_000
+    assert vector_index.search_settings("ivfflat") == {
+        "ivfflat.probes": vector_index.IVFFLAT_PROBES
+    }
+    assert vector_index.search_settings("none") == {}
+
+
+def test_iterative_scan_is_opt_in_and_validated():
+    default = vector_index.search_settings("hnsw", iterative_scan="")
+    strict = vector_index.search_settings("hnsw", iterative_scan="strict_order")
+
+    assert "hnsw.iterative_scan" not in default
+    assert strict["hnsw.iterative_scan"] == "strict_order"
+
+    with pytest.raises(ValueError):
+        vector_index.search_settings("ivfflat", iterative_scan="strict_order")
+
+
+def test_ensure_vector_index_switches_index_type(bind):
+    with bind.connect() as conn:
+        assert vector_index.index_name("hnsw") in vector_index.existing_vector_indexes(
+            conn
+        )
+
+    result = vector_index.ensure_vector_index(bind, "ivfflat")
+    assert result["created"]
+    assert result["dropped"] == [vector_index.index_name("hnsw")]
+
+    # Idempotent once in place
+    assert vector_index.ensure_vector_index(bind, "ivfflat")["created"] is False
+
+    vector_index.ensure_vector_index(bind, "hnsw")
+    with bind.connect() as conn:
+        assert list(vector_index.existing_vector_indexes(conn)) == [
+            vector_index.index_name("hnsw")
+        ]
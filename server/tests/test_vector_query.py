@@ -0,0 +1,204 @@
+import os
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import bindparam, text
+from pgvector.sqlalchemy import Vector
+
+# Engines are created lazily; nothing here connects to this URL
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+
+from app.services.search.vector_index import (  # noqa: E402
+    apply_search_settings,
+    ensure_vector_index,
+)
+from app.services.search.vector_query import (  # noqa: E402
+    SIMILAR_SQL,
+    recency_cutoff,
+    run_search_query,
+)
+
+ARTICLES = 5000
+DIM = 768
+
+
+def unit_vector(rng: random.Random) -> list[float]:
+    vec = [rng.gauss(0, 1) for _ in range(DIM)]
+    norm = sum(x * x for x in vec) ** 0.5
+    return [x / norm for x in vec]
+
+
+def seed(conn, rng: random.Random):
+    """ARTICLES articles over 120 days, each with its embedding."""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "title": f"plan-test {i}",
+            "url": f"plan-test://{i}",
+            "hash": f"plan-test-{i}",
+            "published_at": now - timedelta(minutes=rng.randrange(120 * 24 * 60)),
+        }
+        for i in range(ARTICLES)
+    ]
+    ids = conn.execute(
+        text(
+            """
+        INSERT INTO news_articles (title, url, content, category, hash, published_at)
+        SELECT r.title, r.url, 'body', 'Top News', r.hash, r.published_at
+        FROM json_to_recordset(CAST(:rows AS json))
+             AS r(title text, url text, hash text, published_at timestamp)
+        RETURNING id, published_at
+    """
+        ),
+        {"rows": json.dumps(rows, default=str)},
+    ).all()
+
+    conn.execute(
+        text(
+            """
+        INSERT INTO embeddings (article_id, embedding, published_at, category)
+        VALUES (:article_id, :embedding, :published_at, 'Top News')
+    """
+        ).bindparams(bindparam("embedding", type_=Vector(DIM))),
+        [
+            {"article_id": id_, "embedding": unit_vector(rng), "published_at": ts}
+            for id_, ts in ids
+        ],
+    )
+    conn.execute(text("ANALYZE news_articles"))
+    conn.execute(text("ANALYZE embeddings"))
+    return ids
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@pytest.fixture(scope="module")
+def seeded(bind):
+    rng = random.Random(7)
+
+    # Bulk build after loading is far faster than growing the graph per insert
+    ensure_vector_index(bind, "none")
+    with bind.begin() as conn:
+        ids = seed(conn, rng)
+    ensure_vector_index(bind)
+
+    try:
+        yield bind, [id_ for id_, _ in ids], rng
+    finally:
+        with bind.begin() as conn:
+            conn.execute(
+                text("DELETE FROM news_articles WHERE url LIKE 'plan-test://%'")
+            )
+
+
+@pytest.mark.parametrize("max_days", [14, 45])
+def test_similarity_plan_uses_indexes(seeded, max_days):
+    bind, ids, rng = seeded
+
+    explain = text("EXPLAIN (ANALYZE, FORMAT JSON) " + SIMILAR_SQL.text).bindparams(
+        bindparam("query_embedding", type_=Vector(DIM))
+    )
+
+    with bind.begin() as conn:
+        apply_search_settings(conn, limit=20)
+        plan = conn.execute(
+            explain,
+            {
+                "query_embedding": unit_vector(rng),
+                "cutoff": recency_cutoff(max_days),
+                "current_id": ids[0],
+                "limit": 20,
+            },
+        ).scalar()[0]["Plan"]
+
+    nodes = list(plan_nodes(plan))
+    scans = {(n.get("Relation Name"), n["Node Type"]) for n in nodes}
+
+    # The recency filter and exclusion ride on an embeddings index scan, and
+    # articles are fetched by primary key for the returned rows only
+    assert ("embeddings", "Seq Scan") not in scans
+    assert ("news_articles", "Seq Scan") not in scans
+    assert any(n["Node Type"] == "Limit" and n["Actual Rows"] == 20 for n in nodes)
+
+
+def basis_vector(cos: float, axis: int) -> list[float]:
+    """Unit vector at cosine `cos` from axis 0."""
+    vec = [0.0] * DIM
+    vec[0] = cos
+    vec[axis] = (1 - cos * cos) ** 0.5
+    return vec
+
+
+def test_search_query_filters(bind):
+    now = datetime.utcnow()
+
+    # name: (category, days old, cosine to the query)
+    fixtures = {
+        "a": ("Bitcoin", 2, 0.9),
+        "b": ("Ethereum", 2, 0.8),
+        "c": ("Bitcoin", 40, 0.95),
+        "d": ("Bitcoin", 1, 0.3),
+    }
+
+    with bind.connect() as conn:
+        trans = conn.begin()
+        try:
+            ids = {}
+            for axis, (name, (category, days, cos)) in enumerate(
+                fixtures.items(), start=1
+            ):
+                published = now - timedelta(days=days)
+                ids[name] = conn.execute(
+                    text(
+                        """
+                    INSERT INTO news_articles
+                        (title, url, content, summary, category, hash, published_at)
+                    VALUES (:n, :url, 'body', :n, :c, :url, :p)
+                    RETURNING id
+                """
+                    ),
+                    {
+                        "n": name,
+                        "url": f"search-test://{name}",
+                        "c": category,
+                        "p": published,
+                    },
+                ).scalar()
+                conn.execute(
+                    text(
+                        """
+                    INSERT INTO embeddings (article_id, embedding, published_at, category)
+                    VALUES (:id, :e, :p, :c)
+                """
+                    ).bindparams(bindparam("e", type_=Vector(DIM))),
+                    {
+                        "id": ids[name],
+                        "e": basis_vector(cos, axis),
+                        "p": published,
+                        "c": category,
+                    },
+                )
+
+            names = {v: k for k, v in ids.items()}
+
+            def search(**filters):
+                rows = run_search_query(conn, basis_vector(1.0, 1), 50, **filters)
+                return [names[r["id"]] for r in rows if r["id"] in names]
+
+            assert search() == ["c", "a", "b", "d"]
+            assert search(
+                category="Bitcoin", published_after=now - timedelta(days=10)
+            ) == [
+                "a",
+                "d",
+            ]
+            assert search(published_before=now - timedelta(days=30)) == ["c"]
+            assert search(min_similarity=0.85) == ["c", "a"]
+        finally:
+            trans.rollback()